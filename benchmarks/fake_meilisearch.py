@@ -0,0 +1,581 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+Json = Any
+Response = Tuple[int, Json]
+Route = Callable[["FakeMeilisearch", Dict[str, str], Dict[str, str], bytes, str], Response]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _error(status: int, message: str, code: str) -> Response:
+    return status, {"message": message, "code": code, "type": "invalid_request", "link": ""}
+
+
+_SYLLABLES = ("ka", "lo", "mi", "nu", "pe", "ra", "si", "to", "va", "ze", "bo", "du")
+VOCABULARY = tuple(a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES[:4])
+
+
+def generate_documents(
+    count: int, document_size: int = 256, start: int = 0
+) -> list[dict[str, Any]]:
+    """Make `count` movie-like documents with an overview of roughly `document_size` bytes.
+
+    Words are drawn from `VOCABULARY` with a generator seeded by the document id, so the same
+    arguments always give the same documents.
+    """
+    documents = []
+    for i in range(start, start + count):
+        rng = random.Random(i)
+        overview = " ".join(rng.choice(VOCABULARY) for _ in range(document_size // 7 + 1))
+        documents.append(
+            {
+                "id": i,
+                "title": " ".join(rng.choice(VOCABULARY) for _ in range(3)),
+                "genres": rng.sample(VOCABULARY[:12], 2),
+                "overview": overview[:document_size],
+            }
+        )
+
+    return documents
+
+
+class _Index:
+    def __init__(self, uid: str, primary_key: str | None) -> None:
+        self.uid = uid
+        self.primary_key = primary_key
+        self.created_at = _now()
+        self.updated_at = self.created_at
+        self.documents: dict[str, dict[str, Any]] = {}
+        self.search_text: dict[str, str] = {}
+        self.settings: dict[str, Any] = {
+            "displayedAttributes": ["*"],
+            "searchableAttributes": ["*"],
+            "filterableAttributes": [],
+            "sortableAttributes": [],
+            "rankingRules": ["words", "typo", "proximity", "attribute", "sort", "exactness"],
+            "stopWords": [],
+            "synonyms": {},
+            "distinctAttribute": None,
+        }
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "uid": self.uid,
+            "primaryKey": self.primary_key,
+            "createdAt": self.created_at,
+            "updatedAt": self.updated_at,
+        }
+
+    def add_documents(self, documents: list[dict[str, Any]]) -> None:
+        if self.primary_key is None and documents:
+            self.primary_key = next((x for x in documents[0] if x.lower().endswith("id")), None)
+        if self.primary_key is None:
+            raise ValueError("The primary key could not be inferred")
+
+        for document in documents:
+            key = str(document[self.primary_key])
+            self.documents[key] = {**self.documents.get(key, {}), **document}
+            self.search_text[key] = " ".join(str(x) for x in self.documents[key].values()).lower()
+        self.updated_at = _now()
+
+
+class FakeMeilisearch:
+    """An in-process HTTP stand-in for a Meilisearch server.
+
+    It keeps indexes, documents, settings and tasks in memory and answers the subset of the API the
+    TUI uses. `latency` is added to every request and tasks report as processing until
+    `task_duration` seconds after they were enqueued. With an `upload_bandwidth` in bytes per
+    second request bodies are received as if they shared a link of that speed. The body of every
+    search that reaches an index is kept in `searches`.
+    """
+
+    def __init__(
+        self,
+        *,
+        master_key: str | None = None,
+        latency: float = 0.0,
+        task_duration: float = 0.0,
+        version: str = "1.6.0",
+        upload_bandwidth: float | None = None,
+    ) -> None:
+        self.master_key = master_key
+        self.latency = latency
+        self.task_duration = task_duration
+        self.version = version
+        self.upload_bandwidth = upload_bandwidth
+        self.bytes_received = 0
+        self.indexes: dict[str, _Index] = {}
+        self.tasks: list[dict[str, Any]] = []
+        self.requests: list[tuple[str, str]] = []
+        self.searches: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._link_lock = threading.Lock()
+        self._link_free_at = 0.0
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("The server has not been started")
+
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> FakeMeilisearch:
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> FakeMeilisearch:
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def add_documents(
+        self, index_uid: str, documents: list[dict[str, Any]], primary_key: str | None = None
+    ) -> None:
+        """Load documents directly, without going through the API or creating a task."""
+        with self._lock:
+            index = self.indexes.setdefault(index_uid, _Index(index_uid, primary_key))
+            index.add_documents(documents)
+
+    def handle(self, method: str, raw_path: str, headers: dict[str, str], body: bytes) -> Response:
+        if self.latency:
+            time.sleep(self.latency)
+        self._receive(len(body))
+        try:
+            body = _decode(body, headers.get("content-encoding"))
+        except (OSError, ValueError, zlib.error) as e:
+            return _error(400, str(e), "bad_request")
+
+        split = urlsplit(raw_path)
+        path = split.path.rstrip("/") or "/"
+        query = {k: v[-1] for k, v in parse_qs(split.query).items()}
+        self.requests.append((method, path))
+
+        if self.master_key and path != "/health":
+            if headers.get("authorization") != f"Bearer {self.master_key}":
+                return _error(401, "The provided API key is invalid.", "invalid_api_key")
+
+        for route_method, pattern, route in _ROUTES:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                params = {k: unquote(v) for k, v in match.groupdict().items()}
+                with self._lock:
+                    try:
+                        return route(self, params, query, body, headers.get("content-type", ""))
+                    except ValueError as e:
+                        return _error(400, str(e), "bad_request")
+
+        return _error(404, f"{method} {path} not found", "not_found")
+
+    def _receive(self, size: int) -> None:
+        with self._link_lock:
+            self.bytes_received += size
+            if not self.upload_bandwidth or not size:
+                return
+            start = max(time.monotonic(), self._link_free_at)
+            self._link_free_at = start + size / self.upload_bandwidth
+            wait = self._link_free_at - time.monotonic()
+        time.sleep(max(wait, 0.0))
+
+    def _enqueue(
+        self, index_uid: str | None, task_type: str, details: dict[str, Any] | None = None
+    ) -> Response:
+        task = {
+            "uid": len(self.tasks),
+            "indexUid": index_uid,
+            "status": "enqueued",
+            "type": task_type,
+            "details": details,
+            "error": None,
+            "canceledBy": None,
+            "duration": None,
+            "enqueuedAt": _now(),
+            "startedAt": None,
+            "finishedAt": None,
+            "_enqueued": time.monotonic(),
+        }
+        self.tasks.append(task)
+        info = {k: task[k] for k in ("indexUid", "status", "type", "enqueuedAt")}
+        return 202, {"taskUid": task["uid"], **info}
+
+    def _task_json(self, task: dict[str, Any]) -> dict[str, Any]:
+        elapsed = time.monotonic() - task["_enqueued"]
+        if task["status"] == "enqueued" and elapsed >= self.task_duration:
+            task.update(
+                status="succeeded",
+                startedAt=task["enqueuedAt"],
+                finishedAt=_now(),
+                duration=f"PT{elapsed:.6f}S",
+            )
+
+        result = {k: v for k, v in task.items() if not k.startswith("_")}
+        if result["status"] == "enqueued" and elapsed >= self.task_duration / 2:
+            result.update(status="processing", startedAt=task["enqueuedAt"])
+
+        return result
+
+
+def _decode(body: bytes, encoding: str | None) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    if encoding not in (None, "identity"):
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    return body
+
+
+def _parse_documents(body: bytes, content_type: str) -> list[dict[str, Any]]:
+    text = body.decode("utf-8")
+    if "ndjson" in content_type:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    if "csv" in content_type:
+        return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+
+    documents = json.loads(text)
+    return documents if isinstance(documents, list) else [documents]
+
+
+def _json_body(body: bytes) -> Any:
+    return json.loads(body) if body else {}
+
+
+def _page(items: list[Any], query: dict[str, str], default_limit: int = 20) -> dict[str, Any]:
+    offset = int(query.get("offset", 0))
+    limit = int(query.get("limit", default_limit))
+    return {
+        "results": items[offset : offset + limit],
+        "offset": offset,
+        "limit": limit,
+        "total": len(items),
+    }
+
+
+def _index_not_found(uid: str) -> Response:
+    return _error(404, f"Index `{uid}` not found.", "index_not_found")
+
+
+def _health(fake: FakeMeilisearch, *args: Any) -> Response:
+    return 200, {"status": "available"}
+
+
+def _version(fake: FakeMeilisearch, *args: Any) -> Response:
+    return 200, {"pkgVersion": fake.version, "commitSha": "fake", "commitDate": _now()}
+
+
+def _stats(fake: FakeMeilisearch, *args: Any) -> Response:
+    return 200, {
+        "databaseSize": sum(len(json.dumps(x.documents)) for x in fake.indexes.values()),
+        "lastUpdate": _now(),
+        "indexes": {uid: _index_stats(index) for uid, index in fake.indexes.items()},
+    }
+
+
+def _index_stats(index: _Index) -> dict[str, Any]:
+    distribution: dict[str, int] = {}
+    for document in index.documents.values():
+        for field in document:
+            distribution[field] = distribution.get(field, 0) + 1
+
+    return {
+        "numberOfDocuments": len(index.documents),
+        "isIndexing": False,
+        "fieldDistribution": distribution,
+    }
+
+
+def _list_indexes(
+    fake: FakeMeilisearch, params: dict[str, str], query: dict[str, str], *args: Any
+) -> Response:
+    return 200, _page([x.to_json() for x in fake.indexes.values()], query)
+
+
+def _create_index(
+    fake: FakeMeilisearch,
+    params: dict[str, str],
+    query: dict[str, str],
+    body: bytes,
+    content_type: str,
+) -> Response:
+    data = _json_body(body)
+    uid = data["uid"]
+    if uid not in fake.indexes:
+        fake.indexes[uid] = _Index(uid, data.get("primaryKey"))
+
+    return fake._enqueue(uid, "indexCreation", {"primaryKey": data.get("primaryKey")})
+
+
+def _get_index(fake: FakeMeilisearch, params: dict[str, str], *args: Any) -> Response:
+    index = fake.indexes.get(params["uid"])
+    if index is None:
+        return _index_not_found(params["uid"])
+
+    return 200, index.to_json()
+
+
+def _delete_index(fake: FakeMeilisearch, params: dict[str, str], *args: Any) -> Response:
+    fake.indexes.pop(params["uid"], None)
+    return fake._enqueue(params["uid"], "indexDeletion", {"deletedDocuments": 0})
+
+
+def _get_index_stats(fake: FakeMeilisearch, params: dict[str, str], *args: Any) -> Response:
+    index = fake.indexes.get(params["uid"])
+    if index is None:
+        return _index_not_found(params["uid"])
+
+    return 200, _index_stats(index)
+
+
+def _search(
+    fake: FakeMeilisearch,
+    params: dict[str, str],
+    query: dict[str, str],
+    body: bytes,
+    content_type: str,
+) -> Response:
+    start = time.perf_counter()
+    index = fake.indexes.get(params["uid"])
+    if index is None:
+        return _index_not_found(params["uid"])
+
+    data = _json_body(body)
+    fake.searches.append(data)
+    q = (data.get("q") or "").lower()
+    terms = q.split()
+    keys = [k for k, text in index.search_text.items() if all(x in text for x in terms)]
+    offset = data.get("offset", 0)
+    limit = data.get("limit", 20)
+    hits = [dict(index.documents[k]) for k in keys[offset : offset + limit]]
+
+    if data.get("attributesToHighlight") and terms:
+        pre = data.get("highlightPreTag", "<em>")
+        post = data.get("highlightPostTag", "</em>")
+        pattern = re.compile("|".join(re.escape(x) for x in terms), re.IGNORECASE)
+        for hit in hits:
+            hit["_formatted"] = {
+                k: pattern.sub(lambda m: f"{pre}{m.group(0)}{post}", v) if isinstance(v, str) else v
+                for k, v in hit.items()
+            }
+
+    return 200, {
+        "hits": hits,
+        "query": data.get("q") or "",
+        "offset": offset,
+        "limit": limit,
+        "estimatedTotalHits": len(keys),
+        "processingTimeMs": int((time.perf_counter() - start) * 1000),
+    }
+
+
+def _get_documents(
+    fake: FakeMeilisearch,
+    params: dict[str, str],
+    query: dict[str, str],
+    body: bytes,
+    content_type: str,
+) -> Response:
+    index = fake.indexes.get(params["uid"])
+    if index is None:
+        return _index_not_found(params["uid"])
+
+    if body:
+        query = {k: str(v) for k, v in _json_body(body).items() if k in ("offset", "limit")}
+        fields = _json_body(body).get("fields")
+    else:
+        fields = query["fields"].split(",") if query.get("fields") else None
+
+    documents = list(index.documents.values())
+    if fields and fields != ["*"]:
+        documents = [{k: v for k, v in x.items() if k in fields} for x in documents]
+
+    return 200, _page(documents, query)
+
+
+def _add_documents(
+    fake: FakeMeilisearch,
+    params: dict[str, str],
+    query: dict[str, str],
+    body: bytes,
+    content_type: str,
+) -> Response:
+    documents = _parse_documents(body, content_type)
+    index = fake.indexes.setdefault(params["uid"], _Index(params["uid"], query.get("primaryKey")))
+    index.add_documents(documents)
+
+    return fake._enqueue(
+        params["uid"],
+        "documentAdditionOrUpdate",
+        {"receivedDocuments": len(documents), "indexedDocuments": len(documents)},
+    )
+
+
+def _delete_documents(
+    fake: FakeMeilisearch,
+    params: dict[str, str],
+    query: dict[str, str],
+    body: bytes,
+    content_type: str,
+) -> Response:
+    index = fake.indexes.get(params["uid"])
+    if index is None:
+        return _index_not_found(params["uid"])
+
+    ids = [str(x) for x in _json_body(body)]
+    deleted = 0
+    for key in ids:
+        if index.documents.pop(key, None) is not None:
+            index.search_text.pop(key, None)
+            deleted += 1
+
+    return fake._enqueue(
+        params["uid"], "documentDeletion", {"providedIds": len(ids), "deletedDocuments": deleted}
+    )
+
+
+def _delete_all_documents(fake: FakeMeilisearch, params: dict[str, str], *args: Any) -> Response:
+    index = fake.indexes.get(params["uid"])
+    if index is None:
+        return _index_not_found(params["uid"])
+
+    deleted = len(index.documents)
+    index.documents.clear()
+    index.search_text.clear()
+
+    return fake._enqueue(params["uid"], "documentDeletion", {"deletedDocuments": deleted})
+
+
+def _get_settings(fake: FakeMeilisearch, params: dict[str, str], *args: Any) -> Response:
+    index = fake.indexes.get(params["uid"])
+    if index is None:
+        return _index_not_found(params["uid"])
+
+    return 200, index.settings
+
+
+def _update_settings(
+    fake: FakeMeilisearch,
+    params: dict[str, str],
+    query: dict[str, str],
+    body: bytes,
+    content_type: str,
+) -> Response:
+    index = fake.indexes.setdefault(params["uid"], _Index(params["uid"], None))
+    settings = _json_body(body)
+    index.settings.update(settings)
+
+    return fake._enqueue(params["uid"], "settingsUpdate", settings)
+
+
+def _get_tasks(
+    fake: FakeMeilisearch, params: dict[str, str], query: dict[str, str], *args: Any
+) -> Response:
+    tasks = [fake._task_json(x) for x in reversed(fake.tasks)]
+    if query.get("uids"):
+        uids = {int(x) for x in query["uids"].split(",")}
+        tasks = [x for x in tasks if x["uid"] in uids]
+    if query.get("statuses"):
+        statuses = set(query["statuses"].split(","))
+        tasks = [x for x in tasks if x["status"] in statuses]
+    if query.get("indexUids"):
+        index_uids = set(query["indexUids"].split(","))
+        tasks = [x for x in tasks if x["indexUid"] in index_uids]
+    if query.get("afterEnqueuedAt"):
+        after = query["afterEnqueuedAt"].rstrip("Z")
+        tasks = [x for x in tasks if x["enqueuedAt"].rstrip("Z") > after]
+    if query.get("from"):
+        tasks = [x for x in tasks if x["uid"] <= int(query["from"])]
+
+    limit = int(query.get("limit", 20))
+    results = tasks[:limit]
+
+    return 200, {
+        "results": results,
+        "total": len(tasks),
+        "limit": limit,
+        "from": results[0]["uid"] if results else None,
+        "next": tasks[limit]["uid"] if len(tasks) > limit else None,
+    }
+
+
+def _get_task(fake: FakeMeilisearch, params: dict[str, str], *args: Any) -> Response:
+    uid = int(params["task_uid"])
+    if uid >= len(fake.tasks):
+        return _error(404, f"Task `{uid}` not found.", "task_not_found")
+
+    return 200, fake._task_json(fake.tasks[uid])
+
+
+_INDEX = r"/indexes/(?P<uid>[^/]+)"
+_ROUTES: list[tuple[str, re.Pattern[str], Route]] = [
+    ("GET", re.compile(r"/health"), _health),
+    ("GET", re.compile(r"/version"), _version),
+    ("GET", re.compile(r"/stats"), _stats),
+    ("GET", re.compile(r"/indexes"), _list_indexes),
+    ("POST", re.compile(r"/indexes"), _create_index),
+    ("GET", re.compile(_INDEX), _get_index),
+    ("DELETE", re.compile(_INDEX), _delete_index),
+    ("GET", re.compile(f"{_INDEX}/stats"), _get_index_stats),
+    ("POST", re.compile(f"{_INDEX}/search"), _search),
+    ("GET", re.compile(f"{_INDEX}/documents"), _get_documents),
+    ("POST", re.compile(f"{_INDEX}/documents/fetch"), _get_documents),
+    ("POST", re.compile(f"{_INDEX}/documents"), _add_documents),
+    ("PUT", re.compile(f"{_INDEX}/documents"), _add_documents),
+    ("POST", re.compile(f"{_INDEX}/documents/delete-batch"), _delete_documents),
+    ("DELETE", re.compile(f"{_INDEX}/documents"), _delete_all_documents),
+    ("GET", re.compile(f"{_INDEX}/settings"), _get_settings),
+    ("PATCH", re.compile(f"{_INDEX}/settings"), _update_settings),
+    ("GET", re.compile(r"/tasks"), _get_tasks),
+    ("GET", re.compile(r"/tasks/(?P<task_uid>\d+)"), _get_task),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakeMeilisearch
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("content-length") or 0)
+        body = self.rfile.read(length) if length else b""
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        status, payload = self.fake.handle(self.command, self.path, headers, body)
+
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
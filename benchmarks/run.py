@@ -0,0 +1,401 @@
+"""Headless performance benchmarks for the TUI.
+
+The app is driven with Textual's Pilot against `FakeMeilisearch`, so nothing but this package is
+needed to run them:
+
+    python -m benchmarks.run --latency-ms 5 --save-baseline
+
+Later runs are compared against the saved baseline and exit with a non-zero status if a metric is
+worse than the baseline by more than the tolerance.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Mapping
+from unittest.mock import patch
+
+from rich.console import Console
+from rich.table import Table
+from typer import Option, Typer
+
+from benchmarks.fake_meilisearch import VOCABULARY, FakeMeilisearch, generate_documents
+from meilisearch_tui.metrics import percentile
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+MASTER_KEY = "benchmarkKey"
+
+# Whether a bigger number is better for each metric, used when comparing against a baseline.
+METRICS = {
+    "import_ms": False,
+    "first_frame_ms": False,
+    "keystroke_to_render_p50_ms": False,
+    "keystroke_to_render_p95_ms": False,
+    "screen_switch_p50_ms": False,
+    "screen_switch_p95_ms": False,
+    "ingest_documents_per_second": True,
+    "ingest_mb_per_second": True,
+    "ingest_compression_ratio": True,
+    "ingest_compressed_speedup": True,
+    "peak_rss_mb": False,
+}
+
+# Limits checked on every run whatever the baseline says. They are generous enough for slow CI
+# runners, the import takes around a quarter of a second locally.
+BUDGETS = {
+    "import_ms": 1000.0,
+    "first_frame_ms": 1000.0,
+}
+
+benchmark_app = Typer()
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def import_ms() -> float:
+    """Time a cold import of the app module in a fresh interpreter."""
+    code = (
+        "import time; start = time.perf_counter(); import meilisearch_tui.main; "
+        "print(time.perf_counter() - start)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout
+    return float(output) * 1000
+
+
+@contextmanager
+def app_environment(fake: FakeMeilisearch) -> Iterator[None]:
+    """Point the app's config at the fake server without touching the real config directory."""
+    from meilisearch_tui.config import Config, load_config
+
+    with tempfile.TemporaryDirectory() as config_dir, patch.object(
+        Config, "get_default_directory", return_value=Path(config_dir)
+    ), patch.dict(os.environ, {"MEILI_HTTP_ADDR": fake.url, "MEILI_MASTER_KEY": MASTER_KEY}):
+        load_config.cache_clear()
+        try:
+            yield
+        finally:
+            load_config.cache_clear()
+
+
+async def _reset_shared_state() -> None:
+    from meilisearch_tui.cache import index_store, search_cache
+    from meilisearch_tui.client import client_manager
+
+    await client_manager.close()
+    index_store.invalidate()
+    search_cache.invalidate()
+
+
+async def _wait_for(predicate: Callable[[], bool], timeout: float = 10.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Timed out waiting for the app")
+        await asyncio.sleep(0.001)
+
+
+async def _timed(action: Callable[[], Awaitable[Any]]) -> float:
+    start = time.perf_counter()
+    await action()
+    return (time.perf_counter() - start) * 1000
+
+
+async def bench_ui(fake: FakeMeilisearch, *, queries: int, switches: int) -> dict[str, list[float]]:
+    """Time the first frame, the last keystroke of a query until its results are on screen, and
+    screen switches.
+    """
+    import meilisearch_tui.main
+    from meilisearch_tui.screens.search import SearchScreen
+
+    rng = random.Random(0)
+    first_frame: list[float] = []
+    keystrokes: list[float] = []
+    screen_switches: list[float] = []
+
+    class TimedApp(meilisearch_tui.main.MeilisearchApp):
+        CSS_PATH = str(Path(meilisearch_tui.main.__file__).parent / "meilisearch.css")
+
+        def on_ready(self) -> None:
+            first_frame.append((time.perf_counter() - start) * 1000)
+
+    with app_environment(fake):
+        start = time.perf_counter()
+        app = TimedApp()
+        async with app.run_test(size=(120, 40)) as pilot:
+            await _wait_for(lambda: isinstance(app.screen, SearchScreen))
+            screen = app.screen
+            assert isinstance(screen, SearchScreen)
+            await _wait_for(lambda: screen.selected_index is not None)
+
+            def search_settled() -> bool:
+                running = any(x.group == "search" and x.is_running for x in screen.workers)
+                return not running and bool(str(screen.results_header.renderable))
+
+            for _ in range(queries):
+                # Fresh words each time so the search cache doesn't hide the round trip.
+                query = f"{rng.choice(VOCABULARY)} {rng.choice(VOCABULARY)[:2]}"
+                screen.search_input.value = ""
+                await pilot.pause()
+                await pilot.press(*query[:-1])
+
+                async def last_keystroke(key: str = query[-1]) -> None:
+                    await pilot.press(key)
+                    await _wait_for(search_settled)
+                    await pilot.pause()
+
+                keystrokes.append(await _timed(last_keystroke))
+
+            for _ in range(switches):
+                for name in ("index", "tasks", "configuration", "search"):
+
+                    async def switch(name: str = name) -> None:
+                        await app.switch_screen(name)
+                        await pilot.pause()
+
+                    screen_switches.append(await _timed(switch))
+
+    await _reset_shared_state()
+
+    return {
+        "first_frame": first_frame,
+        "keystroke_to_render": keystrokes,
+        "screen_switch": screen_switches,
+    }
+
+
+async def bench_ingest(
+    fake: FakeMeilisearch,
+    *,
+    documents: int,
+    document_size: int,
+    concurrency: int,
+    compression: str | None = None,
+) -> dict[str, float]:
+    """Upload a generated NDJSON file through the same batching code the Load Data tab uses."""
+    from meilisearch_python_sdk import AsyncClient
+
+    from meilisearch_tui.ingest import BatchSizer, IngestProgress, add_documents_in_batches
+    from meilisearch_tui.tasks import FINISHED_STATUSES, get_tasks
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "documents.ndjson"
+        with open(path, "w", encoding="utf-8") as f:
+            for document in generate_documents(documents, document_size):
+                f.write(json.dumps(document))
+                f.write("\n")
+        size = path.stat().st_size
+
+        progress = IngestProgress(size)
+        async with AsyncClient(fake.url, MASTER_KEY) as client:
+            start = time.perf_counter()
+            tasks = await add_documents_in_batches(
+                client.index("ingest"),
+                path,
+                batch_size=BatchSizer(),
+                concurrency=concurrency,
+                progress=progress,
+                compression=compression,
+            )
+            uids = [x.task_uid for x in tasks]
+            while True:
+                status = await get_tasks(client, uids=uids, limit=len(uids))
+                if all(x.status in FINISHED_STATUSES for x in status.results):
+                    break
+                await asyncio.sleep(0.01)
+            elapsed = time.perf_counter() - start
+
+    return {
+        "ingest_documents_per_second": documents / elapsed,
+        "ingest_mb_per_second": size / (1024 * 1024) / elapsed,
+        "compression_ratio": progress.compression_ratio,
+    }
+
+
+async def run_benchmarks(
+    *,
+    latency: float = 0.0,
+    documents: int = 5000,
+    document_size: int = 512,
+    queries: int = 20,
+    switches: int = 5,
+    upload_concurrency: int = 4,
+    upload_bandwidth_mbps: float = 0.0,
+    compression: str = "gzip",
+) -> dict[str, Any]:
+    """Run every benchmark against a fresh fake server.
+
+    The ingest is run twice, the second time with compressed uploads, and the speedup is the
+    compressed documents per second over the uncompressed ones. On an unlimited local link
+    compression only costs time, so pass `upload_bandwidth_mbps` to see what it gains on a slower
+    uplink.
+    """
+    fake = FakeMeilisearch(
+        master_key=MASTER_KEY,
+        latency=latency,
+        upload_bandwidth=upload_bandwidth_mbps * 1_000_000 / 8 or None,
+    )
+    fake.add_documents("movies", generate_documents(documents, document_size))
+    with fake:
+        ui = await bench_ui(fake, queries=queries, switches=switches)
+        ingest = await bench_ingest(
+            fake, documents=documents, document_size=document_size, concurrency=upload_concurrency
+        )
+        compressed = await bench_ingest(
+            fake,
+            documents=documents,
+            document_size=document_size,
+            concurrency=upload_concurrency,
+            compression=compression,
+        )
+
+    metrics: dict[str, float | None] = {
+        "import_ms": import_ms(),
+        "first_frame_ms": ui["first_frame"][0],
+        "keystroke_to_render_p50_ms": percentile(ui["keystroke_to_render"], 50),
+        "keystroke_to_render_p95_ms": percentile(ui["keystroke_to_render"], 95),
+        "screen_switch_p50_ms": percentile(ui["screen_switch"], 50),
+        "screen_switch_p95_ms": percentile(ui["screen_switch"], 95),
+        "ingest_documents_per_second": ingest["ingest_documents_per_second"],
+        "ingest_mb_per_second": ingest["ingest_mb_per_second"],
+        "ingest_compression_ratio": compressed["compression_ratio"],
+        "ingest_compressed_speedup": (
+            compressed["ingest_documents_per_second"] / ingest["ingest_documents_per_second"]
+        ),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    return {
+        "settings": {
+            "latency_ms": latency * 1000,
+            "documents": documents,
+            "document_size": document_size,
+            "queries": queries,
+            "switches": switches,
+            "upload_concurrency": upload_concurrency,
+            "upload_bandwidth_mbps": upload_bandwidth_mbps,
+            "compression": compression,
+        },
+        "metrics": metrics,
+    }
+
+
+def compare_to_baseline(
+    metrics: Mapping[str, float | None], baseline: Mapping[str, float | None], tolerance: float
+) -> list[str]:
+    """Return the names of the metrics that are worse than the baseline by more than tolerance."""
+    regressions = []
+    for name, higher_is_better in METRICS.items():
+        current = metrics.get(name)
+        previous = baseline.get(name)
+        if current is None or not previous:
+            continue
+
+        change = (current - previous) / previous
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append(name)
+
+    return regressions
+
+
+def over_budget(metrics: Mapping[str, float | None]) -> list[str]:
+    """Return the names of the metrics that are over their limit in BUDGETS."""
+    return [
+        name
+        for name, budget in BUDGETS.items()
+        if (value := metrics.get(name)) is not None and value > budget
+    ]
+
+
+@benchmark_app.command()
+def main(
+    latency_ms: float = Option(0.0, help="Latency the fake server adds to every request"),
+    documents: int = Option(5000, help="Number of documents in the search and ingest indexes"),
+    document_size: int = Option(512, help="Approximate size of each document in bytes"),
+    queries: int = Option(20, help="Number of searches to type"),
+    switches: int = Option(5, help="Number of times to cycle through the screens"),
+    upload_concurrency: int = Option(4, help="Number of batches uploaded at the same time"),
+    upload_bandwidth_mbps: float = Option(
+        0.0, help="Upload bandwidth of the fake server in megabits per second, 0 is unlimited"
+    ),
+    compression: str = Option(
+        "gzip", help="Upload compression to compare against, gzip or deflate"
+    ),
+    baseline: Path = Option(DEFAULT_BASELINE, help="Baseline file to compare against"),
+    save_baseline: bool = Option(False, help="Save the results as the new baseline"),
+    tolerance: float = Option(0.2, help="Allowed slowdown against the baseline, 0.2 is 20%"),
+) -> None:
+    results = asyncio.run(
+        run_benchmarks(
+            latency=latency_ms / 1000,
+            documents=documents,
+            document_size=document_size,
+            queries=queries,
+            switches=switches,
+            upload_concurrency=upload_concurrency,
+            upload_bandwidth_mbps=upload_bandwidth_mbps,
+            compression=compression,
+        )
+    )
+
+    previous = None
+    if baseline.exists():
+        with open(baseline) as f:
+            previous = json.load(f)
+        if previous.get("settings") != results["settings"]:
+            previous = None
+
+    table = Table("Metric", "Result", "Baseline")
+    for name, value in results["metrics"].items():
+        base = previous["metrics"].get(name) if previous else None
+        table.add_row(
+            name,
+            "n/a" if value is None else f"{value:.2f}",
+            "" if base is None else f"{base:.2f}",
+        )
+    console = Console()
+    console.print(table)
+
+    failed = False
+    if save_baseline:
+        with open(baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        console.print(f"Baseline saved to {baseline}")
+    elif previous is None:
+        console.print("No baseline recorded with these settings, run with --save-baseline")
+    else:
+        regressions = compare_to_baseline(results["metrics"], previous["metrics"], tolerance)
+        if regressions:
+            console.print(f"[red]Regressed against the baseline: {', '.join(regressions)}")
+            failed = True
+
+    over = over_budget(results["metrics"])
+    if over:
+        console.print(f"[red]Over budget: {', '.join(over)}")
+        failed = True
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    benchmark_app()
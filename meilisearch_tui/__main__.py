@@ -1,4 +1,4 @@
-from meilisearch_tui.main import main  # pragma: no cover
+from meilisearch_tui.cli import typer_app  # pragma: no cover
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    typer_app()
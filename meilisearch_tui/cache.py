@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from meilisearch_python_sdk.index import AsyncIndex
+from meilisearch_python_sdk.models.search import SearchResults
+
+from meilisearch_tui.client import get_client, run_request
+
+
+class SearchCacheKey(NamedTuple):
+    index_uid: str
+    query: str
+    limit: int
+    offset: int
+    semantic_ratio: float | None = None
+    embedder: str | None = None
+
+
+class SearchCache:
+    """Size bounded LRU cache of search results with an optional time to live in seconds."""
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[SearchCacheKey, tuple[float, SearchResults]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: SearchCacheKey) -> SearchResults | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, results = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return results
+
+    def set(self, key: SearchCacheKey, results: SearchResults) -> None:
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = (time.monotonic(), results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, index_uid: str | None = None) -> None:
+        """Drop the cached results for an index, or for every index if no uid is given."""
+        if index_uid is None:
+            self._entries.clear()
+            return
+
+        for key in [x for x in self._entries if x.index_uid == index_uid]:
+            del self._entries[key]
+
+
+class IndexStore:
+    """Shared list of indexes on the server.
+
+    Results are reused for `max_age` seconds, and callers that ask while a request is already in
+    flight wait on that request instead of sending their own.
+    """
+
+    def __init__(self, max_age: float = 5.0) -> None:
+        self.max_age = max_age
+        self._indexes: list[AsyncIndex] | None = None
+        self._fetched_at: float | None = None
+        self._in_flight: asyncio.Future[list[AsyncIndex] | None] | None = None
+        self._generation = 0
+
+    async def get_indexes(self) -> list[AsyncIndex] | None:
+        if self._fetched_at is not None and time.monotonic() - self._fetched_at <= self.max_age:
+            return self._indexes
+
+        if self._in_flight is None:
+            self._in_flight = asyncio.ensure_future(self._fetch())
+            self._in_flight.add_done_callback(self._clear_in_flight)
+
+        # Shielded so one caller being cancelled doesn't cancel the request for everyone else.
+        return await asyncio.shield(self._in_flight)
+
+    def invalidate(self) -> None:
+        self._indexes = None
+        self._fetched_at = None
+        self._in_flight = None
+        self._generation += 1
+
+    async def _fetch(self) -> list[AsyncIndex] | None:
+        generation = self._generation
+        async with get_client() as client:
+            indexes = await run_request("indexes", client.get_indexes)
+
+        # Don't store a response that was already in flight when the store was invalidated.
+        if generation == self._generation:
+            self._indexes = indexes
+            self._fetched_at = time.monotonic()
+
+        return indexes
+
+    def _clear_in_flight(self, future: asyncio.Future[list[AsyncIndex] | None]) -> None:
+        if self._in_flight is future:
+            self._in_flight = None
+
+
+search_cache = SearchCache()
+index_store = IndexStore()
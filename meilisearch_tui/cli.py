@@ -0,0 +1,451 @@
+"""The `meilisearch` command.
+
+Without a command the TUI is started. The other commands are for scripts and cron jobs, they use
+the same config, client and ingestion code as the TUI but never import Textual, and write one JSON
+record per line to stdout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Optional
+
+from typer import Argument, Context, Exit, Option, Typer
+
+if TYPE_CHECKING:  # pragma: no cover
+    from meilisearch_python_sdk.models.task import TaskInfo, TaskResult
+
+    from meilisearch_tui.ingest import DocumentBatch
+
+typer_app = Typer(
+    help="A TUI for managing and searching with Meilisearch, and commands for scripting it."
+)
+
+MAX_SEARCH_PAGE = 1000
+
+# Typer reads the annotations at runtime so this module can't use `X | None` before Python 3.10.
+
+
+@typer_app.callback(invoke_without_command=True)
+def main(
+    ctx: Context,
+    hybrid_search: bool = Option(False, "-h", "--hybrid-search", help="Use hybrid search"),
+    record_metrics: Optional[Path] = Option(  # noqa: UP045
+        None,
+        "--record-metrics",
+        help="Directory to record request metrics in, overrides metrics_dir in the settings",
+    ),
+) -> None:
+    """Start the TUI."""
+    if ctx.invoked_subcommand is not None:
+        return
+
+    from meilisearch_tui.main import start_app
+
+    start_app(hybrid_search, record_metrics)
+
+
+@typer_app.command()
+def search(
+    index: str = Argument(..., help="The index to search"),
+    query: str = Argument("", help="The search query, leave out to match every document"),
+    limit: int = Option(20, help="Maximum number of hits to return"),
+    offset: int = Option(0, help="Number of hits to skip"),
+    filter: Optional[str] = Option(None, help="Filter expression"),  # noqa: UP045
+    sort: Optional[List[str]] = Option(None, help="Sort rule, can be repeated"),  # noqa: UP006, UP045
+    hybrid_search: bool = Option(False, "-h", "--hybrid-search", help="Use hybrid search"),
+) -> None:
+    """Search an index, writing each hit as a line of JSON."""
+
+    async def run() -> None:
+        from meilisearch_python_sdk.models.search import Hybrid
+
+        from meilisearch_tui.client import get_client, run_request
+        from meilisearch_tui.config import load_config
+
+        config = load_config()
+        hybrid = (
+            Hybrid(semantic_ratio=config.semantic_ratio or 0.5, embedder=config.embedder)
+            if hybrid_search
+            else None
+        )
+        async with get_client() as client:
+            search_index = client.index(index)
+            position = offset
+            remaining = limit
+            while remaining > 0:
+                page_size = min(remaining, MAX_SEARCH_PAGE)
+                results = await run_request(
+                    "search",
+                    lambda: search_index.search(
+                        query,
+                        offset=position,
+                        limit=page_size,
+                        filter=filter,
+                        sort=sort or None,
+                        hybrid=hybrid,
+                    ),
+                )
+                for hit in results.hits:
+                    _write(hit)
+                if len(results.hits) < page_size:
+                    break
+                position += page_size
+                remaining -= page_size
+
+    _run(run)
+
+
+@typer_app.command()
+def load(
+    index: str = Argument(..., help="The index to load the documents into"),
+    path: str = Argument(
+        ...,
+        help="A json, ndjson or csv file, optionally .gz or .zst compressed, or a directory or "
+        "glob matching them",
+    ),
+    primary_key: Optional[str] = Option(None, help="Primary key of the documents"),  # noqa: UP045
+    concurrency: Optional[int] = Option(  # noqa: UP045
+        None, help="Batches uploaded at the same time, defaults to upload_concurrency"
+    ),
+    ordered: bool = Option(
+        False,
+        help="Send batches and files one at a time, in order, so the last copy of a repeated "
+        "document wins",
+    ),
+    wait: bool = Option(True, help="Wait for the documents to be indexed"),
+    sync: bool = Option(
+        False, help="Only send documents that changed since the last sync, implies --wait"
+    ),
+    delete_missing: bool = Option(
+        False, help="With --sync, delete documents that are no longer in the file"
+    ),
+    restart: bool = Option(
+        False, help="Send the whole file instead of resuming an interrupted load"
+    ),
+    compression: Optional[str] = Option(  # noqa: UP045
+        None, help="Compress uploads with gzip or deflate, defaults to upload_compression"
+    ),
+) -> None:
+    """Load document files, writing each task as it is enqueued and again when it finishes.
+
+    Several files are loaded at the same time, sharing the upload slots. If an earlier load of the
+    same file into the same index was interrupted, the batches the server already accepted are
+    skipped.
+    """
+
+    async def run() -> None:
+        from meilisearch_tui.client import get_client
+        from meilisearch_tui.config import load_config
+        from meilisearch_tui.ingest import (
+            CHECKPOINT_DIR,
+            BatchSizer,
+            IngestCheckpoint,
+            MultiFileProgress,
+            add_files_in_batches,
+            expand_paths,
+            watch_progress,
+        )
+        from meilisearch_tui.sync import MANIFEST_DIR, SyncManifest, sync_documents
+        from meilisearch_tui.tasks import FINISHED_STATUSES
+
+        class PrintedProgress(MultiFileProgress):
+            def record_batch(self, batch: DocumentBatch, task: TaskInfo) -> None:
+                super().record_batch(batch, task)
+                _write({**_dump(task), "documentCount": batch.document_count})
+
+            def record_task(self, task: TaskResult) -> None:
+                changed = task.status != self.task_statuses.get(task.uid)
+                super().record_task(task)
+                if changed and task.status in FINISHED_STATUSES:
+                    _write(_dump(task))
+
+        paths = expand_paths(path)
+        if sync and len(paths) > 1:
+            raise ValueError("--sync can only load one file at a time")
+
+        config = load_config()
+        sizer = BatchSizer()
+        progress = PrintedProgress()
+        async with get_client() as client:
+            if sync:
+                report = await sync_documents(
+                    client,
+                    client.index(index),
+                    paths[0],
+                    SyncManifest.for_index(config.config_dir / MANIFEST_DIR, client, index),
+                    primary_key=primary_key,
+                    delete_missing=delete_missing,
+                    batch_size=sizer,
+                    concurrency=concurrency or config.upload_concurrency,
+                    progress=progress,
+                    compression=compression or config.upload_compression,
+                    compression_level=config.upload_compression_level,
+                )
+                _write(
+                    {
+                        "documentsSent": report.documents_sent,
+                        "documentsUnchanged": report.documents_unchanged,
+                        "documentsDeleted": report.documents_deleted,
+                        "failedTasks": len(report.failed_tasks),
+                    }
+                )
+                if report.failed_tasks:
+                    raise Exit(1)
+                return
+
+            checkpoint_dir = config.config_dir / CHECKPOINT_DIR
+            if restart:
+                for document_path in paths:
+                    IngestCheckpoint.for_load(checkpoint_dir, client, index, document_path).delete()
+            await add_files_in_batches(
+                client.index(index),
+                paths,
+                primary_key=primary_key,
+                batch_size=sizer,
+                concurrency=concurrency or config.upload_concurrency,
+                progress=progress,
+                checkpoint_dir=checkpoint_dir,
+                compression=compression or config.upload_compression,
+                compression_level=config.upload_compression_level,
+                ordered=ordered,
+            )
+        if wait:
+            await watch_progress(progress, sizer=sizer)
+            if progress.failed_tasks:
+                raise Exit(1)
+
+    _run(run)
+
+
+@typer_app.command()
+def export(
+    index: str = Argument(..., help="The index to export"),
+    output: Optional[Path] = Option(  # noqa: UP045
+        None,
+        "-o",
+        "--output",
+        dir_okay=False,
+        help="File to write to instead of stdout, gzip compressed if the name ends in .gz",
+    ),
+    batch_size: int = Option(1000, help="Number of documents to request at a time"),
+    concurrency: int = Option(4, help="Number of pages requested at the same time"),
+    fields: Optional[List[str]] = Option(  # noqa: UP006, UP045
+        None, help="Only include this field, can be repeated"
+    ),
+) -> None:
+    """Write every document in an index as a line of JSON."""
+
+    async def run() -> None:
+        from meilisearch_tui.client import get_client
+        from meilisearch_tui.export import export_documents, export_to_file
+
+        async with get_client() as client:
+            export_index = client.index(index)
+            options: dict[str, Any] = {
+                "batch_size": batch_size,
+                "concurrency": concurrency,
+                "fields": fields or None,
+            }
+            if output is None:
+                sys.stdout.flush()
+                await export_documents(export_index, sys.stdout.buffer, **options)
+                sys.stdout.buffer.flush()
+            else:
+                await export_to_file(export_index, output, **options)
+
+    _run(run)
+
+
+@typer_app.command()
+def migrate(
+    index: str = Argument(..., help="The index to copy"),
+    target_url: str = Option(..., "--to", help="Address of the server to copy the index to"),
+    target_key: Optional[str] = Option(  # noqa: UP045
+        None, "--to-key", envvar="MEILI_TARGET_MASTER_KEY", help="Master key of the target server"
+    ),
+    target_index: Optional[str] = Option(  # noqa: UP045
+        None, help="Name of the index on the target, defaults to the same name"
+    ),
+    batch_size: int = Option(1000, help="Number of documents to copy at a time"),
+    fetch_concurrency: int = Option(4, help="Number of pages requested at the same time"),
+    upload_concurrency: Optional[int] = Option(  # noqa: UP045
+        None, help="Batches uploaded at the same time, defaults to upload_concurrency"
+    ),
+    restart: bool = Option(False, help="Start from the beginning instead of resuming"),
+) -> None:
+    """Copy an index's settings and documents from the configured server to another one."""
+
+    async def run() -> None:
+        from meilisearch_python_sdk import AsyncClient
+
+        from meilisearch_tui.client import get_client
+        from meilisearch_tui.config import load_config
+        from meilisearch_tui.migrate import MigrationCheckpoint, migrate_index
+
+        config = load_config()
+        async with get_client() as source, AsyncClient(
+            target_url, target_key, timeout=config.timeout
+        ) as target:
+            checkpoint = MigrationCheckpoint.for_migration(
+                config.config_dir / "migrations", source, index, target, target_index or index
+            )
+            if restart:
+                checkpoint.delete()
+                checkpoint = MigrationCheckpoint(checkpoint.path)
+            resumed_from = checkpoint.offset
+            copied = await migrate_index(
+                source,
+                index,
+                target,
+                target_index,
+                batch_size=batch_size,
+                fetch_concurrency=fetch_concurrency,
+                upload_concurrency=upload_concurrency or config.upload_concurrency,
+                checkpoint=checkpoint,
+            )
+        _write(
+            {
+                "index": index,
+                "targetIndex": target_index or index,
+                "resumedFrom": resumed_from,
+                "documentsCopied": copied,
+            }
+        )
+
+    _run(run)
+
+
+@typer_app.command()
+def stats(
+    index: Optional[str] = Argument(None, help="Only show this index"),  # noqa: UP045
+) -> None:
+    """Write the stats of each index as a line of JSON."""
+
+    async def run() -> None:
+        from meilisearch_tui.client import get_client, run_request
+
+        async with get_client() as client:
+            if index:
+                index_stats = await run_request("stats", client.index(index).get_stats)
+                _write({"uid": index, **_dump(index_stats)})
+                return
+
+            all_stats = await run_request("stats", client.get_all_stats)
+            for uid, index_stats in (all_stats.indexes or {}).items():
+                _write({"uid": uid, **_dump(index_stats)})
+
+    _run(run)
+
+
+@typer_app.command()
+def tasks(
+    status: Optional[List[str]] = Option(  # noqa: UP006, UP045
+        None, help="Only include tasks with this status, can be repeated"
+    ),
+    index: Optional[List[str]] = Option(  # noqa: UP006, UP045
+        None, help="Only include tasks for this index, can be repeated"
+    ),
+    limit: int = Option(20, help="Maximum number of tasks to return, newest first"),
+) -> None:
+    """Write tasks as lines of JSON, newest first."""
+
+    async def run() -> None:
+        from meilisearch_tui.client import get_client
+        from meilisearch_tui.tasks import get_tasks
+
+        async with get_client() as client:
+            from_ = None
+            remaining = limit
+            while remaining > 0:
+                task_status = await get_tasks(
+                    client,
+                    statuses=status,
+                    index_uids=index,
+                    limit=min(remaining, 1000),
+                    from_=from_,
+                )
+                for task in task_status.results:
+                    _write(_dump(task))
+                remaining -= len(task_status.results)
+                if task_status.next is None or not task_status.results:
+                    break
+                from_ = task_status.next
+
+    _run(run)
+
+
+@typer_app.command()
+def replay(
+    query_log: Path = Argument(..., exists=True, dir_okay=False, help="Text or JSONL query log"),
+    index: Optional[str] = Option(  # noqa: UP045
+        None, help="Index for queries that don't name one"
+    ),
+    qps: Optional[float] = Option(  # noqa: UP045
+        None, help="Queries to start per second, defaults to as fast as concurrency allows"
+    ),
+    concurrency: int = Option(10, help="Maximum number of queries in flight"),
+    warmup: float = Option(0.0, help="Seconds at the start that aren't measured"),
+    duration: Optional[float] = Option(  # noqa: UP045
+        None, help="Seconds to measure for, repeating the log as needed. Defaults to one pass"
+    ),
+) -> None:
+    """Replay a query log against the server and write a latency report as JSON."""
+
+    async def run() -> None:
+        from meilisearch_tui.client import get_client
+        from meilisearch_tui.config import load_config
+        from meilisearch_tui.replay import read_query_log
+        from meilisearch_tui.replay import replay as replay_queries
+
+        queries = read_query_log(query_log, index)
+        async with get_client() as client:
+            report = await replay_queries(
+                client,
+                queries,
+                qps=qps,
+                concurrency=concurrency,
+                warmup=warmup,
+                duration=duration,
+                timeout=load_config().search_timeout,
+            )
+        _write(report.summary())
+
+    _run(run)
+
+
+def _run(command: Callable[[], Awaitable[None]]) -> None:
+    """Run a command, reporting errors on stderr with a non-zero exit status."""
+    from meilisearch_python_sdk.errors import MeilisearchError
+
+    from meilisearch_tui.client import client_manager
+    from meilisearch_tui.errors import CircuitOpenError, NoMeilisearchUrlError
+
+    async def run() -> None:
+        try:
+            await command()
+        finally:
+            await client_manager.close()
+
+    try:
+        asyncio.run(run())
+    except (MeilisearchError, CircuitOpenError, NoMeilisearchUrlError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        raise Exit(1)
+    except BrokenPipeError:
+        # The reader went away, for example piping into head. Point stdout at devnull so the
+        # interpreter doesn't complain again while flushing at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+
+def _dump(model: Any) -> dict[str, Any]:
+    return model.model_dump(by_alias=True, mode="json")
+
+
+def _write(record: Any) -> None:
+    sys.stdout.write(json.dumps(record, default=str))
+    sys.stdout.write("\n")
@@ -1,22 +1,290 @@
 from __future__ import annotations
 
+import asyncio
+import random
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from enum import Enum
+from typing import Any, AsyncGenerator, Awaitable, Callable, TypeVar
 
+from httpx import AsyncClient as HttpxAsyncClient
+from httpx import (
+    ConnectError,
+    ConnectTimeout,
+    HTTPError,
+    RemoteProtocolError,
+    Response,
+    TransportError,
+)
 from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.errors import (
+    MeilisearchApiError,
+    MeilisearchCommunicationError,
+    MeilisearchTimeoutError,
+)
 
 from meilisearch_tui.config import load_config
-from meilisearch_tui.errors import NoMeilisearchUrlError
+from meilisearch_tui.errors import CircuitOpenError, NoMeilisearchUrlError
+from meilisearch_tui.metrics import (
+    RequestTiming,
+    current_timing,
+    on_request,
+    on_response,
+    request_metrics,
+)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class ClientManager:
+    """Owns the single pooled AsyncClient shared by every screen and widget.
+
+    The underlying httpx client keeps its connections alive between requests so searches don't
+    pay for a new TCP/TLS handshake each time. The client is rebuilt whenever the configured
+    URL or key changes.
+    """
+
+    def __init__(self) -> None:
+        self._client: AsyncClient | None = None
+        self._client_key: tuple[str, str | None, int | None] | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None
+
+    async def get(self) -> AsyncClient:
+        config = load_config()
+        if not config.meilisearch_url:
+            raise NoMeilisearchUrlError("No Meilisearch URL provided")
+
+        client_key = (config.meilisearch_url, config.master_key, config.timeout)
+        if self._client is None or self._client_key != client_key:
+            await self.close()
+            self._client = AsyncClient(
+                config.meilisearch_url, config.master_key, timeout=config.timeout
+            )
+            self._client.http_client.event_hooks = {
+                "request": [on_request],
+                "response": [on_response],
+            }
+            self._client_key = client_key
+
+        return self._client
+
+    async def reset(self) -> None:
+        """Close the current client so the next request builds one from the saved config."""
+        await self.close()
+        circuit_breakers.reset()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            client = self._client
+            self._client = None
+            self._client_key = None
+            await client.aclose()
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Stops sending requests to a server that keeps failing.
+
+    After `failure_threshold` failures in a row the breaker opens and requests fail straight away
+    for `reset_timeout` seconds. After that a single probe request is let through, the others
+    keep failing until it either closes the breaker or opens it for another `reset_timeout`
+    seconds.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.listeners: list[Callable[[BreakerState], None]] = []
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        return max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+
+    def before_request(self) -> bool:
+        """Raise CircuitOpenError if the request can't be sent, returns True if it is the probe.
+
+        The probe has to be followed by probe_finished whatever happens to it.
+        """
+        if self.state == BreakerState.CLOSED:
+            return False
+
+        if self.state == BreakerState.OPEN and self.retry_in > 0:
+            raise CircuitOpenError(
+                "Meilisearch is not responding, requests are paused for "
+                f"{self.retry_in:.0f} more seconds"
+            )
+        if self._probing:
+            raise CircuitOpenError(
+                "Meilisearch is not responding, waiting for a test request to finish"
+            )
+
+        self._probing = True
+        self._set_state(BreakerState.HALF_OPEN)
+        return True
+
+    def probe_finished(self) -> None:
+        """Let another probe through if this one ended without a success or failure."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probing = False
+        self._set_state(BreakerState.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == BreakerState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._probing = False
+            self._set_state(BreakerState.OPEN)
+
+    def reset(self) -> None:
+        self.failures = 0
+        self._probing = False
+        self._set_state(BreakerState.CLOSED)
+
+    def _set_state(self, state: BreakerState) -> None:
+        if state == self.state:
+            return
+
+        self.state = state
+        for listener in self.listeners:
+            listener(state)
+
+
+class CircuitBreakers:
+    """A CircuitBreaker for each Meilisearch server, by URL.
+
+    A server that is down, like the target of a migration, only pauses the requests sent to it.
+    Every breaker tells the same `listeners` when its state changes.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.listeners: list[Callable[[BreakerState], None]] = []
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, url: str) -> CircuitBreaker:
+        # httpx adds a trailing slash to a client's base URL, the config doesn't have one.
+        url = url.rstrip("/")
+        breaker = self._breakers.get(url)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            breaker.listeners = self.listeners
+            self._breakers[url] = breaker
+
+        return breaker
+
+    def reset(self) -> None:
+        for breaker in self._breakers.values():
+            breaker.reset()
+
+
+client_manager = ClientManager()
+circuit_breakers = CircuitBreakers()
 
 
 @asynccontextmanager
 async def get_client() -> AsyncGenerator[AsyncClient, None]:
-    config = load_config()
-    if not config.meilisearch_url:
-        raise NoMeilisearchUrlError("No Meilisearch URL provided")
+    yield await client_manager.get()
+
 
-    client = AsyncClient(config.meilisearch_url, config.master_key)
+async def send_request(
+    http_client: HttpxAsyncClient, method: str, url: str, **kwargs: Any
+) -> Response:
+    """Send a request the SDK doesn't have a method for, raising the same errors the SDK does."""
+    response = None
     try:
-        yield client
-    finally:
-        await client.aclose()
+        response = await http_client.request(method, url, **kwargs)
+        response.raise_for_status()
+    except (ConnectError, ConnectTimeout, RemoteProtocolError) as e:
+        raise MeilisearchCommunicationError(str(e)) from e
+    except HTTPError as e:
+        if response is not None and "application/json" in response.headers.get("content-type", ""):
+            raise MeilisearchApiError(str(e), response) from e
+        raise
+
+    return response
+
+
+def backoff_delay(attempt: int, base: float = 0.25, cap: float = 5.0) -> float:
+    """Exponential backoff with full jitter so retrying clients don't all come back at once."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, (MeilisearchCommunicationError, asyncio.TimeoutError, TransportError)):
+        return True
+    if isinstance(error, MeilisearchApiError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+
+    # The SDK wraps read and write timeouts in a plain MeilisearchError.
+    return isinstance(error.__cause__, TransportError)
+
+
+async def run_request(
+    operation: str,
+    request: Callable[[], Awaitable[T]],
+    *,
+    idempotent: bool = True,
+    url: str | None = None,
+) -> T:
+    """Run a request with the timeout configured for the operation.
+
+    Idempotent requests that fail because of the connection or an overloaded server are retried
+    with backoff. Every attempt goes through the circuit breaker of the server at `url`, the
+    configured one by default.
+    """
+    config = load_config()
+    timeout = getattr(config, f"{operation}_timeout", None) or config.timeout
+    attempts = max(config.max_retries, 0) + 1 if idempotent else 1
+    circuit_breaker = circuit_breakers.get(url or config.meilisearch_url or "")
+
+    for attempt in range(attempts):
+        probe = circuit_breaker.before_request()
+        timing = RequestTiming(operation)
+        token = current_timing.set(timing)
+        try:
+            return_value = await asyncio.wait_for(request(), timeout)
+        except Exception as e:
+            request_metrics.record(timing.sample(error=e))
+            if not is_retryable(e):
+                if isinstance(e, MeilisearchApiError):
+                    # The server answered, it just didn't like the request.
+                    circuit_breaker.record_success()
+                raise
+
+            circuit_breaker.record_failure()
+            if attempt == attempts - 1 or circuit_breaker.state == BreakerState.OPEN:
+                if isinstance(e, asyncio.TimeoutError):
+                    raise MeilisearchTimeoutError(
+                        f"The {operation} request took longer than {timeout} seconds"
+                    ) from e
+                raise
+
+            await asyncio.sleep(backoff_delay(attempt))
+        else:
+            request_metrics.record(timing.sample(return_value))
+            circuit_breaker.record_success()
+            return return_value
+        finally:
+            current_timing.reset(token)
+            if probe:
+                circuit_breaker.probe_finished()
+
+    raise AssertionError("unreachable")  # pragma: no cover
@@ -36,6 +36,21 @@ class Config:
         theme: Theme = Theme.DARK,
         semantic_ratio: float | None = None,
         embedder: str | None = None,
+        search_debounce_ms: int = 150,
+        max_concurrent_searches: int = 2,
+        search_cache_size: int = 256,
+        search_cache_ttl: float | None = None,
+        search_cache_revalidate: bool = False,
+        upload_concurrency: int = 4,
+        upload_compression: str | None = None,
+        upload_compression_level: int = 6,
+        search_timeout: float | None = 10.0,
+        settings_timeout: float | None = 30.0,
+        upload_timeout: float | None = 120.0,
+        tasks_timeout: float | None = 10.0,
+        max_retries: int = 3,
+        metrics_dir: str | None = None,
+        metrics_export_interval: float = 15.0,
         config_dir: Path | None = None,
     ) -> None:
         self.config_dir = config_dir or Config.get_default_directory()
@@ -48,6 +63,21 @@ class Config:
         self.theme = theme
         self.semantic_ratio = semantic_ratio
         self.embedder = embedder
+        self.search_debounce_ms = search_debounce_ms
+        self.max_concurrent_searches = max_concurrent_searches
+        self.search_cache_size = search_cache_size
+        self.search_cache_ttl = search_cache_ttl
+        self.search_cache_revalidate = search_cache_revalidate
+        self.upload_concurrency = upload_concurrency
+        self.upload_compression = upload_compression
+        self.upload_compression_level = upload_compression_level
+        self.search_timeout = search_timeout
+        self.settings_timeout = settings_timeout
+        self.upload_timeout = upload_timeout
+        self.tasks_timeout = tasks_timeout
+        self.max_retries = max_retries
+        self.metrics_dir = metrics_dir
+        self.metrics_export_interval = metrics_export_interval
 
     def delete(self) -> None:
         if self.settings_file.exists():
@@ -71,6 +101,27 @@ class Config:
             self.theme = Theme.DARK if saved_theme == "dark" else Theme.LIGHT
             self.semantic_ratio = settings.get("semantic_ratio")
             self.embedder = settings.get("embedder")
+            self.search_debounce_ms = settings.get("search_debounce_ms", self.search_debounce_ms)
+            self.max_concurrent_searches = settings.get(
+                "max_concurrent_searches", self.max_concurrent_searches
+            )
+            self.search_cache_size = settings.get("search_cache_size", self.search_cache_size)
+            self.search_cache_ttl = settings.get("search_cache_ttl")
+            self.search_cache_revalidate = settings.get("search_cache_revalidate", False)
+            self.upload_concurrency = settings.get("upload_concurrency", self.upload_concurrency)
+            self.upload_compression = settings.get("upload_compression")
+            self.upload_compression_level = settings.get(
+                "upload_compression_level", self.upload_compression_level
+            )
+            self.search_timeout = settings.get("search_timeout", self.search_timeout)
+            self.settings_timeout = settings.get("settings_timeout", self.settings_timeout)
+            self.upload_timeout = settings.get("upload_timeout", self.upload_timeout)
+            self.tasks_timeout = settings.get("tasks_timeout", self.tasks_timeout)
+            self.max_retries = settings.get("max_retries", self.max_retries)
+            self.metrics_dir = settings.get("metrics_dir")
+            self.metrics_export_interval = settings.get(
+                "metrics_export_interval", self.metrics_export_interval
+            )
 
         if os.getenv("MEILI_HTTP_ADDR", None):
             self.meilisearch_url = os.getenv("MEILI_HTTP_ADDR")
@@ -108,6 +159,30 @@ class Config:
         if self.embedder:
             settings["embedder"] = self.embedder
 
+        settings["search_debounce_ms"] = self.search_debounce_ms
+        settings["max_concurrent_searches"] = self.max_concurrent_searches
+        settings["search_cache_size"] = self.search_cache_size
+        settings["upload_concurrency"] = self.upload_concurrency
+        settings["upload_compression_level"] = self.upload_compression_level
+        settings["search_timeout"] = self.search_timeout
+        settings["settings_timeout"] = self.settings_timeout
+        settings["upload_timeout"] = self.upload_timeout
+        settings["tasks_timeout"] = self.tasks_timeout
+        settings["max_retries"] = self.max_retries
+        settings["metrics_export_interval"] = self.metrics_export_interval
+
+        if self.metrics_dir:
+            settings["metrics_dir"] = self.metrics_dir
+
+        if self.upload_compression:
+            settings["upload_compression"] = self.upload_compression
+
+        if self.search_cache_ttl:
+            settings["search_cache_ttl"] = self.search_cache_ttl
+
+        if self.search_cache_revalidate:
+            settings["search_cache_revalidate"] = self.search_cache_revalidate
+
         if settings:
             with open(self.settings_file, "w") as f:
                 json.dump(settings, f)
@@ -1,5 +1,13 @@
 from __future__ import annotations
 
 
+class CircuitOpenError(Exception):
+    pass
+
+
+class MigrationError(Exception):
+    pass
+
+
 class NoMeilisearchUrlError(Exception):
     pass
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from typing import IO, Any, AsyncGenerator
+
+from meilisearch_python_sdk.index import AsyncIndex
+from meilisearch_python_sdk.models.documents import DocumentsInfo
+
+from meilisearch_tui.client import run_request
+
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+DEFAULT_EXPORT_CONCURRENCY = 4
+GZIP_LEVEL = 6
+
+
+class ExportProgress:
+    """Tracks an export from the first page requested until the file is complete."""
+
+    def __init__(self) -> None:
+        self.total_documents = 0
+        self.documents_written = 0
+        self.bytes_written = 0
+        self.started_at = time.monotonic()
+        self.finished_at: float | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def documents_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.documents_written / elapsed if elapsed else 0.0
+
+    @property
+    def eta(self) -> float | None:
+        if self.finished:
+            return 0.0
+        if not self.documents_written:
+            return None
+
+        remaining = max(self.total_documents - self.documents_written, 0)
+        return remaining / self.documents_per_second
+
+    def record_page(self, document_count: int, size: int) -> None:
+        self.documents_written += document_count
+        self.bytes_written += size
+
+    def finish(self) -> None:
+        if self.finished_at is None:
+            self.finished_at = time.monotonic()
+
+
+async def iter_document_pages(
+    index: AsyncIndex,
+    *,
+    start: int = 0,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    concurrency: int = DEFAULT_EXPORT_CONCURRENCY,
+    fields: list[str] | None = None,
+) -> AsyncGenerator[tuple[int, DocumentsInfo], None]:
+    """Yield every page of documents from `start` on, in offset order, with its offset.
+
+    Pages are requested `concurrency` at a time. A page that arrives early waits in the window
+    until the pages before it have been yielded, and the window is only topped up as pages are
+    taken from it, so memory use depends on the batch size and concurrency and not on the size
+    of the index.
+
+    Documents added while the pages are read may be missed, and ones deleted can shift later
+    pages.
+    """
+
+    url = str(index.http_client.base_url)
+
+    async def fetch(offset: int) -> DocumentsInfo:
+        return await run_request(
+            "documents",
+            lambda: index.get_documents(offset=offset, limit=batch_size, fields=fields),
+            url=url,
+        )
+
+    offset = start
+    page = await fetch(offset)
+    window: dict[int, asyncio.Future[DocumentsInfo]] = {}
+    next_offset = offset + batch_size
+    try:
+        while True:
+            while len(window) < max(concurrency, 1) and next_offset < page.total:
+                window[next_offset] = asyncio.ensure_future(fetch(next_offset))
+                next_offset += batch_size
+
+            yield offset, page
+
+            offset += batch_size
+            if offset not in window:
+                break
+            page = await window.pop(offset)
+    finally:
+        for future in window.values():
+            future.cancel()
+        await asyncio.gather(*window.values(), return_exceptions=True)
+
+
+async def export_documents(
+    index: AsyncIndex,
+    output: IO[bytes],
+    *,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    concurrency: int = DEFAULT_EXPORT_CONCURRENCY,
+    fields: list[str] | None = None,
+    progress: ExportProgress | None = None,
+) -> int:
+    """Write every document in an index to `output` as NDJSON, returning the number written.
+
+    Pages are fetched concurrently with iter_document_pages, and serialized and written in a
+    thread while the next pages are on their way.
+    """
+    loop = asyncio.get_running_loop()
+    written = 0
+    pages = iter_document_pages(
+        index, batch_size=batch_size, concurrency=concurrency, fields=fields
+    )
+    try:
+        async for _, page in pages:
+            if progress:
+                progress.total_documents = page.total
+            size = await loop.run_in_executor(None, _write_documents, output, page.results)
+            written += len(page.results)
+            if progress:
+                progress.record_page(len(page.results), size)
+    finally:
+        await pages.aclose()
+
+    if progress:
+        progress.finish()
+
+    return written
+
+
+async def export_to_file(index: AsyncIndex, path: Path, **kwargs: Any) -> int:
+    """Export an index to a file, gzip compressed if the name ends in .gz.
+
+    The export is written next to `path` and only moved into place once it is complete, so an
+    interrupted export never looks like a finished one.
+    """
+    partial = path.with_name(f"{path.name}.partial")
+    loop = asyncio.get_running_loop()
+    output = await loop.run_in_executor(None, _open_output, partial, path.suffix == ".gz")
+    try:
+        written = await export_documents(index, output, **kwargs)
+    except BaseException:
+        output.close()
+        partial.unlink(missing_ok=True)
+        raise
+
+    await loop.run_in_executor(None, output.close)
+    os.replace(partial, path)
+
+    return written
+
+
+def _open_output(path: Path, compress: bool) -> IO[bytes]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if compress:
+        return gzip.open(path, "wb", compresslevel=GZIP_LEVEL)  # type: ignore[return-value]
+
+    return open(path, "wb")
+
+
+def to_ndjson(documents: list[dict[str, Any]]) -> bytes:
+    return "".join(f"{json.dumps(x)}\n" for x in documents).encode()
+
+
+def _write_documents(output: IO[bytes], documents: list[dict[str, Any]]) -> int:
+    data = to_ndjson(documents)
+    output.write(data)
+
+    return len(data)
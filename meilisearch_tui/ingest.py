@@ -0,0 +1,984 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import csv
+import glob
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, BinaryIO, Callable, Generator, Iterator, NamedTuple
+from urllib.parse import urlencode
+
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.index import AsyncIndex
+from meilisearch_python_sdk.models.task import TaskInfo, TaskResult
+
+from meilisearch_tui.client import get_client, run_request, send_request
+from meilisearch_tui.tasks import FINISHED_STATUSES, MAX_UIDS_PER_REQUEST, get_tasks, task_duration
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_BATCH_BYTES = 10 * 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+MAX_POLLED_TASKS = 500
+READ_CHUNK_SIZE = 1024 * 1024
+CHECKPOINT_DIR = "checkpoints"
+COMPRESSION_SUFFIXES = (".gz", ".zst")
+ZSTD_MISSING = "Loading .zst files needs the zstd extra, install meilisearch-tui[zstd]"
+UPLOAD_ENCODINGS = ("gzip", "deflate")
+DEFAULT_COMPRESSION_LEVEL = 6
+# Document files at least this big on disk, compressed or not, are read in another process.
+PROCESS_POOL_MIN_BYTES = 64 * 1024 * 1024
+
+CONTENT_TYPES = {
+    ".csv": "text/csv",
+    ".json": "application/x-ndjson",
+    ".jsonl": "application/x-ndjson",
+    ".ndjson": "application/x-ndjson",
+}
+
+
+class DocumentBatch(NamedTuple):
+    """A slice of a document file ready to send to Meilisearch.
+
+    `start` and `end` are the byte offsets in the source file covered by the batch, or the document
+    offsets in the source index when migrating. A compressed batch has the `content_encoding` it
+    was compressed with.
+    """
+
+    payload: bytes
+    content_type: str
+    document_count: int
+    start: int
+    end: int
+    content_encoding: str | None = None
+
+
+class BatchSizer:
+    """Adjusts the number of documents per batch based on how fast the server is responding.
+
+    Batches grow while uploads and indexing finish well under the targets, and are halved as soon
+    as either one takes longer than its target.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        *,
+        min_batch_size: int = 100,
+        max_batch_size: int = 50_000,
+        target_latency: float = 1.0,
+        target_task_duration: float = 5.0,
+    ) -> None:
+        self.batch_size = batch_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.target_latency = target_latency
+        self.target_task_duration = target_task_duration
+
+    def record_latency(self, seconds: float) -> None:
+        self._adjust(seconds, self.target_latency)
+
+    def record_task_duration(self, seconds: float) -> None:
+        self._adjust(seconds, self.target_task_duration)
+
+    def _adjust(self, seconds: float, target: float) -> None:
+        if seconds > target:
+            self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+        elif seconds < target / 2:
+            self.batch_size = min(self.max_batch_size, int(self.batch_size * 1.5))
+
+
+class IngestProgress:
+    """Tracks a load from the first byte read until the last task finishes indexing."""
+
+    def __init__(self, total_bytes: int = 0) -> None:
+        self.total_bytes = total_bytes
+        self.bytes_sent = 0
+        self.bytes_uploaded = 0
+        self.documents_enqueued = 0
+        self.documents_indexed = 0
+        self.task_statuses: dict[int, str] = {}
+        self.failed_tasks: list[TaskResult] = []
+        self.upload_finished = False
+        self.started_at = time.monotonic()
+        self.finished_at: float | None = None
+
+    @property
+    def pending_task_uids(self) -> list[int]:
+        return sorted(
+            uid for uid, status in self.task_statuses.items() if status not in FINISHED_STATUSES
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.upload_finished and not self.pending_task_uids
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def documents_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.documents_indexed / elapsed if elapsed else 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """How many bytes of the document file were sent for every byte uploaded."""
+        return self.bytes_sent / self.bytes_uploaded if self.bytes_uploaded else 1.0
+
+    @property
+    def eta(self) -> float | None:
+        """Estimated seconds until indexing finishes, or None if there isn't enough data yet."""
+        if self.finished:
+            return 0.0
+        if not self.documents_indexed or not self.bytes_sent:
+            return None
+
+        # Until the whole file has been read the total number of documents is estimated from the
+        # share of the file sent so far.
+        if self.upload_finished or not self.total_bytes:
+            total_documents = float(self.documents_enqueued)
+        else:
+            total_documents = self.documents_enqueued * self.total_bytes / self.bytes_sent
+
+        return max(total_documents - self.documents_indexed, 0) / self.documents_per_second
+
+    def finish_upload(self) -> None:
+        self.upload_finished = True
+        if self.finished and self.finished_at is None:
+            self.finished_at = time.monotonic()
+
+    def record_batch(self, batch: DocumentBatch, task: TaskInfo) -> None:
+        self.bytes_sent += batch.end - batch.start
+        self.bytes_uploaded += len(batch.payload)
+        self.documents_enqueued += batch.document_count
+        self.task_statuses[task.task_uid] = task.status
+
+    def record_task(self, task: TaskResult) -> None:
+        previous = self.task_statuses.get(task.uid)
+        self.task_statuses[task.uid] = task.status
+        if previous == task.status or task.status not in FINISHED_STATUSES:
+            return
+
+        if task.status == "failed":
+            self.failed_tasks.append(task)
+        elif task.details:
+            self.documents_indexed += task.details.get("indexedDocuments") or 0
+
+        if self.finished and self.finished_at is None:
+            self.finished_at = time.monotonic()
+
+
+class MultiFileProgress(IngestProgress):
+    """Tracks a load of several files, in total and for each file in `files`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.files: dict[Path, IngestProgress] = {}
+        self._size_known = True
+        self._task_files: dict[int, IngestProgress] = {}
+
+    @property
+    def files_finished(self) -> int:
+        return sum(1 for x in self.files.values() if x.finished)
+
+    def add_file(self, path: Path) -> IngestProgress:
+        size = document_size(path)
+        self._size_known = self._size_known and bool(size)
+        self.total_bytes = self.total_bytes + size if self._size_known else 0
+        progress = _FileProgress(self, size)
+        self.files[path] = progress
+
+        return progress
+
+    def record_task(self, task: TaskResult) -> None:
+        super().record_task(task)
+        file_progress = self._task_files.get(task.uid)
+        if file_progress:
+            file_progress.record_task(task)
+
+
+class _FileProgress(IngestProgress):
+    def __init__(self, parent: MultiFileProgress, total_bytes: int) -> None:
+        super().__init__(total_bytes)
+        self.parent = parent
+
+    def record_batch(self, batch: DocumentBatch, task: TaskInfo) -> None:
+        super().record_batch(batch, task)
+        self.parent.record_batch(batch, task)
+        self.parent._task_files[task.task_uid] = self
+
+
+class IngestCheckpoint:
+    """The batches of a document file the server has accepted, so an interrupted load can skip them.
+
+    Each accepted batch is appended to the file as it happens, so a crash loses at most the
+    batches that were in flight. The file is kept open between batches and only closed by close
+    or delete. The checkpoint is thrown away if the document file changes.
+    """
+
+    def __init__(self, path: Path, source: Path) -> None:
+        self.path = path
+        self.source = source
+        self.batches: list[tuple[int, int, int]] = []
+        self._file: IO[str] | None = None
+        # Batches in flight at the same time are recorded from different threads.
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_load(
+        cls, directory: Path, client: AsyncClient, index_uid: str, source: Path
+    ) -> IngestCheckpoint:
+        key = json.dumps([str(client.http_client.base_url), index_uid, str(source.resolve())])
+        return cls(directory / f"{hashlib.sha256(key.encode()).hexdigest()[:16]}.jsonl", source)
+
+    @property
+    def offset(self) -> int:
+        """The byte offset every batch before has been accepted up to."""
+        ends = {start: end for start, end, _ in self.batches}
+        offset = 0
+        while offset in ends:
+            offset = ends[offset]
+
+        return offset
+
+    def load(self) -> None:
+        self.batches = []
+        if not self.path.exists():
+            return
+
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if not lines or json.loads(lines[0]) != self._source_info():
+            self.delete()
+            return
+
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partly written last line from a crash.
+                continue
+            self.batches.append((record["start"], record["end"], record["taskUid"]))
+
+    async def verify(self, client: AsyncClient) -> None:
+        """Forget batches whose task failed, was canceled, or no longer exists on the server."""
+        uids = [uid for _, _, uid in self.batches]
+        statuses: dict[int, str] = {}
+        for i in range(0, len(uids), MAX_UIDS_PER_REQUEST):
+            chunk = uids[i : i + MAX_UIDS_PER_REQUEST]
+            status = await get_tasks(client, uids=chunk, limit=len(chunk))
+            statuses.update((x.uid, x.status) for x in status.results)
+
+        self.batches = [
+            x for x in self.batches if statuses.get(x[2]) not in (None, "failed", "canceled")
+        ]
+
+    def record(self, batch: DocumentBatch, task: TaskInfo) -> None:
+        """Append an accepted batch, this touches the disk so call it from a thread."""
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                new_file = not self.path.exists()
+                self._file = open(self.path, "a", encoding="utf-8")
+                if new_file:
+                    self._file.write(f"{json.dumps(self._source_info())}\n")
+            record = {"start": batch.start, "end": batch.end, "taskUid": task.task_uid}
+            self._file.write(f"{json.dumps(record)}\n")
+            self._file.flush()
+            self.batches.append((batch.start, batch.end, task.task_uid))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def delete(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def _source_info(self) -> dict[str, int]:
+        stat = self.source.stat()
+        return {"size": stat.st_size, "mtimeNs": stat.st_mtime_ns}
+
+
+def iter_batches(
+    path: Path,
+    *,
+    batch_size: int | BatchSizer = DEFAULT_BATCH_SIZE,
+    max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    select: Callable[[bytes, bytes], bool] | None = None,
+    start: int = 0,
+) -> Generator[DocumentBatch, None, None]:
+    """Read a json, jsonl/ndjson, or csv file incrementally and split it into batches.
+
+    Only one batch worth of documents is held in memory at a time. Every JSON document is checked
+    to be an object and re-serialized without whitespace on a line of its own, so JSON arrays are
+    sent as NDJSON. Every csv row is checked to have as many fields as the header. Invalid
+    documents raise a ValueError with the byte offset they end at. If a BatchSizer is
+    passed its current size is used for each new batch. If `select` is passed it is called with
+    the csv header (empty for other formats) and each record, and only records it returns True
+    for are sent. A non-zero `start` must be the end of an earlier batch, reading carries on from
+    there.
+    """
+    suffix = document_suffix(path)
+    content_type = CONTENT_TYPES.get(suffix)
+    if content_type is None:
+        raise ValueError(f"Unsupported file type: {suffix}")
+
+    with _open_documents(path) as f:
+        if suffix == ".json":
+            records = _iter_json_array(f, start)
+            header = b""
+        elif suffix == ".csv":
+            header, records = _read_csv(f, start)
+        else:
+            _seek(f, start)
+            records = _iter_ndjson(f, start)
+            header = b""
+
+        if select is not None:
+            records = ((x, end) for x, end in records if select(header, x))
+
+        yield from _batch_records(
+            records,
+            content_type=content_type,
+            header=header,
+            batch_size=batch_size,
+            max_batch_bytes=max_batch_bytes,
+            start=start,
+        )
+
+
+async def add_documents_in_batches(
+    index: AsyncIndex,
+    path: Path,
+    *,
+    primary_key: str | None = None,
+    batch_size: int | BatchSizer = DEFAULT_BATCH_SIZE,
+    max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: IngestProgress | None = None,
+    select: Callable[[bytes, bytes], bool] | None = None,
+    checkpoint: IngestCheckpoint | None = None,
+    slots: asyncio.Semaphore | None = None,
+    compression: str | None = None,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    pool: ProcessPoolExecutor | None = None,
+    ordered: bool = False,
+) -> list[TaskInfo]:
+    """Stream a document file to an index with up to `concurrency` batches in flight.
+
+    The file can be gzip or zstd compressed, it is decompressed as it is read. The next batch is
+    only read once an upload slot is free, so a slow server holds back reading
+    instead of letting payloads pile up in memory. Reading happens in a thread so large files
+    don't block the event loop. With more than one batch in flight Meilisearch may enqueue
+    batches out of order, which only matters if a document appears in more than one batch.
+
+    With `ordered` batches are still read and compressed up to `concurrency` ahead, but each one
+    is only sent once the batch before it has been enqueued. Meilisearch processes tasks in the
+    order they were enqueued, so a document that appears more than once ends up as its last
+    version in the file, at the cost of having a single upload in flight.
+
+    With a checkpoint the load starts after the batches it already has, records each batch the
+    server accepts, and is deleted once the whole file has been sent. Loads that share `slots`
+    also share its limit on batches being read or sent.
+
+    With `compression` set to gzip or deflate each batch is compressed in the same thread that
+    reads it, so compressing the next batch overlaps with sending the ones before it.
+
+    With a `pool` from parse_pool the file is read in that process instead of a thread, so
+    decompressing, parsing, validating, `select` and compressing are done on another core and
+    don't hold the GIL while the event loop is trying to run. The file stays open there between
+    batches. Without a pool one is started for files of at least PROCESS_POOL_MIN_BYTES. A
+    `select` is copied to the process and whatever it recorded is copied back once the whole file
+    has been read.
+
+    Returns the enqueued tasks in file order.
+    """
+    if compression is not None and compression not in UPLOAD_ENCODINGS:
+        raise ValueError(f"Unsupported upload compression: {compression}, use gzip or deflate")
+
+    start = checkpoint.offset if checkpoint else 0
+    if progress and start:
+        progress.total_bytes = max(progress.total_bytes - start, 0)
+    sizer = batch_size if isinstance(batch_size, BatchSizer) else None
+    slots = slots or asyncio.Semaphore(max(concurrency, 1))
+    loop = asyncio.get_running_loop()
+    in_flight: set[asyncio.Future[tuple[int, TaskInfo]]] = set()
+    tasks: dict[int, TaskInfo] = {}
+
+    own_pool = None
+    if pool is None and path.stat().st_size >= PROCESS_POOL_MIN_BYTES:
+        pool = own_pool = parse_pool()
+    reader = uuid.uuid4().hex
+
+    async def read_next() -> DocumentBatch | None:
+        size = batch_size.batch_size if isinstance(batch_size, BatchSizer) else batch_size
+        return await loop.run_in_executor(
+            pool, _read_next, reader, size, compression, compression_level
+        )
+
+    previous: asyncio.Future[tuple[int, TaskInfo]] | None = None
+
+    async def send(
+        number: int, batch: DocumentBatch, previous: asyncio.Future[tuple[int, TaskInfo]] | None
+    ) -> tuple[int, TaskInfo]:
+        if ordered and previous is not None:
+            # Waited on rather than awaited so cancelling this upload doesn't cancel the one
+            # before it.
+            await asyncio.wait([previous])
+            previous.result()
+        start = time.perf_counter()
+        task = await send_batch(index, batch, primary_key=primary_key)
+        if sizer:
+            sizer.record_latency(time.perf_counter() - start)
+        if progress:
+            progress.record_batch(batch, task)
+        if checkpoint:
+            await loop.run_in_executor(None, checkpoint.record, batch, task)
+        return number, task
+
+    async def wait_for_slot(limit: int) -> None:
+        nonlocal in_flight
+        while len(in_flight) > limit:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                number, task = future.result()
+                tasks[number] = task
+
+    try:
+        await loop.run_in_executor(pool, _open_reader, reader, path, start, max_batch_bytes, select)
+        number = 0
+        while True:
+            await wait_for_slot(max(concurrency, 1) - 1)
+            await slots.acquire()
+            try:
+                batch = await read_next()
+            except BaseException:
+                slots.release()
+                raise
+            if batch is None:
+                slots.release()
+                break
+            upload = asyncio.ensure_future(send(number, batch, previous))
+            previous = upload
+            # A callback rather than a finally in send, so the slot is freed even if the upload
+            # is cancelled before it starts.
+            upload.add_done_callback(lambda _: slots.release())
+            in_flight.add(upload)
+            number += 1
+        await wait_for_slot(0)
+        selected = await loop.run_in_executor(pool, _close_reader, reader)
+        if select is not None and selected is not select:
+            # It ran in another process, bring back what it recorded there.
+            vars(select).update(vars(selected))
+        if checkpoint:
+            checkpoint.delete()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        # Does nothing if the reader was already closed above.
+        await asyncio.gather(
+            loop.run_in_executor(pool, _close_reader, reader), return_exceptions=True
+        )
+        if checkpoint:
+            checkpoint.close()
+        if own_pool is not None:
+            own_pool.shutdown(wait=False)
+        if progress:
+            progress.finish_upload()
+
+    return [tasks[x] for x in sorted(tasks)]
+
+
+async def add_files_in_batches(
+    index: AsyncIndex,
+    paths: list[Path],
+    *,
+    primary_key: str | None = None,
+    batch_size: int | BatchSizer = DEFAULT_BATCH_SIZE,
+    max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: MultiFileProgress | None = None,
+    checkpoint_dir: Path | None = None,
+    compression: str | None = None,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    ordered: bool = False,
+) -> list[TaskInfo]:
+    """Load several document files into an index, sharing `concurrency` upload slots between them.
+
+    Up to `concurrency` files are read at once so a slot freed by one file can be used straight
+    away by another. The files are enqueued side by side, so if a document is in more than one
+    file which version wins isn't defined. With `ordered` the files are loaded one after another
+    and each file's batches are enqueued in order, see add_documents_in_batches. With a
+    `checkpoint_dir` each file resumes from its own checkpoint. If the files add up to at least
+    PROCESS_POOL_MIN_BYTES they are read in worker processes, one for each file being read up to
+    the number of cores.
+
+    Returns the enqueued tasks, grouped by file in the order of `paths`.
+    """
+    slots = asyncio.Semaphore(max(concurrency, 1))
+    queue = list(enumerate(paths))
+    tasks: dict[int, list[TaskInfo]] = {}
+    file_progress = {x: progress.add_file(x) for x in paths} if progress else {}
+    loader_count = 1 if ordered else min(concurrency, len(paths))
+    pools: list[ProcessPoolExecutor] = []
+    if sum(x.stat().st_size for x in paths) >= PROCESS_POOL_MIN_BYTES:
+        pools = [parse_pool() for _ in range(min(loader_count, os.cpu_count() or 1))]
+
+    async def load_files(pool: ProcessPoolExecutor | None) -> None:
+        while queue:
+            number, path = queue.pop(0)
+            checkpoint = None
+            if checkpoint_dir is not None:
+                async with get_client() as client:
+                    checkpoint = await open_checkpoint(checkpoint_dir, client, index.uid, path)
+            tasks[number] = await add_documents_in_batches(
+                index,
+                path,
+                primary_key=primary_key,
+                batch_size=batch_size,
+                max_batch_bytes=max_batch_bytes,
+                concurrency=concurrency,
+                progress=file_progress.get(path),
+                checkpoint=checkpoint,
+                slots=slots,
+                compression=compression,
+                compression_level=compression_level,
+                pool=pool,
+                ordered=ordered,
+            )
+
+    loaders = [
+        asyncio.ensure_future(load_files(pools[i % len(pools)] if pools else None))
+        for i in range(loader_count)
+    ]
+    try:
+        await asyncio.gather(*loaders)
+    finally:
+        for loader in loaders:
+            loader.cancel()
+        await asyncio.gather(*loaders, return_exceptions=True)
+        for pool in pools:
+            pool.shutdown(wait=False)
+        if progress:
+            progress.finish_upload()
+
+    return [x for number in sorted(tasks) for x in tasks[number]]
+
+
+async def open_checkpoint(
+    directory: Path, client: AsyncClient, index_uid: str, path: Path
+) -> IngestCheckpoint:
+    """Load the checkpoint of an earlier load of `path`, keeping the batches that are still good."""
+    checkpoint = IngestCheckpoint.for_load(directory, client, index_uid, path)
+    await asyncio.get_running_loop().run_in_executor(None, checkpoint.load)
+    if checkpoint.batches:
+        await checkpoint.verify(client)
+
+    return checkpoint
+
+
+def expand_paths(pattern: str) -> list[Path]:
+    """The document files a path, directory, or glob pattern refers to, in sorted order.
+
+    Directories are searched recursively and only files with a supported suffix are kept.
+    """
+    path = Path(pattern).expanduser()
+    if path.is_file():
+        return _check_readable([path])
+
+    if path.is_dir():
+        candidates = path.rglob("*")
+    elif any(x in pattern for x in "*?["):
+        candidates = (Path(x) for x in glob.iglob(str(path), recursive=True))
+    else:
+        raise ValueError(f"{pattern} does not exist")
+
+    paths = sorted(x for x in candidates if x.is_file() and document_suffix(x) in CONTENT_TYPES)
+    if not paths:
+        raise ValueError(f"No json, jsonl, ndjson, or csv files found in {pattern}")
+
+    return _check_readable(paths)
+
+
+def _check_readable(paths: list[Path]) -> list[Path]:
+    # Fail before anything is sent rather than part way through a directory.
+    if any(x.suffix == ".zst" for x in paths) and importlib.util.find_spec("zstandard") is None:
+        raise ValueError(ZSTD_MISSING)
+
+    return paths
+
+
+def document_size(path: Path) -> int:
+    """The size of a document file for progress, 0 if compressed since the real size isn't known."""
+    return 0 if path.suffix in COMPRESSION_SUFFIXES else path.stat().st_size
+
+
+async def watch_progress(
+    progress: IngestProgress,
+    *,
+    sizer: BatchSizer | None = None,
+    min_interval: float = 0.25,
+    max_interval: float = 5.0,
+) -> None:
+    """Poll the tasks of a load until all of them have finished.
+
+    Every round is a single get_tasks request filtered to the unfinished task uids. The wait
+    between rounds doubles while nothing changes and resets as soon as a task moves. It doesn't
+    back off while the upload is still running since new tasks keep arriving.
+    """
+    interval = min_interval
+    while not progress.finished:
+        pending = progress.pending_task_uids[:MAX_POLLED_TASKS]
+        changed = False
+        if pending:
+            async with get_client() as client:
+                status = await get_tasks(client, uids=pending, limit=len(pending))
+            for task in status.results:
+                if progress.task_statuses.get(task.uid) != task.status:
+                    changed = True
+                progress.record_task(task)
+                duration = task_duration(task)
+                if sizer and task.status == "succeeded" and duration is not None:
+                    sizer.record_task_duration(duration)
+
+        if progress.finished:
+            return
+
+        if changed or not progress.upload_finished:
+            interval = min_interval
+        else:
+            interval = min(interval * 2, max_interval)
+        await asyncio.sleep(interval)
+
+
+async def send_batch(
+    index: AsyncIndex, batch: DocumentBatch, *, primary_key: str | None = None
+) -> TaskInfo:
+    url = f"indexes/{index.uid}/documents"
+    if primary_key:
+        url = f"{url}?{urlencode({'primaryKey': primary_key})}"
+
+    headers = {"Content-Type": batch.content_type}
+    if batch.content_encoding:
+        headers["Content-Encoding"] = batch.content_encoding
+
+    # Posting the same batch twice would enqueue it twice, so uploads are never retried.
+    response = await run_request(
+        "upload",
+        lambda: send_request(
+            index.http_client, "POST", url, content=batch.payload, headers=headers
+        ),
+        idempotent=False,
+        url=str(index.http_client.base_url),
+    )
+
+    return TaskInfo(**response.json())
+
+
+def compress_batch(
+    batch: DocumentBatch, encoding: str, level: int = DEFAULT_COMPRESSION_LEVEL
+) -> DocumentBatch:
+    """Compress a batch to be sent with a gzip or deflate Content-Encoding."""
+    if encoding == "gzip":
+        payload = gzip.compress(batch.payload, compresslevel=level)
+    elif encoding == "deflate":
+        payload = zlib.compress(batch.payload, level)
+    else:
+        raise ValueError(f"Unsupported upload compression: {encoding}, use gzip or deflate")
+
+    return batch._replace(payload=payload, content_encoding=encoding)
+
+
+def parse_pool() -> ProcessPoolExecutor:
+    """A worker process to read document files in for add_documents_in_batches.
+
+    It has a single worker so a file being read stays open in the same process between batches.
+    The process is spawned rather than forked because forking copies the running app's threads in
+    whatever state they happen to be in.
+    """
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+
+class _Reader:
+    def __init__(
+        self,
+        path: Path,
+        start: int,
+        max_batch_bytes: int,
+        select: Callable[[bytes, bytes], bool] | None,
+    ) -> None:
+        self.sizer = BatchSizer()
+        self.select = select
+        # A load's next read can still be running in a thread when it is cancelled and closed.
+        self.lock = threading.Lock()
+        self.batches = iter_batches(
+            path,
+            batch_size=self.sizer,
+            max_batch_bytes=max_batch_bytes,
+            select=select,
+            start=start,
+        )
+
+
+# The files being read in this process by add_documents_in_batches, by load.
+_readers: dict[str, _Reader] = {}
+
+
+def _open_reader(
+    key: str,
+    path: Path,
+    start: int,
+    max_batch_bytes: int,
+    select: Callable[[bytes, bytes], bool] | None,
+) -> None:
+    _readers[key] = _Reader(path, start, max_batch_bytes, select)
+
+
+def _read_next(
+    key: str, batch_size: int, compression: str | None, level: int
+) -> DocumentBatch | None:
+    reader = _readers[key]
+    with reader.lock:
+        reader.sizer.batch_size = batch_size
+        return _next_batch(reader.batches, compression, level)
+
+
+def _close_reader(key: str) -> Callable[[bytes, bytes], bool] | None:
+    reader = _readers.pop(key, None)
+    if reader is None:
+        return None
+
+    with reader.lock:
+        reader.batches.close()
+    return reader.select
+
+
+def _next_batch(
+    batches: Iterator[DocumentBatch], compression: str | None, level: int
+) -> DocumentBatch | None:
+    batch = next(batches, None)
+    if batch is None or compression is None:
+        return batch
+
+    return compress_batch(batch, compression, level)
+
+
+def _batch_records(
+    records: Iterator[tuple[bytes, int]],
+    *,
+    content_type: str,
+    header: bytes,
+    batch_size: int | BatchSizer,
+    max_batch_bytes: int,
+    start: int = 0,
+) -> Iterator[DocumentBatch]:
+    def current_size() -> int:
+        return batch_size.batch_size if isinstance(batch_size, BatchSizer) else batch_size
+
+    batch: list[bytes] = []
+    batch_bytes = len(header)
+    end = start
+    size = current_size()
+
+    for record, record_end in records:
+        if batch and (len(batch) >= size or batch_bytes + len(record) > max_batch_bytes):
+            yield DocumentBatch(header + b"".join(batch), content_type, len(batch), start, end)
+            batch = []
+            batch_bytes = len(header)
+            start = end
+            size = current_size()
+
+        batch.append(record)
+        batch_bytes += len(record)
+        end = record_end
+
+    if batch:
+        yield DocumentBatch(header + b"".join(batch), content_type, len(batch), start, end)
+
+
+def document_suffix(path: Path) -> str:
+    """The suffix that says what format the documents are in, ignoring compression."""
+    if path.suffix in COMPRESSION_SUFFIXES:
+        return Path(path.stem).suffix
+
+    return path.suffix
+
+
+def _open_documents(path: Path) -> BinaryIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    if path.suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(ZSTD_MISSING) from None
+
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.BufferedReader(reader, READ_CHUNK_SIZE)  # type: ignore[arg-type]
+
+    return open(path, "rb")
+
+
+def _seek(f: BinaryIO, offset: int) -> None:
+    """Move forward `offset` bytes, reading through streams that can't seek."""
+    if f.seekable():
+        f.seek(offset, io.SEEK_CUR)
+        return
+
+    while offset > 0:
+        chunk = f.read(min(offset, READ_CHUNK_SIZE))
+        if not chunk:
+            return
+        offset -= len(chunk)
+
+
+def _iter_ndjson(f: BinaryIO, position: int = 0) -> Iterator[tuple[bytes, int]]:
+    for line in f:
+        position += len(line)
+        if not line.strip():
+            continue
+        try:
+            document = json.loads(line)
+        except ValueError:
+            raise ValueError(f"The line ending at byte {position} is not valid JSON") from None
+        yield _compact_document(document, position), position
+
+
+def _compact_document(document: object, position: int) -> bytes:
+    if not isinstance(document, dict):
+        raise ValueError(f"The document ending at byte {position} is not a JSON object")
+
+    try:
+        compact = json.dumps(document, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+        return f"{compact}\n".encode()
+    except ValueError:
+        # NaN, Infinity, numbers too big for a float, or a lone surrogate escape.
+        raise ValueError(f"The document ending at byte {position} is not valid JSON") from None
+
+
+def _read_csv(f: BinaryIO, start: int = 0) -> tuple[bytes, Iterator[tuple[bytes, int]]]:
+    header = f.readline()
+    position = len(header)
+    if not header.endswith(b"\n"):
+        header += b"\n"
+    if start > position:
+        _seek(f, start - position)
+        position = start
+
+    return header, _iter_csv_rows(f, position, len(_csv_fields(header, position)))
+
+
+def _iter_csv_rows(f: BinaryIO, position: int, columns: int) -> Iterator[tuple[bytes, int]]:
+    # A quoted field can contain new lines. Quotes inside a field are escaped by doubling them so
+    # a row is only complete once it contains an even number of quote characters.
+    row = b""
+    for line in f:
+        position += len(line)
+        row += line
+        if row.count(b'"') % 2:
+            continue
+        if row.strip():
+            yield _check_csv_row(row, position, columns), position
+        row = b""
+
+    if row.strip():
+        yield _check_csv_row(row, position, columns), position
+
+
+def _check_csv_row(row: bytes, position: int, columns: int) -> bytes:
+    fields = len(_csv_fields(row, position))
+    if fields != columns:
+        raise ValueError(
+            f"The csv row ending at byte {position} has {fields} fields, the header has {columns}"
+        )
+
+    return row if row.endswith(b"\n") else row + b"\n"
+
+
+def _csv_fields(row: bytes, position: int) -> list[str]:
+    try:
+        return next(csv.reader(io.StringIO(row.decode("utf-8"))), [])
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ValueError(f"The csv row ending at byte {position} is not valid: {e}") from None
+
+
+def _iter_json_array(f: BinaryIO, start: int = 0) -> Iterator[tuple[bytes, int]]:
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    index = 0
+    # Byte offset in the file of buffer[index]
+    position = start
+    eof = False
+    _seek(f, start)
+
+    def read_more() -> bool:
+        nonlocal buffer, index, eof
+        if eof:
+            return False
+        chunk = f.read(READ_CHUNK_SIZE)
+        if not chunk:
+            eof = True
+            buffer = buffer[index:] + text_decoder.decode(b"", final=True)
+            index = 0
+            return False
+        buffer = buffer[index:] + text_decoder.decode(chunk)
+        index = 0
+        return True
+
+    def advance(new_index: int) -> None:
+        nonlocal index, position
+        position += len(buffer[index:new_index].encode("utf-8"))
+        index = new_index
+
+    def skip(characters: str) -> str | None:
+        while True:
+            while index < len(buffer) and buffer[index] in characters:
+                advance(index + 1)
+            if index < len(buffer):
+                return buffer[index]
+            if not read_more():
+                return None
+
+    # Resuming starts just after a document, inside the array.
+    if not start:
+        if skip(" \t\r\n\ufeff") != "[":
+            raise ValueError("JSON document files must contain an array of documents")
+        advance(index + 1)
+
+    while True:
+        char = skip(" \t\r\n,")
+        if char is None:
+            raise ValueError("Unexpected end of file, the JSON array is not closed")
+        if char == "]":
+            return
+        if char != "{":
+            raise ValueError("JSON document files must contain an array of objects")
+
+        while True:
+            try:
+                document, end = decoder.raw_decode(buffer, index)
+                break
+            except json.JSONDecodeError:
+                if not read_more():
+                    raise
+
+        advance(end)
+        yield _compact_document(document, position), position
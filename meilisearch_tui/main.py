@@ -2,22 +2,23 @@ from __future__ import annotations
 
 import asyncio
 import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from meilisearch_python_sdk.errors import MeilisearchCommunicationError
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Container
+from textual.screen import Screen
+from textual.timer import Timer
 from textual.widgets import Footer
-from typer import Option, Typer
 
-from meilisearch_tui.client import get_client
+from meilisearch_tui.cli import typer_app  # noqa: F401
 from meilisearch_tui.config import Theme, load_config
-from meilisearch_tui.errors import NoMeilisearchUrlError
-from meilisearch_tui.screens.configuration import ConfigurationScreen
-from meilisearch_tui.screens.indexes import IndexScreen
-from meilisearch_tui.screens.search import SearchScreen
 from meilisearch_tui.widgets.messages import ErrorMessage
 
-typer_app = Typer()
+if TYPE_CHECKING:  # pragma: no cover
+    from meilisearch_tui.client import BreakerState
+    from meilisearch_tui.recorder import MetricsRecorder
 
 
 def _is_uvloop_platform() -> bool:  # pragma: no cover
@@ -26,26 +27,59 @@ def _is_uvloop_platform() -> bool:  # pragma: no cover
     return False
 
 
+# Screens, and the SDK they pull in, are only imported and built the first time they are shown so
+# the first frame can be drawn as soon as possible.
+
+
+def _configuration_screen() -> Screen:
+    from meilisearch_tui.screens.configuration import ConfigurationScreen
+
+    return ConfigurationScreen()
+
+
+def _index_screen() -> Screen:
+    from meilisearch_tui.screens.indexes import IndexScreen
+
+    return IndexScreen()
+
+
+def _search_screen() -> Screen:
+    from meilisearch_tui.screens.search import SearchScreen
+
+    return SearchScreen()
+
+
+def _tasks_screen() -> Screen:
+    from meilisearch_tui.screens.tasks import TasksScreen
+
+    return TasksScreen()
+
+
 class MeilisearchApp(App):
     BINDINGS = [
         ("s", "push_screen('search')", "Search"),
         ("i", "push_screen('index')", "Index Management"),
+        ("t", "push_screen('tasks')", "Tasks"),
         ("c", "push_screen('configuration')", "Configuration"),
+        ("f2", "toggle_performance", "Performance"),
         ("ctrl+q", "app.quit", "Quit"),
     ]
     CSS_PATH = "meilisearch.css"
     TITLE = "Meilisearch"
     SCREENS = {
-        "configuration": ConfigurationScreen(),
-        "search": SearchScreen(),
-        "index": IndexScreen(),
+        "configuration": _configuration_screen,
+        "search": _search_screen,
+        "index": _index_screen,
+        "tasks": _tasks_screen,
     }
 
-    def __init__(self, hybrid_search: bool = False) -> None:
+    def __init__(self, hybrid_search: bool = False, metrics_dir: Path | None = None) -> None:
         self.hybrid_search = hybrid_search
-        MeilisearchApp.SCREENS["configuration"].hybrid_search = hybrid_search  # type: ignore
-        MeilisearchApp.SCREENS["search"].hybrid_search = hybrid_search  # type: ignore
-
+        self.metrics_dir = metrics_dir
+        self.recorder: MetricsRecorder | None = None
+        self.server_version: str | None = None
+        self.show_performance = False
+        self._performance_timer: Timer | None = None
         super().__init__()
 
     def compose(self) -> ComposeResult:
@@ -53,27 +87,127 @@ class MeilisearchApp(App):
             yield ErrorMessage("", classes="message-centered", id="generic-error")
         yield Footer()
 
-    async def on_mount(self) -> None:
+    def on_mount(self) -> None:
         config = load_config()
+        metrics_dir = self.metrics_dir or config.metrics_dir
+        if metrics_dir:
+            from meilisearch_tui.recorder import MetricsRecorder
+
+            self.recorder = MetricsRecorder(
+                Path(metrics_dir).expanduser(), export_interval=config.metrics_export_interval
+            )
+            self.recorder.start()
+
         if not config.meilisearch_url:
             self.push_screen("configuration")
         else:
             self.set_theme()
-            try:
-                async with get_client() as client:
-                    indexes = await client.get_indexes()
-                if indexes:
-                    self.push_screen("search")
-                else:
-                    self.push_screen("index")
-            except NoMeilisearchUrlError:
-                self.push_screen("configuration")
-            except MeilisearchCommunicationError as e:
-                self.query_one(  # type: ignore
-                    "#generic-error"
-                ).renderable = f"An error occured: {e}.\nMake sure the Meilisearch server is running and accessable"
-            except Exception as e:
-                self.query_one("#generic-error").renderable = f"An error occured: {e}"  # type: ignore
+
+    def on_ready(self) -> None:
+        # Ready is sent after the first frame is drawn. The search screen opens straight away in a
+        # loading state and the server is probed in the background.
+        if not load_config().meilisearch_url:
+            # on_mount has opened the configuration screen, so the checks below always have a URL.
+            return
+
+        from meilisearch_tui.client import circuit_breakers
+
+        circuit_breakers.listeners.append(self.breaker_changed)
+        self.push_screen("search")
+        self.check_health()
+        self.check_version()
+        self.check_indexes()
+
+    @work(group="startup", exit_on_error=False)
+    async def check_health(self) -> None:
+        from meilisearch_tui.client import get_client, run_request
+
+        try:
+            async with get_client() as client:
+                health = await run_request("health", client.health)
+        except Exception as e:
+            self.notify(
+                f"An error occured: {e}.\nMake sure the Meilisearch server is running and accessable",
+                severity="error",
+                timeout=10,
+            )
+            return
+
+        if health.status != "available":
+            self.notify(f"Meilisearch status: {health.status}", severity="warning")
+
+    @work(group="startup", exit_on_error=False)
+    async def check_version(self) -> None:
+        from meilisearch_tui.client import get_client, run_request
+
+        try:
+            async with get_client() as client:
+                version = await run_request("version", client.get_version)
+        except Exception:
+            # Connection problems are reported by the health check.
+            return
+
+        self.server_version = version.pkg_version
+        self.notify(f"Connected to Meilisearch {version.pkg_version}", timeout=3)
+
+    @work(group="startup", exit_on_error=False)
+    async def check_indexes(self) -> None:
+        from meilisearch_tui.utils import get_indexes
+
+        try:
+            indexes = await get_indexes()
+        except Exception:
+            # The search screen shows the error from the same request.
+            return
+
+        # With nothing to search, start on index management instead unless the user has already
+        # moved on from the search screen.
+        if not indexes and self.screen is self.get_screen("search"):
+            self.switch_screen("index")
+
+    def action_toggle_performance(self) -> None:
+        self.show_performance = not self.show_performance
+        if self.show_performance:
+            self._performance_timer = self.set_interval(0.5, self.sync_performance_overlay)
+        elif self._performance_timer:
+            self._performance_timer.stop()
+            self._performance_timer = None
+
+        self.sync_performance_overlay()
+
+    def sync_performance_overlay(self) -> None:
+        """Keep the overlay on whichever screen is showing while it is turned on."""
+        from meilisearch_tui.widgets.performance_overlay import PerformanceOverlay
+
+        overlays = self.screen.query(PerformanceOverlay)
+        if self.show_performance and not overlays:
+            self.screen.mount(PerformanceOverlay())
+        elif not self.show_performance:
+            overlays.remove()
+
+    def breaker_changed(self, state: BreakerState) -> None:
+        from meilisearch_tui.client import BreakerState, circuit_breakers
+
+        if state == BreakerState.OPEN:
+            self.notify(
+                "Meilisearch is not responding, pausing requests for "
+                f"{circuit_breakers.reset_timeout:.0f} seconds",
+                severity="error",
+                timeout=circuit_breakers.reset_timeout,
+            )
+        elif state == BreakerState.CLOSED:
+            self.notify("Connection to Meilisearch restored", timeout=3)
+
+    async def on_unmount(self) -> None:
+        if self.recorder is not None:
+            await self.recorder.stop()
+
+        # Nothing to close if no screen ever needed the client module.
+        client = sys.modules.get("meilisearch_tui.client")
+        if client is not None:
+            if self.breaker_changed in client.circuit_breakers.listeners:
+                client.circuit_breakers.listeners.remove(self.breaker_changed)
+            await client.client_manager.close()
 
     def set_theme(self) -> None:
         config = load_config()
@@ -83,27 +217,24 @@ class MeilisearchApp(App):
             self.dark = False
 
 
-def run_app(hybrid_search: bool) -> None:
-    app = MeilisearchApp(hybrid_search=hybrid_search)
+def run_app(hybrid_search: bool, metrics_dir: Path | None = None) -> None:
+    app = MeilisearchApp(hybrid_search=hybrid_search, metrics_dir=metrics_dir)
     app.run()
 
 
-@typer_app.command()
-def main(
-    hybrid_search: bool = Option(False, "-h", "--hybrid-search", help="Use hybrid search"),
-) -> None:
+def start_app(hybrid_search: bool = False, metrics_dir: Path | None = None) -> None:
     if _is_uvloop_platform():  # pragma: no cover
         import uvloop
 
         if sys.version_info >= (3, 11):
             with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:  # type: ignore
-                runner.run(run_app(hybrid_search))  # type: ignore
+                runner.run(run_app(hybrid_search, metrics_dir))  # type: ignore
 
         else:
             uvloop.install()  # type: ignore
-            asyncio.run(run_app(hybrid_search))  # type: ignore
+            asyncio.run(run_app(hybrid_search, metrics_dir))  # type: ignore
     else:
-        run_app(hybrid_search)
+        run_app(hybrid_search, metrics_dir)
 
 
 if __name__ == "__main__":
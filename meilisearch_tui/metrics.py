@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from httpx import Request, Response
+
+# total: the whole call as seen by the caller
+# network: sending the request until the response body is read, includes the server's time
+# server: time Meilisearch reports spending on the request, only searches report it
+# client: decoding and validating the response, the total minus the network time
+# render: drawing the results after they arrive
+PHASES = ("total", "network", "server", "client", "render")
+SEARCH_ENDPOINT = "POST /indexes/{index}/search"
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def endpoint_name(method: str, path: str) -> tuple[str, str | None]:
+    """Group request paths by endpoint, returning the endpoint and index uid in the path."""
+    parts = path.strip("/").split("/")
+    index_uid = None
+    if len(parts) > 1 and parts[0] == "indexes":
+        index_uid = parts[1]
+        parts[1] = "{index}"
+        if len(parts) > 3 and parts[2] == "documents" and parts[3] not in ("fetch", "delete-batch"):
+            parts[3] = "{id}"
+    elif len(parts) > 1 and parts[0] == "tasks" and parts[1].isdigit():
+        parts[1] = "{uid}"
+
+    return f"{method} /{'/'.join(parts)}", index_uid
+
+
+class RequestSample(NamedTuple):
+    timestamp: float
+    operation: str
+    endpoint: str
+    index_uid: str | None
+    status: int | None
+    phases: dict[str, float]
+    request_bytes: int
+    response_bytes: int
+    error: str | None = None
+    query_hash: str | None = None
+
+
+class RollingHistogram:
+    """Keeps the most recent `size` values so percentiles follow current behaviour."""
+
+    def __init__(self, size: int = 1000) -> None:
+        self._values: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, value: float) -> None:
+        self._values.append(value)
+
+    def percentiles(self, *percents: float) -> tuple[float, ...]:
+        values = list(self._values)
+        return tuple(percentile(values, x) for x in percents)
+
+
+class RequestMetrics:
+    """Rolling latency histograms for each endpoint and phase, in milliseconds."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self.window = window
+        self.listeners: list[Callable[[RequestSample], None]] = []
+        self._histograms: dict[tuple[str, str], RollingHistogram] = {}
+
+    def add(self, endpoint: str, phase: str, value: float) -> None:
+        histogram = self._histograms.get((endpoint, phase))
+        if histogram is None:
+            histogram = self._histograms[(endpoint, phase)] = RollingHistogram(self.window)
+        histogram.add(value)
+
+    def record(self, sample: RequestSample) -> None:
+        for phase, value in sample.phases.items():
+            self.add(sample.endpoint, phase, value)
+
+        for listener in self.listeners:
+            listener(sample)
+
+    def summary(self) -> list[tuple[str, str, int, float, float, float]]:
+        """Return the endpoint, phase, count, p50, p95 and p99 of everything recorded."""
+        rows = []
+        for (endpoint, phase), histogram in sorted(
+            self._histograms.items(), key=lambda x: (x[0][0], PHASES.index(x[0][1]))
+        ):
+            p50, p95, p99 = histogram.percentiles(50, 95, 99)
+            rows.append((endpoint, phase, len(histogram), p50, p95, p99))
+
+        return rows
+
+    def reset(self) -> None:
+        self._histograms = {}
+
+
+class RequestTiming:
+    """Collects what the HTTP client sees while one call through the client layer runs."""
+
+    def __init__(self, operation: str) -> None:
+        self.operation = operation
+        self.requests: list[Request] = []
+        self.responses: list[Response] = []
+        self.start = time.perf_counter()
+
+    def sample(self, result: Any = None, error: BaseException | None = None) -> RequestSample:
+        total = (time.perf_counter() - self.start) * 1000
+        phases = {"total": total}
+        network = 0.0
+        for response in self.responses:
+            try:
+                network += response.elapsed.total_seconds() * 1000
+            except RuntimeError:
+                # The response was never read, there is no network time to report.
+                pass
+
+        if self.responses:
+            phases["network"] = network
+            phases["client"] = max(total - network, 0.0)
+
+        server = getattr(result, "processing_time_ms", None)
+        if isinstance(server, (int, float)):
+            phases["server"] = float(server)
+
+        endpoint, index_uid, query_hash = self.operation, None, None
+        if self.requests:
+            endpoint, index_uid = endpoint_name(self.requests[0].method, self.requests[0].url.path)
+            if endpoint == SEARCH_ENDPOINT:
+                query_hash = _query_hash(self.requests[0])
+
+        return RequestSample(
+            timestamp=time.time(),
+            operation=self.operation,
+            endpoint=endpoint,
+            index_uid=index_uid,
+            status=self.responses[-1].status_code if self.responses else None,
+            phases=phases,
+            request_bytes=sum(int(x.headers.get("content-length", 0)) for x in self.requests),
+            response_bytes=sum(_response_size(x) for x in self.responses),
+            error=None if error is None else type(error).__name__,
+            query_hash=query_hash,
+        )
+
+
+current_timing: ContextVar[RequestTiming | None] = ContextVar("current_timing", default=None)
+
+
+async def on_request(request: Request) -> None:
+    timing = current_timing.get()
+    if timing is not None:
+        timing.requests.append(request)
+
+
+async def on_response(response: Response) -> None:
+    timing = current_timing.get()
+    if timing is not None:
+        timing.responses.append(response)
+
+
+def _query_hash(request: Request) -> str | None:
+    """Identify repeated searches without writing what users searched for to disk."""
+    try:
+        query = json.loads(request.content).get("q")
+    except Exception:
+        return None
+    if not isinstance(query, str):
+        return None
+
+    return hashlib.sha256(query.encode()).hexdigest()[:16]
+
+
+def _response_size(response: Response) -> int:
+    content_length = response.headers.get("content-length")
+    if content_length is not None:
+        return int(content_length)
+
+    try:
+        return len(response.content)
+    except Exception:
+        return 0
+
+
+request_metrics = RequestMetrics()
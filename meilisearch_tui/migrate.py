@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.errors import MeilisearchApiError
+
+from meilisearch_tui.client import run_request
+from meilisearch_tui.errors import MigrationError
+from meilisearch_tui.export import DEFAULT_EXPORT_BATCH_SIZE, iter_document_pages, to_ndjson
+from meilisearch_tui.ingest import DEFAULT_CONCURRENCY, MAX_POLLED_TASKS, DocumentBatch, send_batch
+from meilisearch_tui.tasks import get_tasks
+
+
+class MigrationCheckpoint:
+    """How far a migration got, saved so an interrupted one can carry on where it stopped.
+
+    `offset` only moves past a batch once the target has finished indexing it, so resuming can
+    send some documents a second time but never skips any.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.settings_copied = False
+        self.offset = 0
+
+    @classmethod
+    def for_migration(
+        cls,
+        directory: Path,
+        source: AsyncClient,
+        source_index: str,
+        target: AsyncClient,
+        target_index: str,
+    ) -> MigrationCheckpoint:
+        key = json.dumps(
+            [
+                str(source.http_client.base_url),
+                source_index,
+                str(target.http_client.base_url),
+                target_index,
+            ]
+        )
+        checkpoint = cls(directory / f"{hashlib.sha256(key.encode()).hexdigest()[:16]}.json")
+        checkpoint.load()
+
+        return checkpoint
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.settings_copied = data.get("settings_copied", False)
+        self.offset = data.get("offset", 0)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.path.with_suffix(".tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump({"settings_copied": self.settings_copied, "offset": self.offset}, f)
+        os.replace(temp_file, self.path)
+
+    def delete(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class MigrationProgress:
+    def __init__(self) -> None:
+        self.start_offset = 0
+        self.total_documents = 0
+        self.documents_fetched = 0
+        self.documents_uploaded = 0
+        self.confirmed_offset = 0
+        self.started_at = time.monotonic()
+        self.finished_at: float | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def documents_per_second(self) -> float:
+        elapsed = self.elapsed
+        return (self.confirmed_offset - self.start_offset) / elapsed if elapsed else 0.0
+
+    def finish(self) -> None:
+        if self.finished_at is None:
+            self.finished_at = time.monotonic()
+
+
+async def copy_settings(
+    source: AsyncClient, source_index: str, target: AsyncClient, target_index: str
+) -> None:
+    """Create the target index if needed and give it the source index's settings.
+
+    This waits for the settings to be applied, so documents sent afterwards are only indexed once.
+    """
+    source_url = str(source.http_client.base_url)
+    index = await run_request("indexes", lambda: source.get_index(source_index), url=source_url)
+    settings = await run_request("settings", index.get_settings, url=source_url)
+    target_url = str(target.http_client.base_url)
+
+    try:
+        await run_request("indexes", lambda: target.get_index(target_index), url=target_url)
+    except MeilisearchApiError as e:
+        if e.code != "index_not_found":
+            raise
+        await run_request(
+            "indexes",
+            lambda: target.create_index(target_index, index.primary_key),
+            idempotent=False,
+            url=target_url,
+        )
+
+    task = await run_request(
+        "settings",
+        lambda: target.index(target_index).update_settings(settings),
+        idempotent=False,
+        url=target_url,
+    )
+    await _wait_for_tasks(target, [task.task_uid])
+
+
+async def migrate_index(
+    source: AsyncClient,
+    source_index: str,
+    target: AsyncClient,
+    target_index: str | None = None,
+    *,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    fetch_concurrency: int = 4,
+    upload_concurrency: int = DEFAULT_CONCURRENCY,
+    checkpoint: MigrationCheckpoint | None = None,
+    progress: MigrationProgress | None = None,
+    poll_interval: float = 0.5,
+) -> int:
+    """Copy an index's settings and then its documents from one server to another.
+
+    Pages are read from the source `fetch_concurrency` at a time while up to `upload_concurrency`
+    batches are being sent to the target, and the next page is only taken once an upload slot is
+    free so a slow target holds back reading. The target's tasks are polled as the copy goes and
+    the checkpoint is moved past each batch once it has been indexed.
+
+    Offsets only line up between runs if the source index isn't changing, so resume a migration
+    from an index that is no longer being written to. Returns the number of documents copied.
+    """
+    target_index = target_index or source_index
+    progress = progress or MigrationProgress()
+    start = checkpoint.offset if checkpoint else 0
+    progress.start_offset = progress.confirmed_offset = start
+
+    if not (checkpoint and checkpoint.settings_copied):
+        await copy_settings(source, source_index, target, target_index)
+        if checkpoint:
+            checkpoint.settings_copied = True
+            checkpoint.save()
+
+    target_index_info = await run_request(
+        "indexes", lambda: target.get_index(target_index), url=str(target.http_client.base_url)
+    )
+    primary_key = target_index_info.primary_key
+    target_uploads = target.index(target_index)
+    loop = asyncio.get_running_loop()
+    in_flight: set[asyncio.Future[None]] = set()
+    # Uploaded batches that haven't been confirmed yet, keyed by their first document.
+    unconfirmed: dict[int, tuple[int, int]] = {}
+    succeeded: set[int] = set()
+    last_poll = time.monotonic()
+
+    async def send(batch: DocumentBatch) -> None:
+        task = await send_batch(target_uploads, batch, primary_key=primary_key)
+        unconfirmed[batch.start] = (batch.end, task.task_uid)
+        progress.documents_uploaded += batch.document_count
+
+    async def wait_for_slot(limit: int) -> None:
+        nonlocal in_flight
+        while len(in_flight) > limit:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                future.result()
+
+    async def confirm() -> None:
+        nonlocal last_poll
+        last_poll = time.monotonic()
+        pending = [uid for _, uid in unconfirmed.values() if uid not in succeeded]
+        if pending:
+            succeeded.update(await _finished_tasks(target, pending[:MAX_POLLED_TASKS]))
+
+        while progress.confirmed_offset in unconfirmed:
+            end, uid = unconfirmed[progress.confirmed_offset]
+            if uid not in succeeded:
+                break
+            del unconfirmed[progress.confirmed_offset]
+            succeeded.discard(uid)
+            progress.confirmed_offset = end
+            if checkpoint:
+                checkpoint.offset = end
+                checkpoint.save()
+
+    pages = iter_document_pages(
+        source.index(source_index),
+        start=start,
+        batch_size=batch_size,
+        concurrency=fetch_concurrency,
+    )
+    try:
+        async for offset, page in pages:
+            progress.total_documents = page.total
+            progress.documents_fetched += len(page.results)
+            if not page.results:
+                break
+
+            payload = await loop.run_in_executor(None, to_ndjson, page.results)
+            batch = DocumentBatch(
+                payload,
+                "application/x-ndjson",
+                len(page.results),
+                offset,
+                offset + len(page.results),
+            )
+            await wait_for_slot(max(upload_concurrency, 1) - 1)
+            in_flight.add(asyncio.ensure_future(send(batch)))
+            if time.monotonic() - last_poll >= poll_interval:
+                await confirm()
+
+        await wait_for_slot(0)
+        while unconfirmed:
+            await confirm()
+            if unconfirmed:
+                await asyncio.sleep(poll_interval)
+    finally:
+        await pages.aclose()
+        for future in in_flight:
+            future.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
+    if checkpoint:
+        checkpoint.delete()
+    progress.finish()
+
+    return progress.confirmed_offset - start
+
+
+async def _finished_tasks(client: AsyncClient, uids: list[int]) -> list[int]:
+    """Return which of the tasks have succeeded, raising MigrationError if any of them didn't."""
+    status = await get_tasks(client, uids=uids, limit=len(uids))
+    succeeded = []
+    for task in status.results:
+        if task.status == "succeeded":
+            succeeded.append(task.uid)
+        elif task.status in ("failed", "canceled"):
+            message = (task.error or {}).get("message") or task.status
+            raise MigrationError(f"Task {task.uid} on the target {task.status}: {message}")
+
+    return succeeded
+
+
+async def _wait_for_tasks(
+    client: AsyncClient, uids: list[int], poll_interval: float = 0.25
+) -> None:
+    remaining = set(uids)
+    while remaining:
+        remaining.difference_update(await _finished_tasks(client, list(remaining)))
+        if remaining:
+            await asyncio.sleep(poll_interval)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+from meilisearch_tui.metrics import RequestMetrics, RequestSample, request_metrics
+
+REQUESTS_FILE = "requests.jsonl"
+PROMETHEUS_FILE = "meilisearch_tui.prom"
+
+
+class MetricsRecorder:
+    """Saves what the client layer saw so it can be attached to a ticket after an incident.
+
+    Every request is appended to a JSONL file and the latency histograms are periodically written
+    in the Prometheus text format for a node-exporter textfile collector to pick up. Recording only adds
+    to an in-memory buffer, the files are written from a thread by a background task so typing
+    never waits on the disk.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        metrics: RequestMetrics = request_metrics,
+        *,
+        flush_interval: float = 1.0,
+        export_interval: float = 15.0,
+        max_buffer: int = 10_000,
+    ) -> None:
+        self.directory = directory
+        self.metrics = metrics
+        self.flush_interval = flush_interval
+        self.export_interval = export_interval
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._buffer: list[RequestSample] = []
+        self._request_counts: dict[tuple[str, str], int] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def requests_file(self) -> Path:
+        return self.directory / REQUESTS_FILE
+
+    @property
+    def prometheus_file(self) -> Path:
+        return self.directory / PROMETHEUS_FILE
+
+    def record(self, sample: RequestSample) -> None:
+        key = (sample.endpoint, str(sample.status or sample.error or "unknown"))
+        self._request_counts[key] = self._request_counts.get(key, 0) + 1
+
+        # If the disk can't keep up, drop records rather than grow without limit.
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        self._buffer.append(sample)
+
+    def start(self) -> None:
+        self.metrics.listeners.append(self.record)
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self.record in self.metrics.listeners:
+            self.metrics.listeners.remove(self.record)
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self.flush()
+        await self.export()
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+
+        samples, self._buffer = self._buffer, []
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._append_requests, samples)
+
+    async def export(self) -> None:
+        text = self.prometheus_text()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_prometheus, text)
+
+    def prometheus_text(self) -> str:
+        # The textfile collector reads the Prometheus text format, where the TYPE line names the
+        # samples exactly and there is no `# EOF` like OpenMetrics has.
+        lines = [
+            "# HELP meilisearch_tui_requests_total Requests sent to Meilisearch.",
+            "# TYPE meilisearch_tui_requests_total counter",
+        ]
+        for (endpoint, status), count in sorted(self._request_counts.items()):
+            labels = _labels(endpoint=endpoint, status=status)
+            lines.append(f"meilisearch_tui_requests_total{{{labels}}} {count}")
+
+        lines.extend(
+            [
+                "# HELP meilisearch_tui_request_latency_milliseconds Recent request latency as seen "
+                "by the TUI.",
+                "# TYPE meilisearch_tui_request_latency_milliseconds gauge",
+            ]
+        )
+        for endpoint, phase, _, p50, p95, p99 in self.metrics.summary():
+            for quantile, value in (("0.5", p50), ("0.95", p95), ("0.99", p99)):
+                labels = _labels(endpoint=endpoint, phase=phase, quantile=quantile)
+                lines.append(f"meilisearch_tui_request_latency_milliseconds{{{labels}}} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    async def _run(self) -> None:
+        last_export = time.monotonic()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if time.monotonic() - last_export >= self.export_interval:
+                await self.export()
+                last_export = time.monotonic()
+
+    def _append_requests(self, samples: list[RequestSample]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.requests_file, "a", encoding="utf-8") as f:
+            for sample in samples:
+                f.write(json.dumps(sample._asdict()))
+                f.write("\n")
+
+    def _write_prometheus(self, text: str) -> None:
+        # Scrapers can read the file at any moment so it is replaced rather than rewritten.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_file = self.prometheus_file.with_suffix(".tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_file, self.prometheus_file)
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.models.search import Hybrid
+
+from meilisearch_tui.metrics import percentile
+
+
+class ReplayQuery(NamedTuple):
+    index_uid: str
+    q: str
+    filter: Any = None
+    sort: list[str] | None = None
+    limit: int = 20
+    hybrid: Hybrid | None = None
+
+
+def read_query_log(path: Path, default_index: str | None = None) -> list[ReplayQuery]:
+    """Read a query log with one query per line.
+
+    Lines are either plain query text, searched on `default_index`, or JSON objects with `q` and
+    optionally `index`, `filter`, `sort`, `limit` and `hybrid` (`semanticRatio` and `embedder`).
+    """
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            line = line.rstrip("\n")
+            if not line.strip():
+                continue
+
+            if line.lstrip().startswith("{"):
+                record = json.loads(line)
+                hybrid = record.get("hybrid")
+                query = ReplayQuery(
+                    index_uid=record.get("index") or default_index or "",
+                    q=record.get("q") or "",
+                    filter=record.get("filter"),
+                    sort=record.get("sort"),
+                    limit=record.get("limit", 20),
+                    hybrid=None
+                    if hybrid is None
+                    else Hybrid(
+                        semantic_ratio=hybrid.get("semanticRatio", 0.5),
+                        embedder=hybrid.get("embedder"),
+                    ),
+                )
+            else:
+                query = ReplayQuery(index_uid=default_index or "", q=line)
+
+            if not query.index_uid:
+                raise ValueError(f"Line {number} of {path} has no index and no default was given")
+            queries.append(query)
+
+    return queries
+
+
+class ReplayReport:
+    """What happened during the measured part of a replay."""
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.errors: dict[str, int] = {}
+        self.started_at = 0.0
+        self.finished_at = 0.0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    @property
+    def elapsed(self) -> float:
+        return max(self.finished_at - self.started_at, 0.0)
+
+    def record(self, latency: float, error: BaseException | None = None) -> None:
+        if error is None:
+            self.latencies.append(latency)
+        else:
+            name = type(error).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self) -> dict[str, Any]:
+        latencies = [x * 1000 for x in self.latencies]
+        elapsed = self.elapsed
+        return {
+            "requests": self.requests,
+            "succeeded": len(latencies),
+            "errors": sum(self.errors.values()),
+            "error_rate": sum(self.errors.values()) / self.requests if self.requests else 0.0,
+            "errors_by_type": dict(sorted(self.errors.items())),
+            "duration_s": elapsed,
+            "throughput_qps": len(latencies) / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                "min": min(latencies, default=0.0),
+                "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": max(latencies, default=0.0),
+            },
+        }
+
+
+async def replay(
+    client: AsyncClient,
+    queries: list[ReplayQuery],
+    *,
+    qps: float | None = None,
+    concurrency: int = 10,
+    warmup: float = 0.0,
+    duration: float | None = None,
+    timeout: float | None = None,
+) -> ReplayReport:
+    """Replay queries against the server and measure how it copes.
+
+    Without `qps` there are `concurrency` searches in flight at all times. With `qps` searches
+    are started on a fixed schedule, with at most `concurrency` in flight, and latency is measured
+    from when each search was due so a server that falls behind can't hide it.
+
+    Queries sent during the first `warmup` seconds aren't measured. With a `duration` the log is
+    repeated until the measured part has run that long, otherwise it is replayed once.
+    """
+    if not queries:
+        return ReplayReport()
+
+    report = ReplayReport()
+    source: Iterator[ReplayQuery] = itertools.cycle(queries) if duration else iter(queries)
+    slots = asyncio.Semaphore(max(concurrency, 1))
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = None if duration is None else measure_from + duration
+    report.started_at = measure_from
+
+    async def send(query: ReplayQuery, due: float) -> None:
+        error = None
+        try:
+            await asyncio.wait_for(_search(client, query), timeout)
+        except Exception as e:
+            error = e
+        finally:
+            slots.release()
+
+        if due >= measure_from:
+            report.record(time.perf_counter() - due, error)
+
+    in_flight = set()
+    for number, query in enumerate(source):
+        due = start + number / qps if qps else time.perf_counter()
+        if stop_at is not None and due >= stop_at:
+            break
+
+        if qps:
+            await asyncio.sleep(max(due - time.perf_counter(), 0))
+        await slots.acquire()
+        if not qps:
+            due = time.perf_counter()
+            if stop_at is not None and due >= stop_at:
+                slots.release()
+                break
+
+        task = asyncio.ensure_future(send(query, due))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    await asyncio.gather(*in_flight)
+    report.finished_at = time.perf_counter()
+    report.started_at = min(report.started_at, report.finished_at)
+
+    return report
+
+
+async def _search(client: AsyncClient, query: ReplayQuery) -> None:
+    await client.index(query.index_uid).search(
+        query.q,
+        filter=query.filter,
+        sort=query.sort,
+        limit=query.limit,
+        hybrid=query.hybrid,
+    )
@@ -14,7 +14,9 @@ from meilisearch_tui.widgets.messages import SuccessMessage
 
 
 class ConfigurationScreen(Screen):
-    hybrid_search = False
+    @property
+    def hybrid_search(self) -> bool:
+        return getattr(self.app, "hybrid_search", False)
 
     def compose(self) -> ComposeResult:
         with Container(id="body"):
@@ -106,8 +108,16 @@ class ConfigurationScreen(Screen):
                 is_error = True
 
             if not is_error:
+                # Imported here because a first run opens on this screen and shouldn't have to
+                # load the SDK before anything is drawn.
+                from meilisearch_tui.cache import index_store, search_cache
+                from meilisearch_tui.client import client_manager
+
                 try:
                     config.save()
+                    await client_manager.reset()
+                    index_store.invalidate()
+                    search_cache.invalidate()
                     await self._success_message()
                 except Exception as e:
                     await self._error_message(f"{e}")
@@ -12,7 +12,7 @@ from meilisearch_python_sdk.errors import (
 from meilisearch_python_sdk.models.settings import (
     MeilisearchSettings as MeilisearchSettingsInfo,
 )
-from textual import events
+from textual import events, work
 from textual.app import ComposeResult
 from textual.containers import Center, Container, Horizontal, VerticalScroll
 from textual.message import Message
@@ -24,15 +24,36 @@ from textual.widgets import (
     DirectoryTree,
     Footer,
     Input,
+    Label,
     Markdown,
     Static,
+    Switch,
     TabbedContent,
     TabPane,
 )
 
-from meilisearch_tui.client import get_client
-from meilisearch_tui.utils import string_to_list
+from meilisearch_tui.cache import index_store, search_cache
+from meilisearch_tui.client import get_client, run_request
+from meilisearch_tui.config import load_config
+from meilisearch_tui.errors import CircuitOpenError
+from meilisearch_tui.export import ExportProgress, export_to_file
+from meilisearch_tui.ingest import (
+    CHECKPOINT_DIR,
+    BatchSizer,
+    IngestProgress,
+    MultiFileProgress,
+    add_documents_in_batches,
+    add_files_in_batches,
+    document_size,
+    expand_paths,
+    open_checkpoint,
+    watch_progress,
+)
+from meilisearch_tui.sync import MANIFEST_DIR, SyncManifest, sync_documents
+from meilisearch_tui.utils import get_indexes, string_to_list
+from meilisearch_tui.widgets.export_progress import ExportProgressPanel
 from meilisearch_tui.widgets.index_sidebar import IndexSidebar
+from meilisearch_tui.widgets.ingest_progress import IngestProgressPanel
 from meilisearch_tui.widgets.input import InputWithLabel
 from meilisearch_tui.widgets.messages import ErrorMessage, SuccessMessage
 
@@ -117,10 +138,15 @@ class AddIndex(Widget):
 
             try:
                 async with get_client() as client:
-                    await client.create_index(self.index_name.value, self.primary_key.value)
+                    await run_request(
+                        "indexes",
+                        lambda: client.create_index(self.index_name.value, self.primary_key.value),
+                        idempotent=False,
+                    )
+                index_store.invalidate()
                 self.added_index = self.index_name.value
                 await self._success_message()
-            except MeilisearchError as e:
+            except (MeilisearchError, CircuitOpenError) as e:
                 await self._error_message(f"{e}")
             except Exception as e:
                 await self._error_message(f"An unknown error occured error: {e}")
@@ -204,9 +230,15 @@ class DeleteIndex(Widget):
             try:
                 async with get_client() as client:
                     index = client.index(self.selected_index)
-                    await index.delete()
+                    await run_request("indexes", index.delete, idempotent=False)
+                    # The documents are gone, so the next sync has to send all of them again.
+                    SyncManifest.for_index(
+                        load_config().config_dir / MANIFEST_DIR, client, self.selected_index
+                    ).delete()
+                search_cache.invalidate(self.selected_index)
+                index_store.invalidate()
                 await self._success_message()
-            except MeilisearchError as e:
+            except (MeilisearchError, CircuitOpenError) as e:
                 await self._error_message(f"{e}")
             except Exception as e:
                 await self._error_message(f"An unknown error occured error: {e}")
@@ -229,7 +261,7 @@ class DeleteIndex(Widget):
 class DataLoad(Widget):
     DEFAULT_CSS = """
     DataLoad {
-        height: 50;
+        height: 68;
     }
     """
 
@@ -239,19 +271,25 @@ class DataLoad(Widget):
         yield DirectoryTree(Path.home(), id="tree-view")
         yield Static("No index selected", classes="bottom-spacer", id="data-load-index-name")
         yield InputWithLabel(
-            label="File Path",
+            label="File, Directory, or Glob",
             input_id="data-file",
             error_id="data-file-error",
-            error_message="A Path to a json, jsonl, or csv file is required",
+            error_message="A json, jsonl, ndjson, or csv file, optionally gzip or zstd compressed, "
+            "or a directory or glob matching them is required",
         )
+        yield Label("Only send documents that changed since the last sync of this index")
+        yield Switch(value=False, id="sync-changes")
+        yield Label("Delete documents that are no longer in the file (sync only)")
+        yield Switch(value=False, id="delete-missing")
         with Center():
             yield Button(label="Load Data", id="load-data-button")
         yield SuccessMessage(
-            "Data successfully sent for indexing",
+            "Data successfully indexed",
             classes="message-centered",
             id="load-data-successful",
         )
         yield ErrorMessage("", classes="message-centered", id="load-data-error")
+        yield IngestProgressPanel(id="load-data-progress")
 
     @cached_property
     def data_file(self) -> Input:
@@ -281,6 +319,10 @@ class DataLoad(Widget):
     def data_load_successful(self) -> Static:
         return self.query_one("#load-data-successful", Static)
 
+    @cached_property
+    def data_load_progress(self) -> IngestProgressPanel:
+        return self.query_one("#load-data-progress", IngestProgressPanel)
+
     def on_mount(self) -> None:
         self.data_load_successful.visible = False
         self.data_load_error.visible = False
@@ -294,34 +336,29 @@ class DataLoad(Widget):
         except Exception:
             raise
 
+    def on_directory_tree_directory_selected(self, event: DirectoryTree.DirectorySelected) -> None:
+        """Called when the user click a directory in the directory tree."""
+        event.stop()
+        self.data_file.value = str(event.path)
+
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         button_id = event.button.id
 
         if button_id == "load-data-button":
             selected_index = self.selected_index
-            if not self.data_file.value or Path(self.data_file.value).suffix not in (
-                ".csv",
-                ".json",
-                ".jsonl",
-            ):
+            if not self.data_file.value:
                 self.data_file_error.visible = True
                 return None
             if not selected_index:
                 return None
 
-            data_file_path = Path(self.data_file.value)
-            try:
-                async with get_client() as client:
-                    index = client.index(selected_index)
-                    if data_file_path.suffix == ".json":
-                        await index.add_documents_from_file_in_batches(data_file_path)
-                    else:
-                        await index.add_documents_from_raw_file(data_file_path)
-                await self._success_message()
-            except MeilisearchError as e:
-                await self._error_message(f"{e}")
-            except Exception as e:
-                await self._error_message(f"An unknown error occured error: {e}")
+            self.data_file_error.visible = False
+            self.load_data(
+                selected_index,
+                self.data_file.value,
+                sync_changes=self.query_one("#sync-changes", Switch).value,
+                delete_missing=self.query_one("#delete-missing", Switch).value,
+            )
 
         self.data_file.value = ""
 
@@ -329,6 +366,110 @@ class DataLoad(Widget):
         if event.key == "enter":
             self.load_data_button.press()
 
+    @work(group="load-data")
+    async def load_data(
+        self,
+        selected_index: str,
+        pattern: str,
+        *,
+        sync_changes: bool = False,
+        delete_missing: bool = False,
+    ) -> None:
+        # Searching a big directory tree can take a while, so it is kept off the event loop.
+        loop = asyncio.get_running_loop()
+        try:
+            paths = await loop.run_in_executor(None, expand_paths, pattern)
+        except ValueError as e:
+            self.data_file_error.visible = True
+            await self._error_message(str(e))
+            return
+        if sync_changes and len(paths) > 1:
+            await self._error_message("Sync can only load one file at a time")
+            return
+
+        sizer = BatchSizer()
+        progress = (
+            MultiFileProgress() if len(paths) > 1 else IngestProgress(document_size(paths[0]))
+        )
+        self.data_load_progress.progress = progress
+        # A sync waits for its own tasks so it knows when the manifest can be saved.
+        watcher = (
+            None if sync_changes else asyncio.ensure_future(watch_progress(progress, sizer=sizer))
+        )
+        try:
+            config = load_config()
+            async with get_client() as client:
+                index = client.index(selected_index)
+                if sync_changes:
+                    manifest = SyncManifest.for_index(
+                        config.config_dir / MANIFEST_DIR, client, selected_index
+                    )
+                    report = await sync_documents(
+                        client,
+                        index,
+                        paths[0],
+                        manifest,
+                        delete_missing=delete_missing,
+                        batch_size=sizer,
+                        concurrency=config.upload_concurrency,
+                        progress=progress,
+                        compression=config.upload_compression,
+                        compression_level=config.upload_compression_level,
+                    )
+                elif isinstance(progress, MultiFileProgress):
+                    await add_files_in_batches(
+                        index,
+                        paths,
+                        batch_size=sizer,
+                        concurrency=config.upload_concurrency,
+                        progress=progress,
+                        checkpoint_dir=config.config_dir / CHECKPOINT_DIR,
+                        compression=config.upload_compression,
+                        compression_level=config.upload_compression_level,
+                    )
+                else:
+                    checkpoint = await open_checkpoint(
+                        config.config_dir / CHECKPOINT_DIR, client, selected_index, paths[0]
+                    )
+                    if checkpoint.offset:
+                        self.notify(
+                            f"Resuming the interrupted load of {paths[0].name} from byte "
+                            f"{checkpoint.offset:,}"
+                        )
+                    await add_documents_in_batches(
+                        index,
+                        paths[0],
+                        batch_size=sizer,
+                        concurrency=config.upload_concurrency,
+                        progress=progress,
+                        checkpoint=checkpoint,
+                        compression=config.upload_compression,
+                        compression_level=config.upload_compression_level,
+                    )
+            if watcher:
+                await watcher
+            index_store.invalidate()
+            failed_tasks = report.failed_tasks if sync_changes else progress.failed_tasks
+            if failed_tasks:
+                uids = ", ".join(str(x.uid) for x in failed_tasks)
+                message = f"Tasks {uids} failed"
+                if sync_changes:
+                    message = f"{message}, the changes will be sent again on the next sync"
+                await self._error_message(message)
+                return
+            self.run_worker(self._success_message())
+        except MeilisearchError as e:
+            if watcher:
+                watcher.cancel()
+            await self._error_message(f"{e}")
+        except Exception as e:
+            if watcher:
+                watcher.cancel()
+            await self._error_message(f"An unknown error occured error: {e}")
+        finally:
+            # Indexing changes what searches return, so drop anything cached while it ran.
+            search_cache.invalidate(selected_index)
+
     async def watch_selected_index(self) -> None:
         if self.selected_index:
             self.index_name.update(f"Selected Index: {self.selected_index}")
@@ -347,6 +488,110 @@ class DataLoad(Widget):
         self.data_load_error.visible = False
 
 
+class DataExport(Widget):
+    DEFAULT_CSS = """
+    DataExport {
+        height: auto;
+    }
+    """
+
+    selected_index: reactive[str | None] = reactive(None)
+
+    def compose(self) -> ComposeResult:
+        yield Static("No index selected", classes="bottom-spacer", id="data-export-index-name")
+        yield InputWithLabel(
+            label="File Path",
+            input_id="export-file",
+            input_placeholder="Example: ~/movies.ndjson.gz",
+            error_id="export-file-error",
+            error_message="A path to an ndjson or ndjson.gz file is required",
+        )
+        with Center():
+            yield Button(label="Export Data", id="export-data-button")
+        yield SuccessMessage("", classes="message-centered", id="export-data-successful")
+        yield ErrorMessage("", classes="message-centered", id="export-data-error")
+        yield ExportProgressPanel(id="export-data-progress")
+
+    @cached_property
+    def export_file(self) -> Input:
+        return self.query_one("#export-file", Input)
+
+    @cached_property
+    def export_file_error(self) -> Static:
+        return self.query_one("#export-file-error", Static)
+
+    @cached_property
+    def export_data_button(self) -> Button:
+        return self.query_one("#export-data-button", Button)
+
+    @cached_property
+    def export_error(self) -> ErrorMessage:
+        return self.query_one("#export-data-error", ErrorMessage)
+
+    @cached_property
+    def export_progress(self) -> ExportProgressPanel:
+        return self.query_one("#export-data-progress", ExportProgressPanel)
+
+    @cached_property
+    def export_successful(self) -> SuccessMessage:
+        return self.query_one("#export-data-successful", SuccessMessage)
+
+    @cached_property
+    def index_name(self) -> Static:
+        return self.query_one("#data-export-index-name", Static)
+
+    def on_mount(self) -> None:
+        self.export_successful.visible = False
+        self.export_error.visible = False
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id != "export-data-button":
+            return
+
+        if not self.export_file.value:
+            self.export_file_error.visible = True
+            return
+        if not self.selected_index:
+            return
+
+        self.export_file_error.visible = False
+        self.export_data(self.selected_index, Path(self.export_file.value).expanduser())
+
+    def on_key(self, event: events.Key) -> None:
+        if event.key == "enter":
+            self.export_data_button.press()
+
+    @work(exclusive=True, group="export-data")
+    async def export_data(self, selected_index: str, path: Path) -> None:
+        progress = ExportProgress()
+        self.export_progress.progress = progress
+        try:
+            async with get_client() as client:
+                written = await export_to_file(
+                    client.index(selected_index), path, progress=progress
+                )
+        except Exception as e:
+            await self._error_message(f"An error occurred exporting the documents: {e}")
+            return
+
+        self.export_successful.renderable = f"Exported {written:,} documents to {path}"
+        self.export_successful.visible = True
+        await asyncio.sleep(5)
+        self.export_successful.visible = False
+
+    def watch_selected_index(self) -> None:
+        if self.selected_index:
+            self.index_name.update(f"Selected Index: {self.selected_index}")
+        else:
+            self.index_name.update("No index selected")
+
+    async def _error_message(self, message: str) -> None:
+        self.export_error.renderable = message
+        self.export_error.visible = True
+        await asyncio.sleep(5)
+        self.export_error.visible = False
+
+
 class EditMeilisearchSettings(Widget):
     DEFAULT_CSS = """
     EditMeilisearchSettings {
@@ -551,7 +796,10 @@ class EditMeilisearchSettings(Widget):
 
                 async with get_client() as client:
                     index = client.index(self.selected_index)
-                    await index.update_settings(settings)
+                    await run_request(
+                        "settings", lambda: index.update_settings(settings), idempotent=False
+                    )
+                search_cache.invalidate(self.selected_index)
             except Exception as e:
                 await self._error_message(f"An error occurred saving the settings: {e}")
                 return
@@ -560,7 +808,8 @@ class EditMeilisearchSettings(Widget):
             try:
                 async with get_client() as client:
                     index = client.index(self.selected_index)
-                    await index.reset_settings()
+                    await run_request("settings", index.reset_settings, idempotent=False)
+                search_cache.invalidate(self.selected_index)
             except Exception as e:
                 await self._error_message(f"An error occurred resetting the settings: {e}")
                 return
@@ -589,7 +838,7 @@ class EditMeilisearchSettings(Widget):
 
         async with get_client() as client:
             index = client.index(self.selected_index)
-            results = await index.get_settings()
+            results = await run_request("settings", index.get_settings)
 
         self.synonyms_input.value = json.dumps(results.synonyms) if results.synonyms else "{}"
         self.stop_words_input.value = str(results.stop_words)
@@ -683,7 +932,7 @@ class MeilisearchSettings(Widget):
         async with get_client() as client:
             index = client.index(self.selected_index)
             try:
-                results = await index.get_settings()
+                results = await run_request("settings", index.get_settings)
             except Exception as e:
                 if current_index == self.selected_index:
                     self.results.update(f"Error: {e}")
@@ -721,6 +970,8 @@ class IndexScreen(Screen):
                     yield DeleteIndex()
                 with TabPane("Load Data", id="load-data"):
                     yield DataLoad()
+                with TabPane("Export Data", id="export-data"):
+                    yield DataExport()
         yield ErrorMessage("", classes="message-centered", id="generic-error")
         yield Footer()
 
@@ -736,6 +987,10 @@ class IndexScreen(Screen):
     def data_load(self) -> DataLoad:
         return self.query_one(DataLoad)
 
+    @cached_property
+    def data_export(self) -> DataExport:
+        return self.query_one(DataExport)
+
     @cached_property
     def delete_index(self) -> DeleteIndex:
         return self.query_one(DeleteIndex)
@@ -756,13 +1011,16 @@ class IndexScreen(Screen):
     def tabbed_content(self) -> TabbedContent:
         return self.query_one(TabbedContent)
 
-    async def on_screen_resume(self, event: events.ScreenResume) -> None:
+    def on_screen_resume(self, event: events.ScreenResume) -> None:
         self.body.visible = True
         self.generic_error.display = False
+        self.load_indexes()
+
+    @work(exclusive=True, group="load-indexes")
+    async def load_indexes(self) -> None:
         await self.index_sidebar.update()
         try:
-            async with get_client() as client:
-                indexes = await client.get_indexes()
+            indexes = await get_indexes()
         except MeilisearchCommunicationError as e:
             self.body.visible = False
             self.generic_error.display = True
@@ -779,11 +1037,13 @@ class IndexScreen(Screen):
             self.meilisearch_settings.selected_index = self.selected_index
             self.delete_index.selected_index = self.selected_index
             self.data_load.selected_index = self.selected_index
+            self.data_export.selected_index = self.selected_index
         else:
             self.selected_index = None
             self.meilisearch_settings.selected_index = None
             self.delete_index.selected_index = None
             self.data_load.selected_index = None
+            self.data_export.selected_index = None
             self.tabbed_content.active = "add-index"
 
     async def on_list_item__child_clicked(self, message: IndexSidebar.Selected) -> None:  # type: ignore[name-defined]
@@ -791,6 +1051,7 @@ class IndexScreen(Screen):
         self.meilisearch_settings.selected_index = self.index_sidebar.selected_index or ""
         self.delete_index.selected_index = self.index_sidebar.selected_index or None
         self.data_load.selected_index = self.index_sidebar.selected_index or None
+        self.data_export.selected_index = self.index_sidebar.selected_index or None
 
     async def on_add_index_index_added(self) -> None:
         await self.index_sidebar.update()
@@ -1,33 +1,39 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from functools import cached_property
+from typing import Any
 
 from meilisearch_python_sdk.errors import MeilisearchCommunicationError
 from meilisearch_python_sdk.models.search import Hybrid, SearchResults
-from textual import events
+from textual import events, work
 from textual.app import ComposeResult
 from textual.containers import Center, VerticalScroll
 from textual.screen import Screen
-from textual.widgets import Button, Footer, Input, Markdown, Static
+from textual.widgets import Button, Footer, Input, Static
 
-from meilisearch_tui.client import get_client
+from meilisearch_tui.cache import SearchCacheKey, search_cache
+from meilisearch_tui.client import get_client, run_request
 from meilisearch_tui.config import load_config
+from meilisearch_tui.metrics import SEARCH_ENDPOINT, request_metrics
+from meilisearch_tui.utils import get_indexes
+from meilisearch_tui.widgets.hit_list import HitList
 from meilisearch_tui.widgets.index_sidebar import IndexSidebar
 from meilisearch_tui.widgets.messages import ErrorMessage
 
 
 class SearchScreen(Screen):
-    hybrid_search = False
-
     def __init__(self) -> None:
         super().__init__()
-        self.limit = 20
+        self.page_size = 20
         self.selected_index: str | None = None
+        self.hits: list[dict[str, Any]] = []
+        self._prefetched: dict[tuple[str, str, int], SearchResults] = {}
 
-        if self.hybrid_search:
-            config = load_config()
-            self.semantic_ratio = config.semantic_ratio if config.semantic_ratio else 0.5
-            self.embedder = config.embedder
+    @property
+    def hybrid_search(self) -> bool:
+        return getattr(self.app, "hybrid_search", False)
 
     def compose(self) -> ComposeResult:
         yield ErrorMessage("", classes="message-centered", id="generic-error")
@@ -37,8 +43,8 @@ class SearchScreen(Screen):
             yield Input(placeholder="Search", classes="bottom-spacer", id="search")
             with Center():
                 yield Button(label="Clear Search Box", classes="bottom-spacer", id="clear-search")
-            with VerticalScroll(id="results-container"):
-                yield Markdown(id="results")
+            yield Static("", id="results-header")
+            yield HitList(id="results-container")
             with Center():
                 yield Button(label="Load More", classes="bottom-spacer", id="load-more-button")
         yield Footer()
@@ -68,26 +74,43 @@ class SearchScreen(Screen):
         return self.query_one("#clear-search", Button)
 
     @cached_property
-    def results_container(self) -> VerticalScroll:
-        return self.query_one("#results-container", VerticalScroll)
+    def results_header(self) -> Static:
+        return self.query_one("#results-header", Static)
 
     @cached_property
-    def results(self) -> Markdown:
-        return self.query_one("#results", Markdown)
+    def results(self) -> HitList:
+        return self.query_one("#results-container", HitList)
 
     @cached_property
     def load_more_button(self) -> Button:
         return self.query_one("#load-more-button", Button)
 
-    async def on_screen_resume(self, event: events.ScreenResume) -> None:
+    def on_mount(self) -> None:
+        config = load_config()
+        # Caps the number of searches this session can have in flight so a fast typist can't
+        # flood a busy cluster.
+        self.search_limiter = asyncio.Semaphore(max(config.max_concurrent_searches, 1))
+        search_cache.maxsize = config.search_cache_size
+        search_cache.ttl = config.search_cache_ttl
+
+        if self.hybrid_search:
+            self.semantic_ratio = config.semantic_ratio if config.semantic_ratio else 0.5
+            self.embedder = config.embedder
+
+    def on_screen_resume(self, event: events.ScreenResume) -> None:
         self.body_container.visible = True
         self.generic_error.display = False
-        await self.index_sidebar.update()
         self.search_input.value = ""
-        self.results.update("")
+        self.clear_results()
+        self.index_name.update("Loading indexes...")
+        self.search_input.focus()
+        self.load_indexes()
+
+    @work(exclusive=True, group="load-indexes")
+    async def load_indexes(self) -> None:
+        await self.index_sidebar.update()
         try:
-            async with get_client() as client:
-                indexes = await client.get_indexes()
+            indexes = await get_indexes()
         except MeilisearchCommunicationError as e:
             self.body_container.visible = False
             self.generic_error.display = True
@@ -106,96 +129,180 @@ class SearchScreen(Screen):
             self.selected_index = None
             self.index_name.update("No index selected")
 
-        self.search_input.focus()
-        self.load_more_button.visible = False
-
     async def on_list_item__child_clicked(self, message: IndexSidebar.Selected) -> None:  # type: ignore[name-defined]
         self.selected_index = self.index_sidebar.selected_index
         self.index_name.update(f"Searching index: {self.selected_index}")
         self.search_input.value = ""
-        self.results.update("")
+        self.clear_results()
 
     async def on_input_changed(self, message: Input.Changed) -> None:
-        self.limit = 20
         if message.value:
-            await self.search(message.value)
+            self.search(message.value)
         else:
-            self.results.update("")
-            self.load_more_button.visible = False
+            self.workers.cancel_group(self, "search")
+            self.workers.cancel_group(self, "prefetch")
+            self.clear_results()
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         button_id = event.button.id
 
         if button_id == "load-more-button":
-            self.limit += 20
-            await self.search(self.search_input.value)
+            self.load_more(self.search_input.value)
 
         if button_id == "clear-search":
             self.search_input.value = ""
             self.search_input.focus()
 
-    async def search(self, search: str) -> None:
+    def clear_results(self, message: str = "") -> None:
+        self.hits = []
+        self._prefetched = {}
+        self.results_header.update(message)
+        self.results.clear()
+        self.load_more_button.visible = False
+
+    @work(exclusive=True, group="search", exit_on_error=False)
+    async def search(self, search: str, debounce: bool = True) -> None:
+        self.workers.cancel_group(self, "prefetch")
+
         if not self.selected_index and search == self.search_input.value:
-            self.results.update("Error: No index provided")
+            self.clear_results("Error: No index provided")
             return
 
         if not self.selected_index:
-            self.results.update("No index selected")
+            self.clear_results("No index selected")
             return
 
-        async with get_client() as client:
-            index = client.index(self.selected_index)
-            try:
-                if self.hybrid_search:
-                    results = await index.search(
-                        self.search_input.value,
-                        limit=self.limit,
-                        attributes_to_highlight=["*"],
-                        highlight_pre_tag="***",
-                        highlight_post_tag="***",
-                        hybrid=Hybrid(semantic_ratio=self.semantic_ratio, embedder=self.embedder),
-                    )
-                else:
-                    results = await index.search(
-                        self.search_input.value,
-                        limit=self.limit,
-                        attributes_to_highlight=["*"],
-                        highlight_pre_tag="***",
-                        highlight_post_tag="***",
-                    )
+        selected_index = self.selected_index
+        cached = search_cache.get(self._cache_key(selected_index, search, 0))
+        if cached is not None:
+            self._show_results(selected_index, search, cached)
+            if not load_config().search_cache_revalidate:
+                return
 
+        # Starting a new search cancels the running one, so sleeping here first means only the
+        # last keystroke in a burst actually reaches the server.
+        if debounce:
+            await asyncio.sleep(load_config().search_debounce_ms / 1000)
+
+        try:
+            results = await self._search_page(selected_index, search, 0, use_cache=False)
+        except Exception as e:
+            if search == self.search_input.value and cached is None:
+                self.clear_results(f"Error: {e}")
+            return
+
+        self._show_results(selected_index, search, results)
+
+    @work(exclusive=True, group="search", exit_on_error=False)
+    async def load_more(self, search: str) -> None:
+        if not self.selected_index or not search:
+            return
+
+        selected_index = self.selected_index
+        offset = len(self.hits)
+        results = self._prefetched.pop((selected_index, search, offset), None)
+        if results is None:
+            try:
+                results = await self._search_page(selected_index, search, offset)
             except Exception as e:
                 if search == self.search_input.value:
-                    self.results.update(f"Error: {e}")
+                    self.results_header.update(f"Error: {e}")
                 return
 
+        if (
+            search != self.search_input.value
+            or selected_index != self.selected_index
+            or offset != len(self.hits)
+        ):
+            return
+
+        # Only the new page is added, the pages already on screen are left alone.
+        self.hits.extend(results.hits)
+        self.results.append_hits(results.hits)
+        self._update_load_more(results)
+        self.prefetch_next_page(selected_index, search)
+
+    @work(exclusive=True, group="prefetch", exit_on_error=False)
+    async def prefetch_next_page(self, selected_index: str, search: str) -> None:
+        offset = len(self.hits)
+        if not self.load_more_button.visible:
+            return
+
+        try:
+            results = await self._search_page(selected_index, search, offset)
+        except Exception:
+            return
+
+        if search == self.search_input.value and offset == len(self.hits):
+            self._prefetched = {(selected_index, search, offset): results}
+
+    def _show_results(self, selected_index: str, search: str, results: SearchResults) -> None:
         # Make sure a new search hasn't started. This prevents race conditions with displaying
         # the search results by only updating the display if the search is still relavent.
-        if search == self.search_input.value:
-            markdown = self.make_word_markdown(results)
-            self.results.update(markdown)
+        if search != self.search_input.value or selected_index != self.selected_index:
+            return
+
+        start = time.perf_counter()
+        self.hits = list(results.hits)
+        self._prefetched = {}
+        self.results_header.update(self.make_results_header(results))
+        self.results.set_hits(results.hits)
+        self._update_load_more(results)
+        self.call_after_refresh(self._record_render_time, start)
+        self.prefetch_next_page(selected_index, search)
 
-    def make_word_markdown(self, results: SearchResults) -> str:
-        lines = []
+    def _record_render_time(self, start: float) -> None:
+        request_metrics.add(SEARCH_ENDPOINT, "render", (time.perf_counter() - start) * 1000)
 
-        if results.estimated_total_hits and results.estimated_total_hits > len(results.hits):
+    def _cache_key(self, selected_index: str, search: str, offset: int) -> SearchCacheKey:
+        if self.hybrid_search:
+            return SearchCacheKey(
+                selected_index, search, self.page_size, offset, self.semantic_ratio, self.embedder
+            )
+
+        return SearchCacheKey(selected_index, search, self.page_size, offset)
+
+    async def _search_page(
+        self, selected_index: str, search: str, offset: int, use_cache: bool = True
+    ) -> SearchResults:
+        cache_key = self._cache_key(selected_index, search, offset)
+        if use_cache:
+            cached = search_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async with get_client() as client, self.search_limiter:
+            index = client.index(selected_index)
+            hybrid = (
+                Hybrid(semantic_ratio=self.semantic_ratio, embedder=self.embedder)
+                if self.hybrid_search
+                else None
+            )
+            results = await run_request(
+                "search",
+                lambda: index.search(
+                    search,
+                    offset=offset,
+                    limit=self.page_size,
+                    attributes_to_highlight=["*"],
+                    highlight_pre_tag="***",
+                    highlight_post_tag="***",
+                    hybrid=hybrid,
+                ),
+            )
+
+        search_cache.set(cache_key, results)
+
+        return results
+
+    def _update_load_more(self, results: SearchResults) -> None:
+        if results.estimated_total_hits and results.estimated_total_hits > len(self.hits):
             self.load_more_button.visible = True
         else:
             self.load_more_button.visible = False
 
-        lines.append(
-            f"## Hits: ~{results.estimated_total_hits} | Search time: {results.processing_time_ms} ms"
-        )
-
+    def make_results_header(self, results: SearchResults) -> str:
         if results.hits:
-            for hit in results.hits:
-                if hit.get("_formatted"):
-                    for k, v in hit["_formatted"].items():
-                        lines.append(f"{k}: {v}\n")
-                else:
-                    for k, v in hit.items():
-                        lines.append(f"{k}: {v}\n")
-                lines.append("-------------------------------")
-            return "\n".join(lines)
+            return f"Hits: ~{results.estimated_total_hits} | Search time: {results.processing_time_ms} ms"
 
         return "No results found"
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import cached_property
+
+from meilisearch_python_sdk.errors import MeilisearchCommunicationError
+from meilisearch_python_sdk.models.task import TaskResult
+from textual import events, on, work
+from textual.app import ComposeResult
+from textual.containers import Center, Container
+from textual.screen import Screen
+from textual.timer import Timer
+from textual.widgets import Button, DataTable, Footer, Static
+
+from meilisearch_tui.client import get_client
+from meilisearch_tui.tasks import FINISHED_STATUSES, TaskFeed, task_duration
+from meilisearch_tui.widgets.messages import ErrorMessage
+
+COLUMNS = (
+    ("Uid", "uid"),
+    ("Index", "index"),
+    ("Type", "type"),
+    ("Status", "status"),
+    ("Enqueued At", "enqueued_at"),
+    ("Duration", "duration"),
+)
+REFRESH_INTERVAL = 2.0
+
+
+class TasksScreen(Screen):
+    DEFAULT_CSS = """
+    #tasks-table {
+        height: 1fr;
+    }
+    #tasks-summary {
+        text-style: bold;
+        background: $primary;
+        padding: 0 1;
+    }
+    """
+
+    BINDINGS = [("r", "refresh_tasks", "Refresh")]
+
+    def __init__(self, page_size: int = 100) -> None:
+        super().__init__()
+        self.feed = TaskFeed(page_size=page_size)
+        self._refresh_timer: Timer | None = None
+
+    def compose(self) -> ComposeResult:
+        with Container(id="body"):
+            yield Static("", id="tasks-summary")
+            yield DataTable(id="tasks-table", cursor_type="row", zebra_stripes=True)
+            with Center():
+                yield Button(label="Load Older Tasks", id="load-older-button")
+            yield ErrorMessage("", classes="message-centered", id="generic-error")
+        yield Footer()
+
+    @cached_property
+    def generic_error(self) -> ErrorMessage:
+        return self.query_one("#generic-error", ErrorMessage)
+
+    @cached_property
+    def load_older_button(self) -> Button:
+        return self.query_one("#load-older-button", Button)
+
+    @cached_property
+    def summary(self) -> Static:
+        return self.query_one("#tasks-summary", Static)
+
+    @cached_property
+    def table(self) -> DataTable:
+        return self.query_one(DataTable)
+
+    def on_mount(self) -> None:
+        for label, key in COLUMNS:
+            self.table.add_column(label, key=key)
+
+        self._refresh_timer = self.set_interval(
+            REFRESH_INTERVAL, self.action_refresh_tasks, pause=True
+        )
+
+    def on_screen_resume(self, event: events.ScreenResume) -> None:
+        self.action_refresh_tasks()
+        if self._refresh_timer:
+            self._refresh_timer.resume()
+
+    def on_screen_suspend(self, event: events.ScreenSuspend) -> None:
+        if self._refresh_timer:
+            self._refresh_timer.pause()
+
+    def action_refresh_tasks(self) -> None:
+        self.refresh_tasks()
+
+    @on(Button.Pressed, "#load-older-button")
+    def load_older_pressed(self) -> None:
+        self.load_older()
+
+    @on(DataTable.RowHighlighted)
+    def row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        # Fetch the next page of history when the cursor reaches the bottom of what is loaded.
+        if event.cursor_row == self.table.row_count - 1 and self.feed.has_older:
+            self.load_older()
+
+    @work(exclusive=True, group="refresh-tasks")
+    async def refresh_tasks(self) -> None:
+        try:
+            async with get_client() as client:
+                changed = await self.feed.refresh(client)
+        except MeilisearchCommunicationError as e:
+            self._show_error(
+                f"An error occured: {e}.\nMake sure the Meilisearch server is running and accessable"
+            )
+            return
+        except Exception as e:
+            self._show_error(f"An error occured: {e}")
+            return
+
+        self._update_rows(changed)
+
+    @work(exclusive=True, group="load-older-tasks")
+    async def load_older(self) -> None:
+        try:
+            async with get_client() as client:
+                changed = await self.feed.load_older(client)
+        except Exception as e:
+            self._show_error(f"An error occured: {e}")
+            return
+
+        self._update_rows(changed)
+
+    def _update_rows(self, changed: list[TaskResult]) -> None:
+        self.generic_error.display = False
+        added = False
+        for task in changed:
+            row = _task_row(task)
+            key = str(task.uid)
+            if key in self.table.rows:
+                for (_, column), value in zip(COLUMNS, row):
+                    self.table.update_cell(key, column, value)
+            else:
+                self.table.add_row(*row, key=key)
+                added = True
+
+        # Durations of running tasks change between polls even when their status doesn't.
+        changed_uids = {x.uid for x in changed}
+        for uid in self.feed.unfinished_uids:
+            if uid not in changed_uids:
+                self.table.update_cell(str(uid), "duration", _format_duration(self.feed.tasks[uid]))
+
+        if added:
+            self.table.sort("uid", reverse=True)
+
+        self.load_older_button.display = self.feed.has_older
+        self._update_summary()
+
+    def _update_summary(self) -> None:
+        counts: dict[str, int] = {}
+        for task in self.feed.tasks.values():
+            counts[task.status] = counts.get(task.status, 0) + 1
+
+        statuses = ("enqueued", "processing", *FINISHED_STATUSES)
+        parts = [f"{status.title()}: {counts.get(status, 0)}" for status in statuses]
+        loaded = f"{len(self.feed.tasks)} tasks loaded"
+        if self.feed.has_older:
+            loaded += ", older tasks available"
+        self.summary.update(f"{' | '.join(parts)} ({loaded})")
+
+    def _show_error(self, message: str) -> None:
+        self.generic_error.display = True
+        self.generic_error.renderable = message  # type: ignore
+
+
+def _task_row(task: TaskResult) -> tuple[int, str, str, str, str, str]:
+    return (
+        task.uid,
+        task.index_uid or "",
+        str(task.task_type),
+        task.status,
+        task.enqueued_at.strftime("%Y-%m-%d %H:%M:%S"),
+        _format_duration(task),
+    )
+
+
+def _format_duration(task: TaskResult) -> str:
+    duration = task_duration(task)
+    if duration is None and task.started_at is not None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        duration = (now - task.started_at).total_seconds()
+    if duration is None:
+        return ""
+
+    return f"{duration:.2f}s"
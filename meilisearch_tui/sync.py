@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.errors import MeilisearchApiError
+from meilisearch_python_sdk.index import AsyncIndex
+from meilisearch_python_sdk.models.task import TaskResult
+
+from meilisearch_tui.client import run_request
+from meilisearch_tui.ingest import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_COMPRESSION_LEVEL,
+    DEFAULT_CONCURRENCY,
+    BatchSizer,
+    IngestProgress,
+    add_documents_in_batches,
+    document_size,
+    watch_progress,
+)
+from meilisearch_tui.tasks import wait_for_tasks
+
+DELETE_BATCH_SIZE = 10_000
+MANIFEST_DIR = "manifests"
+HASH_SIZE = 16
+
+
+class SyncManifest:
+    """The content hash of every document last synced to an index, by primary key.
+
+    It is stored as gzip compressed `key<TAB>hash` lines. Meilisearch document ids can't contain
+    tabs or new lines so no escaping is needed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.hashes: dict[str, bytes] = {}
+
+    @classmethod
+    def for_index(cls, directory: Path, client: AsyncClient, index_uid: str) -> SyncManifest:
+        server = hashlib.sha256(str(client.http_client.base_url).encode()).hexdigest()[:8]
+        return cls(directory / f"{index_uid}-{server}.tsv.gz")
+
+    def load(self) -> None:
+        self.hashes = {}
+        if not self.path.exists():
+            return
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                key, _, digest = line.rstrip("\n").partition("\t")
+                self.hashes[key] = bytes.fromhex(digest)
+
+    def save(self, hashes: dict[str, bytes]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.path.with_name(f"{self.path.name}.tmp")
+        with gzip.open(temp_file, "wt", encoding="utf-8") as f:
+            for key, digest in hashes.items():
+                f.write(f"{key}\t{digest.hex()}\n")
+        os.replace(temp_file, self.path)
+        self.hashes = hashes
+
+    def delete(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class ChangeFilter:
+    """Selects the records of a document file that are new or changed since the last sync.
+
+    Pass it as `select` to add_documents_in_batches. JSON documents are hashed after normalizing
+    their key order and spacing so a re-export that only reformats the file is still a no-op, csv
+    rows are hashed as they are.
+
+    Without a primary key it is inferred from the first document the way Meilisearch does, from
+    the only field whose name ends in `id`.
+    """
+
+    def __init__(self, previous: dict[str, bytes], primary_key: str | None = None) -> None:
+        self.previous = previous
+        self.primary_key = primary_key
+        self.seen: dict[str, bytes] = {}
+        self.changed = 0
+        self.unchanged = 0
+        self._csv_header: bytes | None = None
+        self._csv_key_column = -1
+
+    @property
+    def missing_keys(self) -> list[str]:
+        return [x for x in self.previous if x not in self.seen]
+
+    def __call__(self, header: bytes, record: bytes) -> bool:
+        if self.primary_key is None:
+            self.primary_key = _infer_primary_key(header, record)
+
+        key, digest = self._csv_key(header, record) if header else self._json_key(record)
+        if key is None:
+            # Meilisearch will reject the document with a better message than we could give.
+            self.changed += 1
+            return True
+
+        self.seen[key] = digest
+        if self.previous.get(key) == digest:
+            self.unchanged += 1
+            return False
+
+        self.changed += 1
+        return True
+
+    def _json_key(self, record: bytes) -> tuple[str | None, bytes]:
+        document = json.loads(record)
+        normalized = json.dumps(document, sort_keys=True, separators=(",", ":")).encode()
+        return _key(document.get(self.primary_key)), _hash(normalized)
+
+    def _csv_key(self, header: bytes, record: bytes) -> tuple[str | None, bytes]:
+        if header != self._csv_header:
+            names = _csv_columns(header)
+            self._csv_header = header
+            self._csv_key_column = (
+                names.index(self.primary_key) if self.primary_key in names else -1
+            )
+
+        if self._csv_key_column < 0:
+            return None, b""
+
+        row = next(csv.reader(io.StringIO(record.decode("utf-8"))), [])
+        key = row[self._csv_key_column] if self._csv_key_column < len(row) else None
+        return _key(key), _hash(record.rstrip(b"\r\n"))
+
+
+class SyncReport(NamedTuple):
+    documents_sent: int
+    documents_unchanged: int
+    documents_deleted: int
+    failed_tasks: list[TaskResult]
+
+
+async def sync_documents(
+    client: AsyncClient,
+    index: AsyncIndex,
+    path: Path,
+    manifest: SyncManifest,
+    *,
+    primary_key: str | None = None,
+    delete_missing: bool = False,
+    batch_size: int | BatchSizer = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: IngestProgress | None = None,
+    compression: str | None = None,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> SyncReport:
+    """Load a document file, only sending the documents that changed since the last sync.
+
+    With `delete_missing` the documents that were in the last sync but aren't in the file are
+    deleted. The manifest is only saved once every task has succeeded, so after a failure the next
+    sync sends the same changes again. If the index doesn't exist the manifest is ignored and every
+    document is sent, since whatever it recorded was deleted with the index.
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, manifest.load)
+    exists, index_primary_key = await _get_primary_key(index)
+    previous = manifest.hashes if exists else {}
+    primary_key = primary_key or index_primary_key
+    changes = ChangeFilter(previous, primary_key)
+    sizer = batch_size if isinstance(batch_size, BatchSizer) else None
+    progress = progress or IngestProgress(document_size(path))
+    await add_documents_in_batches(
+        index,
+        path,
+        primary_key=primary_key,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        progress=progress,
+        select=changes,
+        compression=compression,
+        compression_level=compression_level,
+    )
+    await watch_progress(progress, sizer=sizer)
+    failed_tasks = list(progress.failed_tasks)
+
+    missing = changes.missing_keys if delete_missing else []
+    deletions = []
+    for i in range(0, len(missing), DELETE_BATCH_SIZE):
+        keys = missing[i : i + DELETE_BATCH_SIZE]
+        deletions.append(
+            await run_request("documents", lambda: index.delete_documents(keys), idempotent=False)
+        )
+    if deletions:
+        results = await wait_for_tasks(client, [x.task_uid for x in deletions])
+        failed_tasks.extend(x for x in results if x.status != "succeeded")
+
+    if not failed_tasks:
+        hashes = changes.seen
+        if not delete_missing:
+            hashes = {**previous, **changes.seen}
+        await loop.run_in_executor(None, manifest.save, hashes)
+
+    return SyncReport(changes.changed, changes.unchanged, len(missing), failed_tasks)
+
+
+async def _get_primary_key(index: AsyncIndex) -> tuple[bool, str | None]:
+    """Returns whether the index exists and its primary key."""
+    try:
+        info = await run_request("indexes", index.fetch_info)
+    except MeilisearchApiError as e:
+        if e.code != "index_not_found":
+            raise
+        return False, None
+
+    return True, info.primary_key
+
+
+def _csv_columns(header: bytes) -> list[str]:
+    columns = next(csv.reader(io.StringIO(header.decode("utf-8"))))
+    # Columns can be annotated with a type, for example `id:number`.
+    return [x.split(":", 1)[0] for x in columns]
+
+
+def _infer_primary_key(header: bytes, record: bytes) -> str:
+    fields = _csv_columns(header) if header else list(json.loads(record))
+    candidates = [x for x in fields if x.lower().endswith("id")]
+    if len(candidates) != 1:
+        raise ValueError("The primary key could not be inferred, pass it to sync")
+
+    return candidates[0]
+
+
+def _key(value: object) -> str | None:
+    if value is None or value == "":
+        return None
+
+    return str(value)
+
+
+def _hash(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=HASH_SIZE).digest()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Sequence
+from urllib.parse import urlencode
+
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.models.task import TaskResult, TaskStatus
+
+from meilisearch_tui.client import run_request, send_request
+
+FINISHED_STATUSES = ("succeeded", "failed", "canceled")
+MAX_UIDS_PER_REQUEST = 500
+
+
+async def get_tasks(
+    client: AsyncClient,
+    *,
+    uids: Sequence[int] | None = None,
+    statuses: Sequence[str] | None = None,
+    index_uids: Sequence[str] | None = None,
+    limit: int | None = None,
+    from_: int | None = None,
+    after_enqueued_at: datetime | None = None,
+) -> TaskStatus:
+    """Get tasks using the filters the SDK's get_tasks doesn't expose."""
+    parameters: dict[str, str | int] = {}
+    if uids:
+        parameters["uids"] = ",".join(str(x) for x in uids)
+    if statuses:
+        parameters["statuses"] = ",".join(statuses)
+    if index_uids:
+        parameters["indexUids"] = ",".join(index_uids)
+    if limit is not None:
+        parameters["limit"] = limit
+    if from_ is not None:
+        parameters["from"] = from_
+    if after_enqueued_at is not None:
+        parameters["afterEnqueuedAt"] = _format_date(after_enqueued_at)
+
+    url = f"tasks?{urlencode(parameters)}" if parameters else "tasks"
+    response = await run_request(
+        "tasks",
+        lambda: send_request(client.http_client, "GET", url),
+        url=str(client.http_client.base_url),
+    )
+    data = response.json()
+
+    # `from` is null when nothing matches, which happens on most incremental refreshes.
+    if data.get("from") is None:
+        data["from"] = from_ or 0
+
+    return TaskStatus(**data)
+
+
+async def wait_for_tasks(
+    client: AsyncClient,
+    uids: Sequence[int],
+    *,
+    min_interval: float = 0.25,
+    max_interval: float = 5.0,
+) -> list[TaskResult]:
+    """Poll until all of the tasks have finished and return them in the order given.
+
+    The wait between rounds doubles while nothing finishes and resets when something does.
+    """
+    finished: dict[int, TaskResult] = {}
+    interval = min_interval
+    while True:
+        pending = sorted({x for x in uids if x not in finished})
+        for i in range(0, len(pending), MAX_UIDS_PER_REQUEST):
+            chunk = pending[i : i + MAX_UIDS_PER_REQUEST]
+            status = await get_tasks(client, uids=chunk, limit=len(chunk))
+            finished.update((x.uid, x) for x in status.results if x.status in FINISHED_STATUSES)
+
+        if all(x in finished for x in pending):
+            return [finished[x] for x in uids]
+
+        moved = any(x in finished for x in pending)
+        interval = min_interval if moved else min(interval * 2, max_interval)
+        await asyncio.sleep(interval)
+
+
+def task_duration(task: TaskResult) -> float | None:
+    if task.started_at and task.finished_at:
+        return (task.finished_at - task.started_at).total_seconds()
+
+    return None
+
+
+class TaskFeed:
+    """A window onto the task queue that is kept up to date without downloading it again.
+
+    Tasks are loaded newest first a page at a time. Refreshing only asks for tasks enqueued after
+    the newest one already seen, plus the current status of tasks that haven't finished.
+    refresh and load_older can be called from tasks running side by side, they take turns.
+    """
+
+    def __init__(self, page_size: int = 100) -> None:
+        self.page_size = page_size
+        self.tasks: dict[int, TaskResult] = {}
+        self._older_from: int | None = None
+        self._loaded = False
+        self._lock: asyncio.Lock | None = None
+
+    @property
+    def has_older(self) -> bool:
+        return not self._loaded or self._older_from is not None
+
+    @property
+    def unfinished_uids(self) -> list[int]:
+        return sorted(
+            uid for uid, task in self.tasks.items() if task.status not in FINISHED_STATUSES
+        )
+
+    async def load_older(self, client: AsyncClient) -> list[TaskResult]:
+        """Load the next page of older tasks."""
+        async with self._get_lock():
+            return await self._load_older(client)
+
+    async def refresh(self, client: AsyncClient) -> list[TaskResult]:
+        """Fetch new tasks and status changes, returning the tasks that were added or changed."""
+        async with self._get_lock():
+            return await self._refresh(client)
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Made on first use so it belongs to the running event loop on Python 3.8 and 3.9.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        return self._lock
+
+    async def _load_older(self, client: AsyncClient) -> list[TaskResult]:
+        if not self.has_older:
+            return []
+
+        status = await get_tasks(client, limit=self.page_size, from_=self._older_from)
+        self._older_from = status.next
+        self._loaded = True
+
+        return self._merge(status.results)
+
+    async def _refresh(self, client: AsyncClient) -> list[TaskResult]:
+        if not self._loaded:
+            return await self._load_older(client)
+
+        changed = []
+        newest = max(self.tasks.values(), key=lambda x: x.uid, default=None)
+        if newest is None:
+            status = await get_tasks(client, limit=self.page_size)
+            changed.extend(self._merge(status.results))
+        else:
+            # afterEnqueuedAt is exclusive and tasks can share a timestamp, so step back slightly
+            # and let the uid check drop the tasks that are already known.
+            after = newest.enqueued_at - timedelta(seconds=1)
+            from_ = None
+            while True:
+                status = await get_tasks(
+                    client, limit=self.page_size, from_=from_, after_enqueued_at=after
+                )
+                changed.extend(self._merge(status.results))
+                if status.next is None or status.next <= newest.uid:
+                    break
+                from_ = status.next
+
+        unfinished = self.unfinished_uids
+        for i in range(0, len(unfinished), MAX_UIDS_PER_REQUEST):
+            uids = unfinished[i : i + MAX_UIDS_PER_REQUEST]
+            status = await get_tasks(client, uids=uids, limit=len(uids))
+            changed.extend(self._merge(status.results))
+
+        return changed
+
+    def _merge(self, tasks: list[TaskResult]) -> list[TaskResult]:
+        changed = []
+        for task in tasks:
+            known = self.tasks.get(task.uid)
+            if known is None or known.status != task.status:
+                self.tasks[task.uid] = task
+                changed.append(task)
+
+        return changed
+
+
+def _format_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        return f"{value.isoformat()}Z"
+
+    return value.isoformat()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from meilisearch_python_sdk.index import AsyncIndex
 
-from meilisearch_tui.client import get_client
+from meilisearch_tui.cache import index_store
 
 
 async def get_current_indexes_string() -> str:
@@ -22,10 +22,7 @@ async def get_current_indexes_string() -> str:
 
 
 async def get_indexes() -> list[AsyncIndex] | None:
-    async with get_client() as client:
-        indexes = await client.get_indexes()
-
-    return indexes
+    return await index_store.get_indexes()
 
 
 def string_to_list(value: str | None) -> list[str] | None:
@@ -33,3 +30,23 @@ def string_to_list(value: str | None) -> list[str] | None:
         return [x.strip()[1:-1] for x in value[1:-1].split(",")]
 
     return None
+
+
+def format_bytes(value: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+
+    return f"{value:.1f} TB"
+
+
+def format_seconds(value: float) -> str:
+    minutes, seconds = divmod(int(value), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m {seconds}s"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+
+    return f"{seconds}s"
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from textual.app import RenderResult
+from textual.widgets import Static
+
+from meilisearch_tui.export import ExportProgress
+from meilisearch_tui.utils import format_bytes, format_seconds
+
+
+class ExportProgressPanel(Static):
+    DEFAULT_CSS = """
+    ExportProgressPanel {
+        height: auto;
+        padding: 1 0;
+    }
+    """
+
+    def __init__(self, *, id: str | None = None, classes: str | None = None) -> None:
+        super().__init__(id=id, classes=classes)
+        self.progress: ExportProgress | None = None
+
+    def on_mount(self) -> None:
+        self.set_interval(0.5, self.refresh)
+
+    def render(self) -> RenderResult:
+        progress = self.progress
+        if progress is None:
+            return ""
+
+        if progress.total_documents:
+            percent = min(progress.documents_written / progress.total_documents * 100, 100)
+            written = (
+                f"{progress.documents_written:,} / {progress.total_documents:,} ({percent:.0f}%)"
+            )
+        else:
+            written = f"{progress.documents_written:,}"
+
+        if progress.finished:
+            eta = f"done in {format_seconds(progress.elapsed)}"
+        elif progress.eta is not None:
+            eta = f"ETA {format_seconds(progress.eta)}"
+        else:
+            eta = "ETA calculating"
+
+        return "\n".join(
+            [
+                f"Documents: {written}",
+                f"Written: {format_bytes(progress.bytes_written)}",
+                f"Throughput: {progress.documents_per_second:,.0f} docs/s | {eta}",
+            ]
+        )
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from rich.cells import cell_len, chop_cells
+from rich.style import Style
+from rich.text import Text
+from textual import events
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+HIGHLIGHT_TAG = "***"
+SEPARATOR = "-------------------------------"
+
+
+class _Hit:
+    __slots__ = ("lines", "plain_lines", "key", "_height", "_height_width")
+
+    def __init__(self, hit: dict[str, Any]) -> None:
+        fields = hit["_formatted"] if hit.get("_formatted") else hit
+        self.lines = [f"{k}: {v}".replace("\n", " ") for k, v in fields.items()]
+        self.lines.append(SEPARATOR)
+        self.plain_lines = [line.replace(HIGHLIGHT_TAG, "") for line in self.lines]
+        self.key = hash(tuple(self.lines))
+        self._height = 0
+        self._height_width = 0
+
+    def height(self, width: int) -> int:
+        if self._height_width != width:
+            self._height = sum(max(1, -(-cell_len(line) // width)) for line in self.plain_lines)
+            self._height_width = width
+
+        return self._height
+
+
+class HitList(ScrollView, can_focus=True):
+    """Displays search hits, only building the lines that are scrolled into view.
+
+    Each hit is turned into strips the first time it becomes visible and the strips are cached by
+    the hit's content, so hits that appear again in a new result set are not rebuilt.
+    """
+
+    COMPONENT_CLASSES = {"hit-list--highlight"}
+
+    DEFAULT_CSS = """
+    HitList {
+        height: 1fr;
+        scrollbar-gutter: stable;
+    }
+    HitList > .hit-list--highlight {
+        color: $accent;
+        text-style: bold;
+    }
+    """
+
+    def __init__(
+        self,
+        *,
+        max_cached_hits: int = 500,
+        id: str | None = None,
+        classes: str | None = None,
+    ) -> None:
+        super().__init__(id=id, classes=classes)
+        self.max_cached_hits = max_cached_hits
+        self._hits: list[_Hit] = []
+        self._offsets: list[int] = []
+        self._layout_width = 0
+        self._strip_cache: OrderedDict[tuple[int, int], list[Strip]] = OrderedDict()
+
+    @property
+    def hit_count(self) -> int:
+        return len(self._hits)
+
+    def set_hits(self, hits: Iterable[dict[str, Any]]) -> None:
+        previous = self._hits
+        self._hits = [_Hit(hit) for hit in hits]
+        self._layout_hits()
+        self.scroll_home(animate=False)
+
+        # Hits that are the same in both result sets keep their lines, so only repaint from the
+        # first one that changed.
+        changed = 0
+        for old, new in zip(previous, self._hits):
+            if old.key != new.key:
+                break
+            changed += 1
+
+        if changed < len(self._hits):
+            first_line = self._offsets[changed]
+            self.refresh_lines(first_line, self.virtual_size.height - first_line)
+        elif len(previous) != len(self._hits):
+            self.refresh()
+
+    def append_hits(self, hits: Iterable[dict[str, Any]]) -> None:
+        start = len(self._hits)
+        self._hits.extend(_Hit(hit) for hit in hits)
+        if start == 0:
+            self._layout_hits()
+            self.refresh()
+            return
+
+        first_line = self.virtual_size.height
+        self._layout_hits(start)
+        self.refresh_lines(first_line, self.virtual_size.height - first_line)
+
+    def clear(self) -> None:
+        self._hits = []
+        self._offsets = []
+        self.virtual_size = Size(0, 0)
+        self.refresh()
+
+    def on_resize(self, event: events.Resize) -> None:
+        if self.size.width != self._layout_width:
+            # Strips are wrapped to the width, the ones built for the old width won't be used again.
+            self._strip_cache.clear()
+            self._layout_hits()
+            self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        line = scroll_y + y
+        width = self.size.width
+        rich_style = self.rich_style
+
+        if not self._hits or line >= self.virtual_size.height:
+            return Strip.blank(width, rich_style)
+
+        index = bisect_right(self._offsets, line) - 1
+        strips = self._get_strips(self._hits[index])
+
+        return strips[line - self._offsets[index]].crop_extend(
+            scroll_x, scroll_x + width, rich_style
+        )
+
+    def _layout_hits(self, start: int = 0) -> None:
+        width = max(self.size.width, 1)
+        if start == 0 or width != self._layout_width:
+            start = 0
+            self._offsets = []
+
+        total = self._offsets[-1] + self._hits[start - 1].height(width) if start else 0
+        for hit in self._hits[start:]:
+            self._offsets.append(total)
+            total += hit.height(width)
+
+        self._layout_width = width
+        self.virtual_size = Size(width, total)
+
+    def _get_strips(self, hit: _Hit) -> list[Strip]:
+        width = self._layout_width
+        cache_key = (hit.key, width)
+        strips = self._strip_cache.get(cache_key)
+        if strips is not None:
+            self._strip_cache.move_to_end(cache_key)
+            return strips
+
+        highlight_style = self.get_component_rich_style("hit-list--highlight", partial=True)
+        strips = []
+        for line, plain in zip(hit.lines, hit.plain_lines):
+            text = _highlight(line, highlight_style)
+            cuts = []
+            position = 0
+            for chunk in chop_cells(plain, width)[:-1]:
+                position += len(chunk)
+                cuts.append(position)
+            for part in text.divide(cuts) if cuts else [text]:
+                strips.append(Strip(part.render(self.app.console), part.cell_len))
+
+        height = hit.height(width)
+        if len(strips) < height:
+            strips.extend(Strip.blank(0) for _ in range(height - len(strips)))
+        del strips[height:]
+
+        self._strip_cache[cache_key] = strips
+        if len(self._strip_cache) > self.max_cached_hits:
+            self._strip_cache.popitem(last=False)
+
+        return strips
+
+
+def _highlight(line: str, style: Style) -> Text:
+    text = Text(no_wrap=True, end="")
+    for i, part in enumerate(line.split(HIGHLIGHT_TAG)):
+        text.append(part, style if i % 2 else None)
+
+    return text
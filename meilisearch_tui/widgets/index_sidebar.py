@@ -4,7 +4,7 @@ from meilisearch_python_sdk.errors import MeilisearchCommunicationError
 from textual.app import ComposeResult
 from textual.widgets import Label, ListItem, ListView
 
-from meilisearch_tui.client import get_client
+from meilisearch_tui.utils import get_indexes
 
 
 class IndexSidebar(ListView):
@@ -25,8 +25,7 @@ class IndexSidebar(ListView):
     async def update(self) -> None:
         await self.clear()
         try:
-            async with get_client() as client:
-                indexes = await client.get_indexes()
+            indexes = await get_indexes()
         except MeilisearchCommunicationError:
             await self.append(ListItem(Label("Error connecting to server")))
             self.indexes = []
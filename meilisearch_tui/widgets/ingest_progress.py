@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from rich.markup import escape
+from textual.app import RenderResult
+from textual.widgets import Static
+
+from meilisearch_tui.ingest import IngestProgress, MultiFileProgress
+from meilisearch_tui.utils import format_bytes, format_seconds
+
+MAX_FILES_SHOWN = 5
+
+
+class IngestProgressPanel(Static):
+    DEFAULT_CSS = """
+    IngestProgressPanel {
+        height: auto;
+        padding: 1 0;
+    }
+    """
+
+    def __init__(self, *, id: str | None = None, classes: str | None = None) -> None:
+        super().__init__(id=id, classes=classes)
+        self.progress: IngestProgress | None = None
+
+    def on_mount(self) -> None:
+        self.set_interval(0.5, self.refresh)
+
+    def render(self) -> RenderResult:
+        progress = self.progress
+        if progress is None:
+            return ""
+
+        if progress.total_bytes:
+            percent = min(progress.bytes_sent / progress.total_bytes * 100, 100)
+            sent = f"{format_bytes(progress.bytes_sent)} / {format_bytes(progress.total_bytes)} ({percent:.0f}%)"
+        else:
+            sent = format_bytes(progress.bytes_sent)
+
+        if progress.finished:
+            eta = f"done in {format_seconds(progress.elapsed)}"
+        elif progress.eta is not None:
+            eta = f"ETA {format_seconds(progress.eta)}"
+        else:
+            eta = "ETA calculating"
+
+        lines = [
+            f"Sent: {sent}",
+            f"Documents: {progress.documents_enqueued:,} enqueued | {progress.documents_indexed:,} indexed",
+            f"Throughput: {progress.documents_per_second:,.0f} docs/s | {eta}",
+            f"Tasks: {len(progress.task_statuses)} total | {len(progress.pending_task_uids)} pending | {len(progress.failed_tasks)} failed",
+        ]
+        if isinstance(progress, MultiFileProgress):
+            lines.append(f"Files: {progress.files_finished} / {len(progress.files)} finished")
+            active = [
+                (path, x) for path, x in progress.files.items() if x.bytes_sent and not x.finished
+            ]
+            for path, file_progress in active[:MAX_FILES_SHOWN]:
+                lines.append(
+                    f"  {escape(path.name)}: {format_bytes(file_progress.bytes_sent)} sent | "
+                    f"{file_progress.documents_enqueued:,} enqueued | "
+                    f"{file_progress.documents_indexed:,} indexed"
+                )
+            if len(active) > MAX_FILES_SHOWN:
+                lines.append(f"  and {len(active) - MAX_FILES_SHOWN} more")
+        for task in progress.failed_tasks[-5:]:
+            message = task.error.get("message") if task.error else "unknown error"
+            lines.append(f"[red]Task {task.uid} failed: {escape(str(message))}[/red]")
+
+        return "\n".join(lines)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from functools import cached_property
+
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import DataTable, Static
+
+from meilisearch_tui.metrics import request_metrics
+
+REFRESH_INTERVAL = 1.0
+
+
+class PerformanceOverlay(Vertical):
+    """Request latencies by endpoint and phase, drawn over the current screen."""
+
+    DEFAULT_CSS = """
+    PerformanceOverlay {
+        layer: overlay;
+        dock: right;
+        width: 90;
+        height: auto;
+        max-height: 70%;
+        background: $panel;
+        border: tall $secondary;
+    }
+    PerformanceOverlay > Static {
+        text-style: bold;
+        padding: 0 1;
+    }
+    PerformanceOverlay > DataTable {
+        height: auto;
+        max-height: 100%;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        yield Static("Request latency (ms)")
+        yield DataTable(show_cursor=False, zebra_stripes=True)
+
+    @cached_property
+    def table(self) -> DataTable:
+        return self.query_one(DataTable)
+
+    def on_mount(self) -> None:
+        self.table.add_columns("Endpoint", "Phase", "Count", "p50", "p95", "p99")
+        self.update_stats()
+        self.set_interval(REFRESH_INTERVAL, self.update_stats)
+
+    def update_stats(self) -> None:
+        # Overlays left behind on screens that aren't showing remove themselves once the overlay
+        # has been turned off.
+        if not getattr(self.app, "show_performance", False):
+            self.remove()
+            return
+
+        if self.screen is not self.app.screen:
+            return
+
+        self.table.clear()
+        previous = None
+        for endpoint, phase, count, p50, p95, p99 in request_metrics.summary():
+            self.table.add_row(
+                endpoint if endpoint != previous else "",
+                phase,
+                str(count),
+                f"{p50:.1f}",
+                f"{p95:.1f}",
+                f"{p99:.1f}",
+            )
+            previous = endpoint
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+from pathlib import Path
 
 from meilisearch_python_sdk import AsyncClient
 
+from meilisearch_tui.ingest import BatchSizer, add_documents_in_batches
+
 
 async def main() -> int:
     async with AsyncClient("http://127.0.0.1:7700", "masterKey") as client:
         index = client.index("movies")
-        result = await index.add_documents_from_file("datasets/small_movies.json")
-        await client.wait_for_task(result.task_uid)
+        tasks = await add_documents_in_batches(
+            index, Path("datasets/small_movies.json"), batch_size=BatchSizer(), concurrency=4
+        )
+        await asyncio.gather(*[client.wait_for_task(x.task_uid) for x in tasks])
 
     return 0
 
@@ -1,11 +1,19 @@
+import asyncio
 import json
 import os
+from contextlib import ExitStack
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
+import meilisearch_tui.main
+from benchmarks.fake_meilisearch import FakeMeilisearch, generate_documents
+from meilisearch_tui.cache import index_store, search_cache
+from meilisearch_tui.client import circuit_breakers, client_manager
 from meilisearch_tui.config import Config, load_config
+from meilisearch_tui.main import MeilisearchApp
+from meilisearch_tui.metrics import request_metrics
 
 BASE_URL = "http://127.0.0.1:7700"
 MASTER_KEY = "masterKey"
@@ -17,6 +25,16 @@ def clear_lru_cache():
     load_config.cache_clear()
 
 
+@pytest.fixture(autouse=True)
+async def close_shared_client():
+    yield
+    await client_manager.close()
+    circuit_breakers.reset()
+    request_metrics.reset()
+    index_store.invalidate()
+    search_cache.invalidate()
+
+
 @pytest.fixture(autouse=True, scope="session")
 def dont_write_to_home_config_directory():
     """Makes sure a default directory is specified for config so that the home directory is not
@@ -58,6 +76,38 @@ def mock_config(mock_config_dir):
     return load_config(config_dir=mock_config_dir)
 
 
+@pytest.fixture
+def fake_meilisearch():
+    """Starts a FakeMeilisearch with the arguments it is called with, stopped after the test."""
+    with ExitStack() as stack:
+        yield lambda **kwargs: stack.enter_context(FakeMeilisearch(**kwargs))
+
+
+@pytest.fixture
+def fake_server(fake_meilisearch, monkeypatch):
+    """A FakeMeilisearch with a movies index of 30 documents that the config points to."""
+    fake = fake_meilisearch(task_duration=0.01)
+    fake.add_documents("movies", generate_documents(30))
+    monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+    return fake
+
+
+class App(MeilisearchApp):
+    """The app with its stylesheet found next to the package, so tests can run from anywhere."""
+
+    CSS_PATH = str(Path(meilisearch_tui.main.__file__).parent / "meilisearch.css")
+
+
+async def wait_until(pilot, predicate, timeout=10.0):
+    """Let the app under test run until `predicate` is true, failing after `timeout` seconds."""
+
+    async def wait():
+        while not predicate():
+            await pilot.pause(0.05)
+
+    await asyncio.wait_for(wait(), timeout)
+
+
 @pytest.fixture
 def env_vars():
     with patch.dict(
@@ -0,0 +1,86 @@
+import pytest
+from meilisearch_python_sdk import AsyncClient
+
+from benchmarks.fake_meilisearch import generate_documents
+from benchmarks.run import compare_to_baseline, over_budget, percentile, run_benchmarks
+
+
+async def test_fake_server_search(fake_meilisearch):
+    fake = fake_meilisearch(master_key="fakeKey")
+    fake.add_documents("movies", generate_documents(50))
+    query = generate_documents(1, start=7)[0]["title"].split()[0]
+
+    async with AsyncClient(fake.url, "fakeKey") as client:
+        indexes = await client.get_indexes()
+        results = await client.index("movies").search(
+            query,
+            limit=5,
+            attributes_to_highlight=["*"],
+            highlight_pre_tag="***",
+            highlight_post_tag="***",
+        )
+
+    assert indexes
+    assert [x.uid for x in indexes] == ["movies"]
+    assert 0 < len(results.hits) <= 5
+    assert results.estimated_total_hits
+    assert results.estimated_total_hits >= len(results.hits)
+    assert f"***{query}***" in results.hits[0]["_formatted"]["title"]
+
+
+async def test_fake_server_documents_and_tasks(fake_meilisearch):
+    fake = fake_meilisearch(master_key="fakeKey")
+    async with AsyncClient(fake.url, "fakeKey") as client:
+        index = client.index("movies")
+        task = await index.add_documents(generate_documents(10))
+        result = await client.wait_for_task(task.task_uid)
+        documents = await index.get_documents(limit=3)
+
+    assert result.status == "succeeded"
+    assert result.details
+    assert result.details["indexedDocuments"] == 10
+    assert documents.total == 10
+    assert len(documents.results) == 3
+
+
+async def test_fake_server_rejects_bad_key(fake_meilisearch):
+    fake = fake_meilisearch(master_key="fakeKey")
+    async with AsyncClient(fake.url, "wrong") as client:
+        with pytest.raises(Exception, match="invalid"):
+            await client.get_indexes()
+
+
+def test_percentile():
+    values = [float(x) for x in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([], 50) == 0
+
+
+def test_compare_to_baseline():
+    baseline = {"keystroke_to_render_p50_ms": 100.0, "ingest_documents_per_second": 1000.0}
+
+    assert not compare_to_baseline(
+        {"keystroke_to_render_p50_ms": 110.0, "ingest_documents_per_second": 900.0}, baseline, 0.2
+    )
+    assert compare_to_baseline(
+        {"keystroke_to_render_p50_ms": 130.0, "ingest_documents_per_second": 700.0}, baseline, 0.2
+    ) == ["keystroke_to_render_p50_ms", "ingest_documents_per_second"]
+
+
+def test_over_budget():
+    assert not over_budget({"import_ms": 250.0, "first_frame_ms": None})
+    assert over_budget({"import_ms": 1500.0, "first_frame_ms": 200.0}) == ["import_ms"]
+
+
+async def test_run_benchmarks():
+    results = await run_benchmarks(documents=200, queries=2, switches=1)
+
+    metrics = results["metrics"]
+    assert metrics["keystroke_to_render_p50_ms"] > 0
+    assert metrics["screen_switch_p50_ms"] > 0
+    assert metrics["ingest_compression_ratio"] > 1
+    assert metrics["ingest_compressed_speedup"] > 0
+    assert metrics["ingest_documents_per_second"] > 0
+    assert results["settings"]["documents"] == 200
@@ -0,0 +1,106 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from meilisearch_tui.cache import IndexStore, SearchCache, SearchCacheKey
+
+
+def test_search_cache_get_set():
+    cache = SearchCache()
+    key = SearchCacheKey("movies", "test", 20, 0)
+    cache.set(key, "results")  # type: ignore[arg-type]
+
+    assert cache.get(key) == "results"
+    assert cache.get(SearchCacheKey("movies", "test", 20, 20)) is None
+
+
+def test_search_cache_hybrid_key():
+    cache = SearchCache()
+    cache.set(SearchCacheKey("movies", "test", 20, 0, 0.5, "default"), "hybrid")  # type: ignore[arg-type]
+
+    assert cache.get(SearchCacheKey("movies", "test", 20, 0)) is None
+    assert cache.get(SearchCacheKey("movies", "test", 20, 0, 0.9, "default")) is None
+    assert cache.get(SearchCacheKey("movies", "test", 20, 0, 0.5, "default")) == "hybrid"
+
+
+def test_search_cache_evicts_least_recently_used():
+    cache = SearchCache(maxsize=2)
+    first = SearchCacheKey("movies", "a", 20, 0)
+    second = SearchCacheKey("movies", "b", 20, 0)
+    third = SearchCacheKey("movies", "c", 20, 0)
+    cache.set(first, "a")  # type: ignore[arg-type]
+    cache.set(second, "b")  # type: ignore[arg-type]
+    cache.get(first)
+    cache.set(third, "c")  # type: ignore[arg-type]
+
+    assert len(cache) == 2
+    assert cache.get(first) == "a"
+    assert cache.get(second) is None
+
+
+def test_search_cache_ttl():
+    cache = SearchCache(ttl=10)
+    key = SearchCacheKey("movies", "test", 20, 0)
+    with patch("meilisearch_tui.cache.time.monotonic", return_value=100):
+        cache.set(key, "results")  # type: ignore[arg-type]
+    with patch("meilisearch_tui.cache.time.monotonic", return_value=105):
+        assert cache.get(key) == "results"
+    with patch("meilisearch_tui.cache.time.monotonic", return_value=111):
+        assert cache.get(key) is None
+
+    assert len(cache) == 0
+
+
+def test_search_cache_invalidate_index():
+    cache = SearchCache()
+    movies = SearchCacheKey("movies", "test", 20, 0)
+    books = SearchCacheKey("books", "test", 20, 0)
+    cache.set(movies, "movies")  # type: ignore[arg-type]
+    cache.set(books, "books")  # type: ignore[arg-type]
+    cache.invalidate("movies")
+
+    assert cache.get(movies) is None
+    assert cache.get(books) == "books"
+
+    cache.invalidate()
+
+    assert len(cache) == 0
+
+
+async def test_index_store_single_flight():
+    calls = 0
+
+    async def fetch(self):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["movies"]
+
+    store = IndexStore()
+    with patch.object(IndexStore, "_fetch", fetch):
+        results = await asyncio.gather(*[store.get_indexes() for _ in range(5)])
+
+    assert calls == 1
+    assert results == [["movies"]] * 5
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_index_store_reuses_fresh_results():
+    store = IndexStore(max_age=60)
+    with patch("meilisearch_python_sdk.AsyncClient.get_indexes", return_value=None) as mock:
+        await store.get_indexes()
+        await store.get_indexes()
+
+    assert mock.call_count == 1
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_index_store_invalidate():
+    store = IndexStore(max_age=60)
+    with patch("meilisearch_python_sdk.AsyncClient.get_indexes", return_value=None) as mock:
+        await store.get_indexes()
+        store.invalidate()
+        await store.get_indexes()
+
+    assert mock.call_count == 2
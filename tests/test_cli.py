@@ -0,0 +1,117 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from typer.testing import CliRunner
+
+from benchmarks.fake_meilisearch import FakeMeilisearch, generate_documents
+from meilisearch_tui.cli import typer_app
+
+runner = CliRunner()
+
+
+def _records(result):
+    assert result.exit_code == 0, result.output
+    return [json.loads(x) for x in result.stdout.splitlines()]
+
+
+@pytest.mark.usefixtures("mock_config")
+def test_search(fake_server):
+    records = _records(runner.invoke(typer_app, ["search", "movies", "", "--limit", "25"]))
+
+    assert [x["id"] for x in records] == list(range(25))
+    assert fake_server.requests.count(("POST", "/indexes/movies/search")) == 1
+
+
+@pytest.mark.usefixtures("mock_config")
+def test_export(fake_server):
+    records = _records(runner.invoke(typer_app, ["export", "movies", "--batch-size", "7"]))
+
+    assert [x["id"] for x in records] == list(range(30))
+    assert fake_server.requests.count(("GET", "/indexes/movies/documents")) == 5
+
+
+@pytest.mark.usefixtures("mock_config", "fake_server")
+def test_stats():
+    records = _records(runner.invoke(typer_app, ["stats"]))
+
+    assert [(x["uid"], x["numberOfDocuments"]) for x in records] == [("movies", 30)]
+
+
+@pytest.mark.usefixtures("mock_config", "fake_server")
+def test_load_and_tasks(tmp_path):
+    path = tmp_path / "documents.ndjson"
+    with open(path, "w") as f:
+        for document in generate_documents(50):
+            f.write(f"{json.dumps(document)}\n")
+
+    records = _records(runner.invoke(typer_app, ["load", "books", str(path)]))
+
+    assert [(x["status"], x["indexUid"]) for x in records] == [
+        ("enqueued", "books"),
+        ("succeeded", "books"),
+    ]
+    assert records[0]["documentCount"] == 50
+
+    tasks = _records(runner.invoke(typer_app, ["tasks", "--index", "books", "--limit", "5"]))
+    assert [x["uid"] for x in tasks] == [records[0]["taskUid"]]
+
+
+@pytest.mark.usefixtures("mock_config", "fake_server")
+def test_errors_go_to_stderr():
+    result = runner.invoke(typer_app, ["stats", "missing"])
+
+    assert result.exit_code == 1
+    assert not result.stdout
+    assert "Index `missing` not found" in result.stderr
+
+
+def test_commands_do_not_import_textual(tmp_path):
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", generate_documents(5))
+        code = (
+            "import sys\n"
+            "from meilisearch_tui.cli import typer_app\n"
+            "try:\n"
+            "    typer_app(['search', 'movies'])\n"
+            "finally:\n"
+            "    sys.stderr.write(str(sorted(x for x in sys.modules if x.startswith('textual'))))\n"
+        )
+        env = {**os.environ, "MEILI_HTTP_ADDR": fake.url, "XDG_CONFIG_HOME": str(tmp_path)}
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, env=env, text=True
+        )
+
+    assert len(result.stdout.splitlines()) == 5
+    assert result.stderr == "[]"
+
+
+@pytest.mark.usefixtures("mock_config", "fake_server")
+def test_migrate():
+    with FakeMeilisearch() as target:
+        records = _records(
+            runner.invoke(typer_app, ["migrate", "movies", "--to", target.url, "--batch-size", "8"])
+        )
+
+        assert records == [
+            {"index": "movies", "targetIndex": "movies", "resumedFrom": 0, "documentsCopied": 30}
+        ]
+        assert len(target.indexes["movies"].documents) == 30
+
+
+@pytest.mark.usefixtures("mock_config", "fake_server")
+def test_load_sync(tmp_path):
+    path = tmp_path / "documents.ndjson"
+    with open(path, "w") as f:
+        for document in generate_documents(40):
+            f.write(f"{json.dumps(document)}\n")
+
+    first = _records(runner.invoke(typer_app, ["load", "books", str(path), "--sync"]))
+    second = _records(runner.invoke(typer_app, ["load", "books", str(path), "--sync"]))
+
+    assert first[-1]["documentsSent"] == 40
+    assert second == [
+        {"documentsSent": 0, "documentsUnchanged": 40, "documentsDeleted": 0, "failedTasks": 0}
+    ]
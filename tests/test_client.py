@@ -1,7 +1,52 @@
+import asyncio
+from unittest.mock import patch
+
 import pytest
+from httpx import Request, Response
+from meilisearch_python_sdk.errors import (
+    MeilisearchApiError,
+    MeilisearchCommunicationError,
+    MeilisearchTimeoutError,
+)
+
+from meilisearch_tui.client import (
+    BreakerState,
+    CircuitBreaker,
+    backoff_delay,
+    circuit_breakers,
+    client_manager,
+    get_client,
+    run_request,
+)
+from meilisearch_tui.config import load_config
+from meilisearch_tui.errors import CircuitOpenError, NoMeilisearchUrlError
+
+
+@pytest.fixture
+def no_backoff():
+    with patch("meilisearch_tui.client.backoff_delay", return_value=0):
+        yield
+
+
+class FlakyRequest:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def _breaker():
+    return circuit_breakers.get(load_config().meilisearch_url or "")
 
-from meilisearch_tui.client import get_client
-from meilisearch_tui.errors import NoMeilisearchUrlError
+
+def _api_error(status_code):
+    response = Response(status_code, json={"message": "error"}, request=Request("GET", "http://x"))
+    return MeilisearchApiError("error", response)
 
 
 async def test_get_client_no_config(mock_config):
@@ -10,3 +55,207 @@ async def test_get_client_no_config(mock_config):
     with pytest.raises(NoMeilisearchUrlError):
         async with get_client():
             pass
+
+
+async def test_get_client_reuses_client(mock_config):
+    async with get_client() as first:
+        pass
+    async with get_client() as second:
+        pass
+
+    assert first is second
+    assert client_manager.is_open
+
+
+async def test_get_client_rebuilds_on_config_change(mock_config):
+    async with get_client() as first:
+        pass
+
+    load_config().master_key = "newKey"
+    async with get_client() as second:
+        pass
+
+    assert first is not second
+    assert first.http_client.is_closed
+
+
+async def test_client_manager_reset(mock_config):
+    async with get_client() as client:
+        pass
+
+    await client_manager.reset()
+
+    assert not client_manager.is_open
+    assert client.http_client.is_closed
+
+
+async def test_get_client_uses_configured_timeout(mock_config):
+    mock_config.timeout = 7
+    mock_config.save()
+
+    async with get_client() as client:
+        assert client.http_client.timeout.read == 7
+
+
+@pytest.mark.usefixtures("mock_config", "no_backoff")
+async def test_run_request_retries_idempotent_requests():
+    request = FlakyRequest([MeilisearchCommunicationError("down"), _api_error(503)])
+
+    assert await run_request("search", request) == "ok"
+    assert request.calls == 3
+    assert _breaker().state == BreakerState.CLOSED
+    assert _breaker().failures == 0
+
+
+@pytest.mark.usefixtures("mock_config", "no_backoff")
+async def test_run_request_gives_up_after_max_retries():
+    load_config().max_retries = 2
+    request = FlakyRequest([MeilisearchCommunicationError("down")] * 5)
+
+    with pytest.raises(MeilisearchCommunicationError):
+        await run_request("search", request)
+
+    assert request.calls == 3
+
+
+@pytest.mark.usefixtures("mock_config", "no_backoff")
+async def test_run_request_does_not_retry_non_idempotent_requests():
+    request = FlakyRequest([MeilisearchCommunicationError("down")])
+
+    with pytest.raises(MeilisearchCommunicationError):
+        await run_request("upload", request, idempotent=False)
+
+    assert request.calls == 1
+
+
+@pytest.mark.usefixtures("mock_config", "no_backoff")
+async def test_run_request_does_not_retry_client_errors():
+    request = FlakyRequest([_api_error(400), _api_error(400)])
+
+    with pytest.raises(MeilisearchApiError):
+        await run_request("search", request)
+
+    assert request.calls == 1
+    assert _breaker().failures == 0
+
+
+@pytest.mark.usefixtures("mock_config", "no_backoff")
+async def test_run_request_operation_timeout():
+    config = load_config()
+    config.search_timeout = 0.01
+    config.max_retries = 0
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(MeilisearchTimeoutError):
+        await run_request("search", slow)
+
+
+@pytest.mark.usefixtures("mock_config", "no_backoff")
+async def test_run_request_stops_when_breaker_opens():
+    load_config().max_retries = 10
+    request = FlakyRequest([MeilisearchCommunicationError("down")] * 20)
+
+    with pytest.raises(MeilisearchCommunicationError):
+        await run_request("search", request)
+    assert request.calls == _breaker().failure_threshold
+    assert _breaker().state == BreakerState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        await run_request("search", request)
+    assert request.calls == _breaker().failure_threshold
+
+
+def test_circuit_breaker_half_open():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    states: list[BreakerState] = []
+    breaker.listeners.append(states.append)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_success()
+
+    assert states == [
+        BreakerState.OPEN,
+        BreakerState.HALF_OPEN,
+        BreakerState.OPEN,
+        BreakerState.HALF_OPEN,
+        BreakerState.CLOSED,
+    ]
+
+
+def test_circuit_breaker_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    # A probe that ends without an answer, for example because it was cancelled, makes way for
+    # another one.
+    breaker.probe_finished()
+    assert breaker.before_request()
+    breaker.record_success()
+    assert not breaker.before_request()
+    assert not breaker.before_request()
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_run_request_sends_one_probe_when_half_open(monkeypatch):
+    breaker = _breaker()
+    monkeypatch.setattr(breaker, "reset_timeout", 0)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    probe_started = asyncio.Event()
+    finish_probe = asyncio.Event()
+
+    async def probe():
+        probe_started.set()
+        await finish_probe.wait()
+        return "ok"
+
+    task = asyncio.ensure_future(run_request("search", probe))
+    await probe_started.wait()
+    with pytest.raises(CircuitOpenError):
+        await run_request("search", FlakyRequest([]))
+
+    finish_probe.set()
+    assert await task == "ok"
+    assert breaker.state == BreakerState.CLOSED
+    assert await run_request("search", FlakyRequest([])) == "ok"
+
+
+@pytest.mark.usefixtures("mock_config", "no_backoff")
+async def test_run_request_breakers_are_per_server():
+    load_config().max_retries = 10
+    request = FlakyRequest([MeilisearchCommunicationError("down")] * 20)
+
+    with pytest.raises(MeilisearchCommunicationError):
+        await run_request("upload", request, url="http://other:7700/")
+
+    assert circuit_breakers.get("http://other:7700").state == BreakerState.OPEN
+    assert _breaker().state == BreakerState.CLOSED
+    assert await run_request("search", FlakyRequest([])) == "ok"
+
+
+def test_circuit_breaker_rejects_while_open():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.reset()
+    breaker.before_request()
+    assert breaker.state == BreakerState.CLOSED
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 5, 20])
+def test_backoff_delay(attempt):
+    for _ in range(100):
+        assert 0 <= backoff_delay(attempt, base=0.25, cap=5.0) <= min(5.0, 0.25 * 2**attempt)
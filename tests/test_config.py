@@ -68,3 +68,34 @@ def test_delete_config(mock_config_dir):
     settings_files = mock_config_dir / "settings.json"
 
     assert settings_files.exists() is False
+
+
+@pytest.mark.usefixtures("mock_config")
+def test_save_search_settings(mock_config_dir):
+    config = load_config(config_dir=mock_config_dir)
+    config.search_debounce_ms = 300
+    config.max_concurrent_searches = 4
+    config.save()
+    load_config.cache_clear()
+    updated = load_config(config_dir=mock_config_dir)
+    assert updated.search_debounce_ms == 300
+    assert updated.max_concurrent_searches == 4
+
+
+@pytest.mark.usefixtures("mock_config")
+def test_save_request_settings(mock_config_dir):
+    config = load_config(config_dir=mock_config_dir)
+    config.search_timeout = 2.5
+    config.upload_timeout = None
+    config.max_retries = 0
+    config.upload_compression = "gzip"
+    config.upload_compression_level = 3
+    config.save()
+    load_config.cache_clear()
+    updated = load_config(config_dir=mock_config_dir)
+
+    assert updated.search_timeout == 2.5
+    assert updated.upload_timeout is None
+    assert updated.max_retries == 0
+    assert updated.upload_compression == "gzip"
+    assert updated.upload_compression_level == 3
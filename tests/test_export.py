@@ -0,0 +1,114 @@
+import asyncio
+import gzip
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from meilisearch_python_sdk import AsyncClient
+from meilisearch_python_sdk.errors import MeilisearchApiError
+from meilisearch_python_sdk.models.documents import DocumentsInfo
+
+from benchmarks.fake_meilisearch import FakeMeilisearch, generate_documents
+from meilisearch_tui.client import circuit_breakers, get_client
+from meilisearch_tui.config import load_config
+from meilisearch_tui.export import ExportProgress, export_documents, export_to_file
+
+
+class SlowIndex:
+    """Later pages come back first so the export has to put them back in order."""
+
+    def __init__(self, count):
+        self.documents = [{"id": x} for x in range(count)]
+        self.http_client = SimpleNamespace(base_url="http://slow-index")
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.offsets = []
+
+    async def get_documents(self, *, offset, limit, fields=None):
+        self.offsets.append(offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05 / (1 + offset / limit))
+        self.in_flight -= 1
+        return DocumentsInfo(
+            results=self.documents[offset : offset + limit],
+            offset=offset,
+            limit=limit,
+            total=len(self.documents),
+        )
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_export_documents_in_order_with_bounded_window():
+    index = SlowIndex(1050)
+    output = io.BytesIO()
+    progress = ExportProgress()
+
+    written = await export_documents(
+        index,  # type: ignore[arg-type]
+        output,
+        batch_size=50,
+        concurrency=4,
+        progress=progress,
+    )
+
+    documents = [json.loads(x) for x in output.getvalue().splitlines()]
+    assert written == 1050
+    assert [x["id"] for x in documents] == list(range(1050))
+    assert sorted(index.offsets) == list(range(0, 1050, 50))
+    assert index.max_in_flight <= 4
+    assert progress.finished
+    assert progress.total_documents == progress.documents_written == 1050
+    assert progress.bytes_written == len(output.getvalue())
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_export_empty_index():
+    output = io.BytesIO()
+
+    assert await export_documents(SlowIndex(0), output) == 0  # type: ignore[arg-type]
+    assert output.getvalue() == b""
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_export_to_gzip_file(tmp_path, monkeypatch):
+    path = tmp_path / "exports" / "movies.ndjson.gz"
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", generate_documents(120))
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        async with get_client() as client:
+            written = await export_to_file(client.index("movies"), path, batch_size=25)
+
+    with gzip.open(path) as f:
+        documents = [json.loads(x) for x in f]
+    assert written == 120
+    assert documents == generate_documents(120)
+    assert list(path.parent.iterdir()) == [path]
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_failed_export_leaves_no_file(tmp_path, monkeypatch):
+    path = tmp_path / "exports" / "missing.ndjson"
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        async with get_client() as client:
+            with pytest.raises(MeilisearchApiError):
+                await export_to_file(client.index("missing"), path)
+
+    assert not list(path.parent.iterdir())
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_export_uses_the_breaker_of_the_index_server():
+    configured = circuit_breakers.get(load_config().meilisearch_url or "")
+    for _ in range(configured.failure_threshold):
+        configured.record_failure()
+    output = io.BytesIO()
+
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", generate_documents(30))
+        async with AsyncClient(fake.url) as client:
+            written = await export_documents(client.index("movies"), output, batch_size=10)
+
+    assert written == 30
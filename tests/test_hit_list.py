@@ -0,0 +1,110 @@
+from textual.app import App, ComposeResult
+
+from meilisearch_tui.widgets.hit_list import SEPARATOR, HitList
+
+HITS = [
+    {"id": 1, "title": "Carol"},
+    {"id": 2, "title": "Wonder Woman 1984"},
+    {"id": 3, "title": "Life of Pi"},
+]
+
+
+class HitListApp(App):
+    def __init__(self, max_cached_hits=500):
+        super().__init__()
+        self.max_cached_hits = max_cached_hits
+
+    def compose(self) -> ComposeResult:
+        yield HitList(max_cached_hits=self.max_cached_hits)
+
+
+def _lines(hit_list):
+    return [hit_list.render_line(y).text.rstrip() for y in range(hit_list.size.height)]
+
+
+async def test_hit_list_render_line():
+    app = HitListApp()
+    async with app.run_test(size=(40, 6)) as pilot:
+        hit_list = app.query_one(HitList)
+        hit_list.set_hits(HITS)
+        await pilot.pause()
+
+        assert hit_list.virtual_size.height == 9
+        assert _lines(hit_list) == [
+            "id: 1",
+            "title: Carol",
+            SEPARATOR,
+            "id: 2",
+            "title: Wonder Woman 1984",
+            SEPARATOR,
+        ]
+
+        hit_list.scroll_to(y=4, animate=False)
+        await pilot.pause()
+        assert _lines(hit_list)[:4] == [
+            "title: Wonder Woman 1984",
+            SEPARATOR,
+            "id: 3",
+            "title: Life of Pi",
+        ]
+        # Past the last hit the lines are blank.
+        assert hit_list.render_line(5).text.strip() == ""
+
+
+async def test_hit_list_strip_cache_eviction():
+    app = HitListApp(max_cached_hits=2)
+    async with app.run_test(size=(40, 9)) as pilot:
+        hit_list = app.query_one(HitList)
+        hit_list.set_hits(HITS)
+        await pilot.pause()
+        _lines(hit_list)
+
+        # The first hit was the least recently rendered.
+        first, second, third = (x.key for x in hit_list._hits)
+        assert [key for key, _ in hit_list._strip_cache] == [second, third]
+
+        hit_list.render_line(0)
+        assert [key for key, _ in hit_list._strip_cache] == [third, first]
+
+
+async def test_hit_list_resize():
+    app = HitListApp()
+    async with app.run_test(size=(40, 9)) as pilot:
+        hit_list = app.query_one(HitList)
+        hit_list.set_hits(HITS)
+        await pilot.pause()
+        _lines(hit_list)
+        assert hit_list.virtual_size.height == 9
+
+        hit_list.styles.width = 12
+        await pilot.pause()
+
+        # Every separator now takes 3 lines and the two longer titles 2.
+        assert hit_list.size.width == 12
+        assert hit_list.virtual_size.height == 17
+        assert all(key[1] == 12 for key in hit_list._strip_cache)
+        assert _lines(hit_list)[:6] == [
+            "id: 1",
+            "title: Carol",
+            "-" * 12,
+            "-" * 12,
+            "-" * 7,
+            "id: 2",
+        ]
+
+
+async def test_hit_list_append_hits():
+    app = HitListApp()
+    async with app.run_test(size=(40, 9)) as pilot:
+        hit_list = app.query_one(HitList)
+        hit_list.set_hits(HITS[:1])
+        await pilot.pause()
+        assert hit_list.virtual_size.height == 3
+
+        hit_list.append_hits(HITS[1:])
+        await pilot.pause()
+
+        assert hit_list.hit_count == 3
+        assert hit_list._offsets == [0, 3, 6]
+        assert hit_list.virtual_size.height == 9
+        assert _lines(hit_list)[6:] == ["id: 3", "title: Life of Pi", SEPARATOR]
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from benchmarks.fake_meilisearch import FakeMeilisearch, generate_documents
+from meilisearch_tui.screens.indexes import IndexScreen
+from tests.conftest import App, wait_until
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_load_data_reports_failed_tasks(monkeypatch, tmp_path):
+    path = tmp_path / "documents.ndjson"
+    path.write_text("".join(f"{json.dumps(x)}\n" for x in generate_documents(10)))
+
+    with FakeMeilisearch(task_duration=60) as fake:
+        fake.add_documents("movies", generate_documents(1))
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        app = App()
+        async with app.run_test() as pilot:
+            await app.switch_screen("index")
+            screen = app.screen
+            assert isinstance(screen, IndexScreen)
+            data_load = screen.data_load
+            await wait_until(pilot, lambda: data_load.selected_index == "movies")
+
+            data_load.load_data("movies", str(path))
+            await wait_until(pilot, lambda: fake.tasks)
+            # The upload is done but the task hasn't been indexed, nothing should claim success.
+            await pilot.pause(0.3)
+            assert not data_load.data_load_successful.visible
+
+            fake.tasks[0].update(status="failed", error={"message": "bad document"})
+            await wait_until(pilot, lambda: data_load.data_load_error.visible)
+
+            assert not data_load.data_load_successful.visible
+            assert str(data_load.data_load_error.renderable) == "Tasks 0 failed"
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_load_data_expands_paths_in_the_worker(monkeypatch, tmp_path):
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", generate_documents(1))
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        app = App()
+        async with app.run_test() as pilot:
+            await app.switch_screen("index")
+            screen = app.screen
+            assert isinstance(screen, IndexScreen)
+            data_load = screen.data_load
+            await wait_until(pilot, lambda: data_load.selected_index == "movies")
+
+            data_load.load_data("movies", str(tmp_path / "*.ndjson"))
+            await wait_until(pilot, lambda: data_load.data_load_error.visible)
+
+            assert data_load.data_file_error.visible
+            assert "No json, jsonl, ndjson, or csv files found" in str(
+                data_load.data_load_error.renderable
+            )
+            assert ("POST", "/indexes/movies/documents") not in fake.requests
@@ -0,0 +1,710 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from meilisearch_python_sdk.errors import MeilisearchCommunicationError
+from meilisearch_python_sdk.models.task import TaskInfo, TaskResult, TaskStatus
+
+from benchmarks.fake_meilisearch import FakeMeilisearch
+from meilisearch_tui import ingest
+from meilisearch_tui.client import get_client
+from meilisearch_tui.ingest import (
+    BatchSizer,
+    DocumentBatch,
+    IngestCheckpoint,
+    IngestProgress,
+    MultiFileProgress,
+    add_documents_in_batches,
+    add_files_in_batches,
+    expand_paths,
+    iter_batches,
+    parse_pool,
+    watch_progress,
+)
+
+DOCUMENTS = [
+    {"id": 1, "title": "Carol", "genres": ["Romance", "Drama"]},
+    {"id": 2, "title": "Wonder [Woman] {1984}", "overview": 'Line "one"\nline two'},
+    {"id": 3, "title": "Life of Pi ü ☃", "nested": {"a": [1, 2, {"b": "}"}]}},
+    {"id": 4, "title": "Mad Max"},
+    {"id": 5, "title": "Moana"},
+]
+
+
+def _read_documents(batches):
+    documents: list[dict] = []
+    for batch in batches:
+        lines = batch.payload.decode("utf-8").splitlines()
+        assert len(lines) == batch.document_count
+        documents.extend(json.loads(line) for line in lines)
+    return documents
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1024 * 1024])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_batches_json(chunk_size, indent, tmp_path):
+    path = tmp_path / "documents.json"
+    path.write_text(json.dumps(DOCUMENTS, indent=indent, ensure_ascii=False), encoding="utf-8")
+
+    with patch("meilisearch_tui.ingest.READ_CHUNK_SIZE", chunk_size):
+        batches = list(iter_batches(path, batch_size=2))
+
+    assert [x.document_count for x in batches] == [2, 2, 1]
+    assert {x.content_type for x in batches} == {"application/x-ndjson"}
+    assert _read_documents(batches) == DOCUMENTS
+
+
+def test_iter_batches_json_offsets(tmp_path):
+    path = tmp_path / "documents.json"
+    raw = json.dumps(DOCUMENTS, ensure_ascii=False).encode("utf-8")
+    path.write_bytes(raw)
+
+    batches = list(iter_batches(path, batch_size=2))
+
+    assert batches[0].start == 0
+    assert batches[1].start == batches[0].end
+    assert json.loads(b"[" + raw[batches[1].end :].lstrip(b", ")) == DOCUMENTS[4:]
+
+
+@pytest.mark.parametrize("contents", ['{"id": 1}', "[1, 2]", '[{"id": 1}'])
+def test_iter_batches_json_invalid(contents, tmp_path):
+    path = tmp_path / "documents.json"
+    path.write_text(contents)
+
+    with pytest.raises(ValueError):
+        list(iter_batches(path))
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".ndjson"])
+def test_iter_batches_ndjson(suffix, tmp_path):
+    path = tmp_path / f"documents{suffix}"
+    path.write_text("\n".join(json.dumps(x) for x in DOCUMENTS) + "\n\n", encoding="utf-8")
+
+    batches = list(iter_batches(path, batch_size=3))
+
+    assert [x.document_count for x in batches] == [3, 2]
+    assert batches[-1].end == path.stat().st_size - 1
+    assert _read_documents(batches) == DOCUMENTS
+
+
+def test_iter_batches_csv(tmp_path):
+    path = tmp_path / "documents.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "overview"])
+        for document in DOCUMENTS:
+            writer.writerow([document["id"], document["title"], document.get("overview", "")])
+
+    batches = list(iter_batches(path, batch_size=2))
+
+    assert [x.document_count for x in batches] == [2, 2, 1]
+    rows: list[dict] = []
+    for batch in batches:
+        assert batch.content_type == "text/csv"
+        reader = csv.DictReader(io.StringIO(batch.payload.decode("utf-8")))
+        rows.extend(reader)
+    assert [x["title"] for x in rows] == [x["title"] for x in DOCUMENTS]
+    assert rows[1]["overview"] == 'Line "one"\nline two'
+
+
+@pytest.mark.parametrize("suffix", [".json", ".ndjson", ".csv"])
+def test_iter_batches_resume(suffix, tmp_path):
+    path = tmp_path / f"documents{suffix}"
+    if suffix == ".json":
+        path.write_text(json.dumps(DOCUMENTS, indent=2), encoding="utf-8")
+    elif suffix == ".ndjson":
+        path.write_text("\n".join(json.dumps(x) for x in DOCUMENTS) + "\n", encoding="utf-8")
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "title"])
+            writer.writerows([x["id"], x["title"]] for x in DOCUMENTS)
+
+    batches = list(iter_batches(path, batch_size=2))
+
+    assert batches[0].start == 0
+    assert list(iter_batches(path, batch_size=2, start=batches[0].end)) == batches[1:]
+    assert list(iter_batches(path, batch_size=2, start=batches[-1].end)) == []
+
+
+def test_iter_batches_compacts_json(tmp_path):
+    path = tmp_path / "documents.json"
+    path.write_text(json.dumps(DOCUMENTS[:1], indent=2), encoding="utf-8")
+
+    batches = list(iter_batches(path))
+
+    assert batches[0].payload == b'{"id":1,"title":"Carol","genres":["Romance","Drama"]}\n'
+
+
+@pytest.mark.parametrize(
+    "name, contents, message",
+    [
+        ("documents.ndjson", '{"id": 1}\n{"id": 2\n', "ending at byte 19 is not valid JSON"),
+        ("documents.ndjson", '{"id": 1}\n[1, 2]\n', "ending at byte 17 is not a JSON object"),
+        ("documents.ndjson", '{"id": NaN}\n', "ending at byte 12 is not valid JSON"),
+        ("documents.csv", "id,title\n1,Carol\n2\n", "ending at byte 19 has 1 fields"),
+    ],
+)
+def test_iter_batches_invalid_documents(name, contents, message, tmp_path):
+    path = tmp_path / name
+    path.write_text(contents)
+
+    with pytest.raises(ValueError, match=message):
+        list(iter_batches(path))
+
+
+@pytest.mark.parametrize("compression", ["gz", "zst"])
+def test_iter_batches_compressed(compression, tmp_path):
+    raw = ("\n".join(json.dumps(x) for x in DOCUMENTS) + "\n").encode()
+    path = tmp_path / f"documents.jsonl.{compression}"
+    if compression == "gz":
+        path.write_bytes(gzip.compress(raw))
+    else:
+        zstandard = pytest.importorskip("zstandard")
+        path.write_bytes(zstandard.ZstdCompressor().compress(raw))
+
+    batches = list(iter_batches(path, batch_size=2))
+
+    assert {x.content_type for x in batches} == {"application/x-ndjson"}
+    assert _read_documents(batches) == DOCUMENTS
+    assert batches[-1].end == len(raw)
+    assert list(iter_batches(path, batch_size=2, start=batches[0].end)) == batches[1:]
+
+
+def test_expand_paths(tmp_path):
+    for name in ["b/part-2.jsonl.gz", "a/part-1.jsonl", "a/notes.txt", "c.csv"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("")
+
+    assert expand_paths(str(tmp_path)) == [
+        tmp_path / "a/part-1.jsonl",
+        tmp_path / "b/part-2.jsonl.gz",
+        tmp_path / "c.csv",
+    ]
+    assert expand_paths(str(tmp_path / "*/part-*")) == [
+        tmp_path / "a/part-1.jsonl",
+        tmp_path / "b/part-2.jsonl.gz",
+    ]
+    assert expand_paths(str(tmp_path / "a/notes.txt")) == [tmp_path / "a/notes.txt"]
+    with pytest.raises(ValueError):
+        expand_paths(str(tmp_path / "missing.json"))
+    with pytest.raises(ValueError):
+        expand_paths(str(tmp_path / "*.ndjson"))
+
+
+def test_expand_paths_zstd_missing(tmp_path):
+    (tmp_path / "a.jsonl").write_text("")
+    (tmp_path / "b.jsonl.zst").write_text("")
+
+    with patch("meilisearch_tui.ingest.importlib.util.find_spec", return_value=None):
+        with pytest.raises(ValueError, match="zstd extra"):
+            expand_paths(str(tmp_path))
+        with pytest.raises(ValueError, match="zstd extra"):
+            expand_paths(str(tmp_path / "b.jsonl.zst"))
+        assert expand_paths(str(tmp_path / "a.jsonl")) == [tmp_path / "a.jsonl"]
+
+
+def test_iter_batches_max_bytes(tmp_path):
+    path = tmp_path / "documents.jsonl"
+    path.write_text("\n".join(json.dumps(x) for x in DOCUMENTS) + "\n")
+
+    batches = list(iter_batches(path, max_batch_bytes=100))
+
+    assert all(len(x.payload) <= 100 for x in batches if x.document_count > 1)
+    assert sum(x.document_count for x in batches) == len(DOCUMENTS)
+
+
+def test_iter_batches_unsupported(tmp_path):
+    path = tmp_path / "documents.txt"
+    path.write_text("")
+
+    with pytest.raises(ValueError):
+        list(iter_batches(path))
+
+
+def test_iter_batches_sizer(tmp_path):
+    path = tmp_path / "documents.jsonl"
+    path.write_text("\n".join(json.dumps({"id": x}) for x in range(10)) + "\n")
+    sizer = BatchSizer(2, min_batch_size=1)
+
+    batches = iter_batches(path, batch_size=sizer)
+    first = next(batches)
+    sizer.batch_size = 5
+    second = next(batches)
+
+    assert first.document_count == 2
+    assert second.document_count == 5
+
+
+def test_batch_sizer():
+    sizer = BatchSizer(1000, min_batch_size=400, max_batch_size=2000, target_latency=1.0)
+
+    sizer.record_latency(0.1)
+    assert sizer.batch_size == 1500
+    sizer.record_latency(0.1)
+    assert sizer.batch_size == 2000
+    sizer.record_latency(0.75)
+    assert sizer.batch_size == 2000
+    sizer.record_latency(2)
+    assert sizer.batch_size == 1000
+    sizer.record_task_duration(60)
+    sizer.record_task_duration(60)
+    assert sizer.batch_size == 400
+
+
+async def test_add_documents_in_batches_concurrency(tmp_path):
+    path = tmp_path / "documents.jsonl"
+    path.write_text("\n".join(json.dumps({"id": x}) for x in range(20)) + "\n")
+    in_flight = 0
+    max_in_flight = 0
+
+    async def send_batch(index, batch, *, primary_key=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        first = json.loads(batch.payload.splitlines()[0])["id"]
+        # Make earlier batches finish last to check the tasks are returned in file order
+        await asyncio.sleep(0.01 * (20 - first) / 2)
+        in_flight -= 1
+        return first
+
+    with patch("meilisearch_tui.ingest.send_batch", send_batch):
+        tasks = await add_documents_in_batches(None, path, batch_size=2, concurrency=3)  # type: ignore[arg-type]
+
+    assert max_in_flight == 3
+    assert tasks == list(range(0, 20, 2))
+
+
+async def test_add_documents_in_batches_ordered(tmp_path):
+    path = tmp_path / "documents.jsonl"
+    path.write_text("\n".join(json.dumps({"id": x}) for x in range(20)) + "\n")
+    next_batch = ingest._next_batch
+    read = 0
+    read_while_sending: list[int] = []
+    in_flight = 0
+    max_in_flight = 0
+
+    def count_reads(*args):
+        nonlocal read
+        read += 1
+        return next_batch(*args)
+
+    async def send_batch(index, batch, *, primary_key=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        first = json.loads(batch.payload.splitlines()[0])["id"]
+        # Make earlier batches slower to check later ones still wait their turn
+        await asyncio.sleep(0.01 * (20 - first) / 2)
+        read_while_sending.append(read)
+        in_flight -= 1
+        return first
+
+    with patch("meilisearch_tui.ingest.send_batch", send_batch), patch(
+        "meilisearch_tui.ingest._next_batch", count_reads
+    ):
+        tasks = await add_documents_in_batches(
+            None,  # type: ignore[arg-type]
+            path,
+            batch_size=2,
+            concurrency=3,
+            ordered=True,
+        )
+
+    assert max_in_flight == 1
+    assert tasks == list(range(0, 20, 2))
+    # The next batches are read while the first one is being sent.
+    assert read_while_sending[0] == 3
+
+
+async def test_add_documents_in_batches_error(tmp_path):
+    path = tmp_path / "documents.jsonl"
+    path.write_text("\n".join(json.dumps({"id": x}) for x in range(20)) + "\n")
+
+    async def send_batch(index, batch, *, primary_key=None):
+        raise RuntimeError("upload failed")
+
+    with patch("meilisearch_tui.ingest.send_batch", send_batch):
+        with pytest.raises(RuntimeError):
+            await add_documents_in_batches(None, path, batch_size=2)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("compression", ["gzip", "deflate"])
+@pytest.mark.usefixtures("mock_config")
+async def test_add_documents_in_batches_compressed(compression, monkeypatch, tmp_path):
+    path = tmp_path / "documents.ndjson"
+    path.write_text("".join(f"{json.dumps({'id': x, 'title': 'Carol'})}\n" for x in range(100)))
+
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        progress = IngestProgress(path.stat().st_size)
+        async with get_client() as client:
+            await add_documents_in_batches(
+                client.index("movies"),
+                path,
+                batch_size=25,
+                progress=progress,
+                compression=compression,
+            )
+
+    assert len(fake.indexes["movies"].documents) == 100
+    assert progress.bytes_sent == path.stat().st_size
+    assert progress.bytes_uploaded < progress.bytes_sent
+    assert progress.compression_ratio > 1
+    assert fake.bytes_received == progress.bytes_uploaded
+
+
+@pytest.mark.parametrize("name", ["documents.json", "documents.ndjson.gz"])
+@pytest.mark.usefixtures("mock_config")
+async def test_add_documents_in_batches_process_pool(name, monkeypatch, tmp_path):
+    documents = [{"id": x, "title": "Carol"} for x in range(100)]
+    path = tmp_path / name
+    if name.endswith(".gz"):
+        path.write_bytes(gzip.compress("".join(f"{json.dumps(x)}\n" for x in documents).encode()))
+    else:
+        path.write_text(json.dumps(documents))
+
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        pool = parse_pool()
+        try:
+            async with get_client() as client:
+                tasks = await add_documents_in_batches(
+                    client.index("movies"), path, batch_size=30, pool=pool, compression="gzip"
+                )
+        finally:
+            pool.shutdown()
+
+    assert len(tasks) == 4
+    assert len(fake.indexes["movies"].documents) == 100
+    # Nothing was read in this process.
+    assert not ingest._readers
+
+
+async def test_add_documents_in_batches_unsupported_compression(tmp_path):
+    path = tmp_path / "documents.ndjson"
+    path.write_text('{"id": 1}\n')
+
+    with pytest.raises(ValueError, match="Unsupported upload compression"):
+        await add_documents_in_batches(None, path, compression="br")  # type: ignore[arg-type]
+
+
+async def test_add_files_in_batches_shares_upload_slots(tmp_path):
+    paths = []
+    for number in range(3):
+        path = tmp_path / f"part-{number}.jsonl"
+        ids = range(number * 100, number * 100 + 20)
+        path.write_text("".join(f"{json.dumps({'id': x})}\n" for x in ids))
+        paths.append(path)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def send_batch(index, batch, *, primary_key=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        return _task_info(json.loads(batch.payload.splitlines()[0])["id"])
+
+    progress = MultiFileProgress()
+    with patch("meilisearch_tui.ingest.send_batch", send_batch):
+        tasks = await add_files_in_batches(
+            None,  # type: ignore[arg-type]
+            paths,
+            batch_size=5,
+            concurrency=2,
+            progress=progress,
+        )
+
+    assert max_in_flight == 2
+    assert [x.task_uid for x in tasks] == [
+        x for n in range(3) for x in range(n * 100, n * 100 + 20, 5)
+    ]
+    assert progress.upload_finished
+    assert progress.documents_enqueued == 60
+    assert [x.documents_enqueued for x in progress.files.values()] == [20, 20, 20]
+
+    progress.record_task(_task_result(100, "succeeded", indexed=5))
+    assert progress.documents_indexed == 5
+    assert [x.documents_indexed for x in progress.files.values()] == [0, 5, 0]
+
+
+async def test_add_files_in_batches_ordered(tmp_path):
+    paths = []
+    for number in range(3):
+        path = tmp_path / f"part-{number}.jsonl"
+        ids = range(number * 100, number * 100 + 20)
+        path.write_text("".join(f"{json.dumps({'id': x})}\n" for x in ids))
+        paths.append(path)
+    sent = []
+
+    async def send_batch(index, batch, *, primary_key=None):
+        first = json.loads(batch.payload.splitlines()[0])["id"]
+        # Make earlier batches slower to check later ones still wait their turn
+        await asyncio.sleep(0.001 * (300 - first) / 20)
+        sent.append(first)
+        return _task_info(first)
+
+    with patch("meilisearch_tui.ingest.send_batch", send_batch):
+        await add_files_in_batches(
+            None,  # type: ignore[arg-type]
+            paths,
+            batch_size=5,
+            concurrency=3,
+            ordered=True,
+        )
+
+    assert sent == [x for n in range(3) for x in range(n * 100, n * 100 + 20, 5)]
+
+
+def _task_info(uid):
+    return TaskInfo(
+        **{
+            "taskUid": uid,
+            "status": "enqueued",
+            "type": "documentAdditionOrUpdate",
+            "enqueuedAt": datetime.now(),
+        }
+    )
+
+
+def _task_result(uid, status, indexed=0, seconds=1.0):
+    now = datetime.now()
+    return TaskResult(
+        **{
+            "uid": uid,
+            "status": status,
+            "type": "documentAdditionOrUpdate",
+            "details": {"receivedDocuments": indexed, "indexedDocuments": indexed},
+            "error": {"message": "bad document"} if status == "failed" else None,
+            "enqueuedAt": now,
+            "startedAt": now if status != "enqueued" else None,
+            "finishedAt": now + timedelta(seconds=seconds) if status != "enqueued" else None,
+        }
+    )
+
+
+def test_ingest_progress():
+    progress = IngestProgress(total_bytes=400)
+    progress.record_batch(DocumentBatch(b"x" * 100, "text/csv", 10, 0, 100), _task_info(1))
+    progress.record_batch(DocumentBatch(b"x" * 100, "text/csv", 10, 100, 200), _task_info(2))
+
+    assert progress.pending_task_uids == [1, 2]
+    assert progress.eta is None
+
+    progress.record_task(_task_result(1, "succeeded", indexed=10))
+    progress.record_task(_task_result(1, "succeeded", indexed=10))
+
+    assert progress.documents_indexed == 10
+    assert progress.pending_task_uids == [2]
+    assert progress.eta is not None and progress.eta > 0
+    assert not progress.finished
+
+    progress.record_task(_task_result(2, "failed"))
+    progress.finish_upload()
+
+    assert progress.finished
+    assert progress.eta == 0
+    assert [x.uid for x in progress.failed_tasks] == [2]
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_watch_progress():
+    progress = IngestProgress()
+    for uid in range(3):
+        progress.record_batch(DocumentBatch(b"x", "text/csv", 5, 0, 1), _task_info(uid))
+    progress.finish_upload()
+    rounds = [
+        [_task_result(0, "processing"), _task_result(1, "enqueued"), _task_result(2, "enqueued")],
+        [
+            _task_result(0, "succeeded", 5),
+            _task_result(1, "processing"),
+            _task_result(2, "enqueued"),
+        ],
+        [_task_result(1, "succeeded", 5, seconds=30), _task_result(2, "succeeded", 5)],
+    ]
+    requested = []
+
+    async def get_tasks(client, *, uids, limit):
+        requested.append(uids)
+        results = rounds[len(requested) - 1]
+        return TaskStatus(results=results, total=len(results), limit=limit, **{"from": 0})
+
+    sizer = BatchSizer(1000)
+    with patch("meilisearch_tui.ingest.get_tasks", get_tasks):
+        await watch_progress(progress, sizer=sizer, min_interval=0, max_interval=0)
+
+    assert requested == [[0, 1, 2], [0, 1, 2], [1, 2]]
+    assert progress.finished
+    assert progress.documents_indexed == 15
+    # 1 second tasks grow the batch size and the 30 second task halves it
+    assert sizer.batch_size == 1125
+
+
+async def test_watch_progress_does_not_back_off_while_uploading():
+    progress = IngestProgress()
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            progress.finish_upload()
+
+    with patch("meilisearch_tui.ingest.asyncio.sleep", sleep):
+        await watch_progress(progress, min_interval=0.25, max_interval=5.0)
+
+    assert sleeps == [0.25, 0.25, 0.25]
+
+
+@pytest.mark.usefixtures("tui_clear_indexes", "mock_config", "env_vars")
+@pytest.mark.meilisearch
+async def test_add_documents_in_batches(async_meilisearch_client):
+    path = Path().absolute() / "datasets" / "small_movies.json"
+    index = async_meilisearch_client.index("movies")
+
+    progress = IngestProgress(path.stat().st_size)
+    await add_documents_in_batches(index, path, batch_size=10, progress=progress)
+    await watch_progress(progress)
+
+    assert progress.finished
+    assert progress.bytes_sent > 0
+    assert not progress.failed_tasks
+    stats = await index.get_stats()
+    assert stats.number_of_documents == len(json.loads(path.read_text()))
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_add_documents_in_batches_resumes_from_checkpoint(monkeypatch, tmp_path):
+    path = tmp_path / "documents.ndjson"
+    path.write_text("".join(f"{json.dumps({'id': x})}\n" for x in range(100)))
+    send_batch = ingest.send_batch
+    sent = 0
+
+    async def network_dies(index, batch, *, primary_key=None):
+        nonlocal sent
+        sent += 1
+        if sent == 5:
+            raise MeilisearchCommunicationError("connection reset")
+        return await send_batch(index, batch, primary_key=primary_key)
+
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        async with get_client() as client:
+            checkpoint = IngestCheckpoint.for_load(tmp_path / "checkpoints", client, "movies", path)
+            index = client.index("movies")
+            with patch("meilisearch_tui.ingest.send_batch", network_dies):
+                with pytest.raises(MeilisearchCommunicationError):
+                    await add_documents_in_batches(
+                        index, path, batch_size=10, concurrency=1, checkpoint=checkpoint
+                    )
+            assert checkpoint.path.exists()
+
+            resumed = IngestCheckpoint.for_load(tmp_path / "checkpoints", client, "movies", path)
+            resumed.load()
+            await resumed.verify(client)
+            assert (
+                resumed.offset
+                == checkpoint.offset
+                == sum(len(x) for x in path.read_bytes().splitlines(True)[:40])
+            )
+
+            fake.requests.clear()
+            tasks = await add_documents_in_batches(
+                index, path, batch_size=10, concurrency=2, checkpoint=resumed
+            )
+
+    assert len(tasks) == 6
+    assert fake.requests.count(("POST", "/indexes/movies/documents")) == 6
+    assert len(fake.indexes["movies"].documents) == 100
+    assert not resumed.path.exists()
+
+
+async def test_ingest_checkpoint_is_written_in_a_thread(tmp_path):
+    path = tmp_path / "documents.ndjson"
+    path.write_text("".join(f"{json.dumps({'id': x})}\n" for x in range(30)))
+    checkpoint = IngestCheckpoint(tmp_path / "checkpoint.jsonl", path)
+    record = checkpoint.record
+    threads = []
+    lines = []
+
+    def record_in_thread(batch, task):
+        threads.append(threading.get_ident())
+        record(batch, task)
+        lines.append(len(checkpoint.path.read_text().splitlines()))
+
+    async def send_batch(index, batch, *, primary_key=None):
+        return _task_info(batch.start)
+
+    with patch("meilisearch_tui.ingest.send_batch", send_batch), patch.object(
+        checkpoint, "record", record_in_thread
+    ):
+        await add_documents_in_batches(
+            None,  # type: ignore[arg-type]
+            path,
+            batch_size=10,
+            concurrency=1,
+            checkpoint=checkpoint,
+        )
+
+    assert len(threads) == 3
+    assert threading.get_ident() not in threads
+    # Each batch is flushed as soon as it is recorded, after the line describing the source file.
+    assert lines == [2, 3, 4]
+    assert not checkpoint.path.exists()
+
+
+def test_ingest_checkpoint_record_from_threads(tmp_path):
+    path = tmp_path / "documents.ndjson"
+    path.write_text("".join(f"{json.dumps({'id': x})}\n" for x in range(100)))
+    checkpoint = IngestCheckpoint(tmp_path / "checkpoint.jsonl", path)
+    batches = list(iter_batches(path, batch_size=1))
+    source_info = checkpoint._source_info
+
+    def slow_source_info():
+        # Gives the other threads time to find the file missing too.
+        time.sleep(0.01)
+        return source_info()
+
+    with patch.object(checkpoint, "_source_info", slow_source_info):
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda x: checkpoint.record(x, _task_info(x.start)), batches))
+    checkpoint.close()
+
+    resumed = IngestCheckpoint(checkpoint.path, path)
+    resumed.load()
+    assert sorted(resumed.batches) == [(x.start, x.end, x.start) for x in batches]
+    assert resumed.offset == path.stat().st_size
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_ingest_checkpoint_verify(monkeypatch, tmp_path):
+    path = tmp_path / "documents.ndjson"
+    path.write_text("".join(f"{json.dumps({'id': x})}\n" for x in range(30)))
+    batches = list(iter_batches(path, batch_size=10))
+
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        async with get_client() as client:
+            checkpoint = IngestCheckpoint.for_load(tmp_path / "checkpoints", client, "movies", path)
+            for batch in batches:
+                checkpoint.record(batch, await ingest.send_batch(client.index("movies"), batch))
+            fake.tasks[1]["status"] = "failed"
+
+            checkpoint.load()
+            await checkpoint.verify(client)
+            assert checkpoint.offset == batches[1].start
+
+            path.write_text("".join(f"{json.dumps({'id': x})}\n" for x in range(31)))
+            checkpoint.load()
+            assert checkpoint.offset == 0
+            assert not checkpoint.path.exists()
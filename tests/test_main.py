@@ -0,0 +1,107 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.fake_meilisearch import FakeMeilisearch, generate_documents
+from meilisearch_tui.main import MeilisearchApp
+from meilisearch_tui.screens.indexes import IndexScreen
+from meilisearch_tui.screens.search import SearchScreen
+from meilisearch_tui.widgets.performance_overlay import PerformanceOverlay
+from tests.conftest import App, wait_until
+
+# The import and first frame timings are checked against budgets by the benchmarks.
+SLOW_SERVER_LATENCY = 1.0
+
+
+def _imported_modules():
+    code = "import json, sys\nimport meilisearch_tui.main\nprint(json.dumps(list(sys.modules)))\n"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_import_defers_heavy_modules():
+    modules = set(_imported_modules())
+
+    assert "meilisearch_python_sdk" not in modules
+    assert "httpx" not in modules
+    assert not {x for x in modules if x.startswith("meilisearch_tui.screens")}
+
+
+def test_screens_are_built_on_first_use():
+    app = MeilisearchApp()
+
+    assert all(callable(x) for x in app.SCREENS.values())
+    assert app.get_screen("tasks") is app.get_screen("tasks")
+
+
+class RecordingApp(App):
+    def __init__(self, fake):
+        super().__init__()
+        self.fake = fake
+        self.answered_before_first_frame = None
+
+    def on_ready(self):
+        # The fake only records a request once its latency has passed.
+        self.answered_before_first_frame = list(self.fake.requests)
+
+
+async def _wait_for_screen(app, pilot, screen_type):
+    await wait_until(pilot, lambda: isinstance(app.screen, screen_type))
+    await pilot.pause()
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_first_frame_does_not_wait_for_server(monkeypatch):
+    with FakeMeilisearch(latency=SLOW_SERVER_LATENCY) as fake:
+        fake.add_documents("movies", generate_documents(10))
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        app = RecordingApp(fake)
+        async with app.run_test() as pilot:
+            await _wait_for_screen(app, pilot, SearchScreen)
+            screen = app.screen
+            assert isinstance(screen, SearchScreen)
+            assert str(screen.index_name.renderable) == "Loading indexes..."
+            await wait_until(pilot, lambda: screen.selected_index is not None)
+            await wait_until(pilot, lambda: app.server_version is not None)
+
+    assert app.answered_before_first_frame == []
+    assert str(screen.index_name.renderable) == "Searching index: movies"
+    assert app.server_version == fake.version
+    # The probes run side by side and everything that needs the index list shares one request.
+    assert sorted(fake.requests) == [("GET", "/health"), ("GET", "/indexes"), ("GET", "/version")]
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_startup_without_indexes_opens_index_management(monkeypatch):
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        app = App()
+        async with app.run_test() as pilot:
+            await _wait_for_screen(app, pilot, IndexScreen)
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_performance_overlay_follows_screens(monkeypatch):
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", generate_documents(10))
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        app = App()
+        async with app.run_test() as pilot:
+            await _wait_for_screen(app, pilot, SearchScreen)
+            await pilot.press("f2")
+            await pilot.pause()
+            overlay = app.screen.query_one(PerformanceOverlay)
+            await wait_until(pilot, lambda: overlay.table.row_count)
+
+            await app.switch_screen("tasks")
+            await pilot.pause(0.6)
+            assert app.screen.query(PerformanceOverlay)
+
+            await pilot.press("f2")
+            await pilot.pause()
+            assert not app.screen.query(PerformanceOverlay)
+            await pilot.pause()
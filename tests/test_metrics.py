@@ -0,0 +1,98 @@
+import pytest
+
+from benchmarks.fake_meilisearch import FakeMeilisearch, generate_documents
+from meilisearch_tui.client import get_client, run_request
+from meilisearch_tui.metrics import (
+    SEARCH_ENDPOINT,
+    RequestMetrics,
+    RequestSample,
+    RollingHistogram,
+    endpoint_name,
+    request_metrics,
+)
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("GET", "/indexes", ("GET /indexes", None)),
+        ("POST", "/indexes/movies/search", ("POST /indexes/{index}/search", "movies")),
+        ("GET", "/indexes/movies/documents/42", ("GET /indexes/{index}/documents/{id}", "movies")),
+        (
+            "POST",
+            "/indexes/movies/documents/fetch",
+            ("POST /indexes/{index}/documents/fetch", "movies"),
+        ),
+        ("GET", "/tasks/12", ("GET /tasks/{uid}", None)),
+        ("GET", "/tasks", ("GET /tasks", None)),
+    ],
+)
+def test_endpoint_name(method, path, expected):
+    assert endpoint_name(method, path) == expected
+
+
+def test_rolling_histogram_keeps_recent_values():
+    histogram = RollingHistogram(size=100)
+    for value in range(1000):
+        histogram.add(value)
+
+    assert len(histogram) == 100
+    assert histogram.percentiles(50, 95, 99) == (949, 994, 998)
+
+
+def test_request_metrics_summary():
+    metrics = RequestMetrics()
+    seen: list[RequestSample] = []
+    metrics.listeners.append(seen.append)
+    for value in range(1, 101):
+        metrics.record(
+            RequestSample(
+                timestamp=0,
+                operation="search",
+                endpoint=SEARCH_ENDPOINT,
+                index_uid="movies",
+                status=200,
+                phases={"client": value / 10, "total": value},
+                request_bytes=10,
+                response_bytes=100,
+            )
+        )
+    metrics.add("GET /indexes", "total", 5)
+
+    assert len(seen) == 100
+    assert metrics.summary() == [
+        ("GET /indexes", "total", 1, 5, 5, 5),
+        (SEARCH_ENDPOINT, "total", 100, 50, 95, 99),
+        (SEARCH_ENDPOINT, "client", 100, 5.0, 9.5, 9.9),
+    ]
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_run_request_records_phases(monkeypatch):
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", generate_documents(20))
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        samples: list[RequestSample] = []
+        request_metrics.listeners.append(samples.append)
+        try:
+            async with get_client() as client:
+                index = client.index("movies")
+                await run_request("search", lambda: index.search("a"))
+        finally:
+            request_metrics.listeners.remove(samples.append)
+
+    assert len(samples) == 1
+    sample = samples[0]
+    assert sample.endpoint == SEARCH_ENDPOINT
+    assert sample.index_uid == "movies"
+    assert sample.status == 200
+    assert sample.request_bytes > 0
+    assert sample.response_bytes > 0
+    assert set(sample.phases) == {"total", "network", "server", "client"}
+    assert sample.phases["network"] <= sample.phases["total"]
+    assert [x[:3] for x in request_metrics.summary()] == [
+        (SEARCH_ENDPOINT, "total", 1),
+        (SEARCH_ENDPOINT, "network", 1),
+        (SEARCH_ENDPOINT, "server", 1),
+        (SEARCH_ENDPOINT, "client", 1),
+    ]
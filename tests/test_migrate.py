@@ -0,0 +1,93 @@
+import pytest
+from meilisearch_python_sdk import AsyncClient
+
+from benchmarks.fake_meilisearch import FakeMeilisearch, generate_documents
+from meilisearch_tui.client import circuit_breakers
+from meilisearch_tui.config import load_config
+from meilisearch_tui.migrate import MigrationCheckpoint, MigrationProgress, migrate_index
+
+
+@pytest.fixture
+def servers():
+    with FakeMeilisearch(task_duration=0.02) as source, FakeMeilisearch(
+        task_duration=0.02
+    ) as target:
+        source.add_documents("movies", generate_documents(95), primary_key="id")
+        source.indexes["movies"].settings["filterableAttributes"] = ["genres"]
+        yield source, target
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_migrate_index(servers, tmp_path):
+    source, target = servers
+    checkpoint = MigrationCheckpoint(tmp_path / "migration.json")
+    progress = MigrationProgress()
+
+    async with AsyncClient(source.url) as source_client, AsyncClient(target.url) as target_client:
+        copied = await migrate_index(
+            source_client,
+            "movies",
+            target_client,
+            "films",
+            batch_size=10,
+            fetch_concurrency=3,
+            upload_concurrency=2,
+            checkpoint=checkpoint,
+            progress=progress,
+            poll_interval=0.01,
+        )
+
+    films = target.indexes["films"]
+    assert copied == 95
+    assert progress.finished
+    assert progress.confirmed_offset == progress.total_documents == 95
+    assert films.primary_key == "id"
+    assert films.settings["filterableAttributes"] == ["genres"]
+    assert films.documents == source.indexes["movies"].documents
+    assert target.requests.index(("PATCH", "/indexes/films/settings")) < target.requests.index(
+        ("POST", "/indexes/films/documents")
+    )
+    assert not checkpoint.path.exists()
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_migrate_index_resumes_from_checkpoint(servers, tmp_path):
+    source, target = servers
+    target.add_documents("movies", generate_documents(50), primary_key="id")
+    checkpoint = MigrationCheckpoint(tmp_path / "migration.json")
+    checkpoint.settings_copied = True
+    checkpoint.offset = 50
+    checkpoint.save()
+    checkpoint.load()
+
+    async with AsyncClient(source.url) as source_client, AsyncClient(target.url) as target_client:
+        copied = await migrate_index(
+            source_client,
+            "movies",
+            target_client,
+            batch_size=10,
+            checkpoint=checkpoint,
+            poll_interval=0.01,
+        )
+
+    assert copied == 45
+    assert len(target.indexes["movies"].documents) == 95
+    assert ("PATCH", "/indexes/movies/settings") not in target.requests
+    assert target.requests.count(("POST", "/indexes/movies/documents")) == 5
+    assert not checkpoint.path.exists()
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_migrate_index_uses_the_breakers_of_both_servers(servers):
+    source, target = servers
+    configured = circuit_breakers.get(load_config().meilisearch_url or "")
+    for _ in range(configured.failure_threshold):
+        configured.record_failure()
+
+    async with AsyncClient(source.url) as source_client, AsyncClient(target.url) as target_client:
+        copied = await migrate_index(
+            source_client, "movies", target_client, batch_size=50, poll_interval=0.01
+        )
+
+    assert copied == 95
+    assert target.indexes["movies"].documents == source.indexes["movies"].documents
@@ -0,0 +1,142 @@
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.fake_meilisearch import FakeMeilisearch, generate_documents
+from meilisearch_tui.client import get_client, run_request
+from meilisearch_tui.main import MeilisearchApp
+from meilisearch_tui.metrics import SEARCH_ENDPOINT, RequestMetrics, RequestSample
+from meilisearch_tui.recorder import MetricsRecorder
+from meilisearch_tui.screens.indexes import IndexScreen
+
+
+def _sample(total, status=200):
+    return RequestSample(
+        timestamp=1.0,
+        operation="search",
+        endpoint=SEARCH_ENDPOINT,
+        index_uid="movies",
+        status=status,
+        phases={"total": total},
+        request_bytes=10,
+        response_bytes=100,
+        query_hash="abc",
+    )
+
+
+async def test_recorder_buffers_until_flushed(tmp_path):
+    metrics = RequestMetrics()
+    recorder = MetricsRecorder(tmp_path, metrics)
+    metrics.listeners.append(recorder.record)
+
+    for total in (1.0, 2.0):
+        metrics.record(_sample(total))
+    assert not recorder.requests_file.exists()
+
+    await recorder.flush()
+    await recorder.flush()
+
+    with open(recorder.requests_file) as f:
+        records = [json.loads(x) for x in f]
+    assert [x["phases"]["total"] for x in records] == [1.0, 2.0]
+    assert records[0]["endpoint"] == SEARCH_ENDPOINT
+    assert records[0]["query_hash"] == "abc"
+
+
+async def test_recorder_drops_records_when_buffer_is_full(tmp_path):
+    recorder = MetricsRecorder(tmp_path, RequestMetrics(), max_buffer=2)
+    for total in range(5):
+        recorder.record(_sample(total))
+
+    await recorder.flush()
+
+    with open(recorder.requests_file) as f:
+        assert len(f.readlines()) == 2
+    assert recorder.dropped == 3
+
+
+async def test_recorder_prometheus_text(tmp_path):
+    metrics = RequestMetrics()
+    recorder = MetricsRecorder(tmp_path, metrics)
+    metrics.listeners.append(recorder.record)
+    for total in range(1, 101):
+        metrics.record(_sample(float(total)))
+    metrics.record(_sample(5.0, status=503))
+
+    await recorder.export()
+
+    text = recorder.prometheus_file.read_text()
+    endpoint = 'endpoint="POST /indexes/{index}/search"'
+    assert f'meilisearch_tui_requests_total{{{endpoint},status="200"}} 100' in text
+    assert f'meilisearch_tui_requests_total{{{endpoint},status="503"}} 1' in text
+    assert (
+        f'meilisearch_tui_request_latency_milliseconds{{{endpoint},phase="total",quantile="0.95"}}'
+        " 95.0" in text
+    )
+    assert "# EOF" not in text
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+async def test_recorder_prometheus_text_parses(tmp_path):
+    parser = pytest.importorskip("prometheus_client.parser")
+    metrics = RequestMetrics()
+    recorder = MetricsRecorder(tmp_path, metrics)
+    metrics.listeners.append(recorder.record)
+    for total in range(1, 11):
+        metrics.record(_sample(float(total)))
+    metrics.record(_sample(5.0, status=503))
+
+    families = {
+        x.name: x for x in parser.text_string_to_metric_families(recorder.prometheus_text())
+    }
+
+    requests = families["meilisearch_tui_requests"]
+    assert requests.type == "counter"
+    assert {x.name for x in requests.samples} == {"meilisearch_tui_requests_total"}
+    assert sorted(x.value for x in requests.samples) == [1.0, 10.0]
+    latency = families["meilisearch_tui_request_latency_milliseconds"]
+    assert latency.type == "gauge"
+    assert {x.labels["quantile"] for x in latency.samples} == {"0.5", "0.95", "0.99"}
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_recorder_records_requests_in_the_background(tmp_path, monkeypatch):
+    recorder = MetricsRecorder(tmp_path, flush_interval=0.01, export_interval=0.01)
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", generate_documents(10))
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        recorder.start()
+        try:
+            async with get_client() as client:
+                index = client.index("movies")
+                await run_request("search", lambda: index.search("a"))
+                await run_request("search", lambda: index.search("b"))
+            await asyncio.sleep(0.1)
+            assert recorder.requests_file.exists()
+            assert recorder.prometheus_file.exists()
+        finally:
+            await recorder.stop()
+
+    with open(recorder.requests_file) as f:
+        records = [json.loads(x) for x in f]
+    assert len(records) == 2
+    assert records[0]["query_hash"] != records[1]["query_hash"]
+    assert records[0]["status"] == 200
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_app_records_metrics(tmp_path, monkeypatch):
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        app = MeilisearchApp(metrics_dir=tmp_path)
+        async with app.run_test() as pilot:
+            assert app.recorder is not None
+            while not isinstance(app.screen, IndexScreen):
+                await pilot.pause(0.05)
+            await pilot.pause()
+
+    with open(tmp_path / "requests.jsonl") as f:
+        endpoints = {json.loads(x)["endpoint"] for x in f}
+    assert endpoints == {"GET /health", "GET /version", "GET /indexes"}
+    assert (tmp_path / "meilisearch_tui.prom").exists()
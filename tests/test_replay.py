@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from meilisearch_python_sdk import AsyncClient
+from typer.testing import CliRunner
+
+from meilisearch_tui.cli import typer_app
+from meilisearch_tui.replay import ReplayQuery, ReplayReport, read_query_log, replay
+
+
+@pytest.fixture
+def query_log(tmp_path):
+    path = tmp_path / "queries.log"
+    lines = [
+        "first query",
+        "",
+        json.dumps({"q": "second", "index": "books", "limit": 5}),
+        json.dumps({"q": "third", "hybrid": {"semanticRatio": 0.9, "embedder": "default"}}),
+    ]
+    path.write_text("\n".join(lines))
+    return path
+
+
+def test_read_query_log(query_log):
+    queries = read_query_log(query_log, "movies")
+
+    assert [(x.index_uid, x.q, x.limit) for x in queries] == [
+        ("movies", "first query", 20),
+        ("books", "second", 5),
+        ("movies", "third", 20),
+    ]
+    assert queries[2].hybrid is not None
+    assert queries[2].hybrid.semantic_ratio == 0.9
+
+
+def test_read_query_log_needs_an_index(query_log):
+    with pytest.raises(ValueError, match="Line 1"):
+        read_query_log(query_log)
+
+
+def test_report_summary():
+    report = ReplayReport()
+    for latency in range(1, 101):
+        report.record(latency / 1000)
+    report.record(0.5, TimeoutError())
+    report.finished_at = 2.0
+
+    summary = report.summary()
+
+    assert summary["requests"] == 101
+    assert summary["errors_by_type"] == {"TimeoutError": 1}
+    assert summary["throughput_qps"] == 50
+    assert summary["latency_ms"]["p50"] == pytest.approx(50)
+    assert summary["latency_ms"]["p99"] == pytest.approx(99)
+
+
+async def test_replay_once_with_concurrency(fake_server):
+    fake_server.latency = 0.01
+    queries = [ReplayQuery("movies", str(x)) for x in range(20)] + [ReplayQuery("missing", "a")]
+
+    async with AsyncClient(fake_server.url) as client:
+        report = await replay(client, queries, concurrency=5)
+
+    assert report.requests == 21
+    assert len(report.latencies) == 20
+    assert report.errors == {"MeilisearchApiError": 1}
+    assert all(x >= 0.01 for x in report.latencies)
+
+
+async def test_replay_at_target_qps(fake_server):
+    queries = [ReplayQuery("movies", "a")]
+
+    async with AsyncClient(fake_server.url) as client:
+        report = await replay(client, queries, qps=50, warmup=0.2, duration=0.4)
+
+    searches = fake_server.requests.count(("POST", "/indexes/movies/search"))
+    # 0.6 seconds at 50 per second, with the warmup searches left out of the report.
+    assert 27 <= searches <= 30
+    assert 18 <= report.requests <= 20
+    assert not report.errors
+
+
+@pytest.mark.usefixtures("mock_config")
+def test_replay_command(fake_server, query_log):
+    result = CliRunner().invoke(
+        typer_app, ["replay", str(query_log), "--index", "movies", "--concurrency", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    summary = json.loads(result.stdout)
+    assert summary["requests"] == 3
+    # The fake server has no books index.
+    assert summary["errors_by_type"] == {"MeilisearchApiError": 1}
@@ -0,0 +1,116 @@
+import pytest
+
+from benchmarks.fake_meilisearch import FakeMeilisearch
+from meilisearch_tui.config import load_config
+from meilisearch_tui.screens.search import SearchScreen
+from tests.conftest import App, wait_until
+
+MOVIES = [
+    {"id": 1, "title": "Carol"},
+    {"id": 2, "title": "Cars"},
+    {"id": 3, "title": "Alien"},
+]
+
+
+async def _search_screen(app, pilot):
+    await wait_until(pilot, lambda: isinstance(app.screen, SearchScreen))
+    screen = app.screen
+    assert isinstance(screen, SearchScreen)
+    await wait_until(pilot, lambda: screen.selected_index == "movies")
+
+    return screen
+
+
+def _record_rendered(monkeypatch, screen):
+    rendered: list[list[str]] = []
+    set_hits = screen.results.set_hits
+
+    def record(hits):
+        hits = list(hits)
+        rendered.append([x["title"] for x in hits])
+        set_hits(hits)
+
+    monkeypatch.setattr(screen.results, "set_hits", record)
+    return rendered
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_search_debounces_typing(monkeypatch):
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", MOVIES)
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        app = App()
+        async with app.run_test() as pilot:
+            screen = await _search_screen(app, pilot)
+            rendered = _record_rendered(monkeypatch, screen)
+
+            await pilot.press("c", "a", "r")
+            await wait_until(pilot, lambda: rendered)
+            # Long enough for any search that wasn't cancelled to come back.
+            await pilot.pause(load_config().search_debounce_ms / 1000 * 2)
+
+    assert [x["q"] for x in fake.searches] == ["car"]
+    assert rendered == [["Carol", "Cars"]]
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_search_never_renders_stale_results(monkeypatch):
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", MOVIES)
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        app = App()
+        async with app.run_test() as pilot:
+            screen = await _search_screen(app, pilot)
+            rendered = _record_rendered(monkeypatch, screen)
+            fake.latency = 0.5
+
+            screen.search_input.value = "alien"
+            # Past the debounce, so the search for alien is on its way to the server.
+            await pilot.pause(load_config().search_debounce_ms / 1000 + 0.1)
+            screen.search_input.value = "car"
+            await wait_until(pilot, lambda: rendered)
+            await wait_until(pilot, lambda: len(fake.searches) == 2)
+            await pilot.pause(0.2)
+
+    assert [x["q"] for x in fake.searches] == ["alien", "car"]
+    assert rendered == [["Carol", "Cars"]]
+    assert str(screen.results_header.renderable).startswith("Hits: ~2")
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_load_more_uses_the_prefetched_page(monkeypatch):
+    with FakeMeilisearch() as fake:
+        fake.add_documents("movies", [{"id": x, "title": f"Movie {x}"} for x in range(45)])
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        app = App()
+        async with app.run_test() as pilot:
+            screen = await _search_screen(app, pilot)
+
+            screen.search_input.value = "movie"
+            # The first page and the prefetch of the second.
+            await wait_until(pilot, lambda: len(fake.searches) == 2)
+            await wait_until(pilot, lambda: screen._prefetched)
+            assert len(screen.hits) == 20
+            assert screen.load_more_button.visible
+
+            screen.load_more("movie")
+            await wait_until(pilot, lambda: len(screen.hits) == 40)
+            await wait_until(pilot, lambda: len(fake.searches) == 3)
+            await wait_until(pilot, lambda: screen._prefetched)
+            assert screen.results.hit_count == 40
+
+            screen.load_more("movie")
+            await wait_until(pilot, lambda: len(screen.hits) == 45)
+            await pilot.pause(0.2)
+
+            assert not screen.load_more_button.visible
+            assert screen.results.hit_count == 45
+
+    # Every page after the first came from the prefetch, and nothing is asked for past the
+    # estimated total.
+    assert [(x["q"], x["offset"]) for x in fake.searches] == [
+        ("movie", 0),
+        ("movie", 20),
+        ("movie", 40),
+    ]
+    assert [x["id"] for x in screen.hits] == list(range(45))
@@ -0,0 +1,130 @@
+import json
+
+import pytest
+
+from benchmarks.fake_meilisearch import FakeMeilisearch, generate_documents
+from meilisearch_tui import ingest
+from meilisearch_tui.client import get_client
+from meilisearch_tui.sync import ChangeFilter, SyncManifest, sync_documents
+
+
+def _write_ndjson(path, documents):
+    with open(path, "w") as f:
+        for document in documents:
+            f.write(f"{json.dumps(document)}\n")
+
+
+def test_change_filter_ignores_json_formatting():
+    changes = ChangeFilter({}, "id")
+    assert changes(b"", b'{"id": 1, "title": "a"}\n')
+
+    unchanged = ChangeFilter(changes.seen, "id")
+    assert not unchanged(b"", b'{"title":"a","id":1}\n')
+    assert unchanged(b"", b'{"id": 1, "title": "b"}\n')
+    assert (unchanged.changed, unchanged.unchanged) == (1, 1)
+
+
+def test_change_filter_csv():
+    header = b"title,id:number\n"
+    changes = ChangeFilter({}, "id")
+    assert changes(header, b'"Star Wars, IV",1\n')
+    assert changes(header, b"Alien,2\n")
+
+    unchanged = ChangeFilter(changes.seen, "id")
+    assert not unchanged(header, b'"Star Wars, IV",1\n')
+    assert unchanged(header, b"Aliens,2\n")
+    assert unchanged.missing_keys == []
+    assert list(changes.seen) == ["1", "2"]
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_sync_documents(monkeypatch, tmp_path):
+    documents = generate_documents(100)
+    path = tmp_path / "movies.ndjson"
+    _write_ndjson(path, documents)
+
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        async with get_client() as client:
+            manifest = SyncManifest.for_index(tmp_path / "manifests", client, "movies")
+            index = client.index("movies")
+
+            first = await sync_documents(client, index, path, manifest, primary_key="id")
+
+            documents[5]["title"] = "changed"
+            documents[50]["title"] = "changed"
+            del documents[90:93]
+            documents.extend(generate_documents(1, start=100))
+            _write_ndjson(path, documents)
+            posts_before = fake.requests.count(("POST", "/indexes/movies/documents"))
+            second = await sync_documents(
+                client, index, path, manifest, delete_missing=True, batch_size=2
+            )
+
+    assert (first.documents_sent, first.documents_unchanged, first.failed_tasks) == (100, 0, [])
+    assert second.documents_sent == 3
+    assert second.documents_unchanged == 95
+    assert second.documents_deleted == 3
+    assert fake.requests.count(("POST", "/indexes/movies/documents")) - posts_before == 2
+    assert fake.indexes["movies"].documents["5"]["title"] == "changed"
+    assert len(fake.indexes["movies"].documents) == 98
+
+    saved = SyncManifest(manifest.path)
+    saved.load()
+    assert sorted(saved.hashes, key=int) == [str(x["id"]) for x in documents]
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_sync_documents_after_index_deleted(monkeypatch, tmp_path):
+    path = tmp_path / "movies.ndjson"
+    _write_ndjson(path, generate_documents(10))
+
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        async with get_client() as client:
+            manifest = SyncManifest.for_index(tmp_path / "manifests", client, "movies")
+            index = client.index("movies")
+            await sync_documents(client, index, path, manifest, primary_key="id")
+            await index.delete()
+            second = await sync_documents(client, index, path, manifest, primary_key="id")
+
+    assert (second.documents_sent, second.documents_unchanged) == (10, 0)
+    assert len(fake.indexes["movies"].documents) == 10
+
+
+@pytest.mark.usefixtures("mock_config")
+async def test_sync_documents_process_pool(monkeypatch, tmp_path):
+    documents = generate_documents(50)
+    path = tmp_path / "movies.ndjson"
+    _write_ndjson(path, documents)
+    pools = []
+    parse_pool = ingest.parse_pool
+
+    def record_pool():
+        pools.append(parse_pool())
+        return pools[-1]
+
+    monkeypatch.setattr(ingest, "PROCESS_POOL_MIN_BYTES", 0)
+    monkeypatch.setattr(ingest, "parse_pool", record_pool)
+
+    with FakeMeilisearch() as fake:
+        monkeypatch.setenv("MEILI_HTTP_ADDR", fake.url)
+        async with get_client() as client:
+            manifest = SyncManifest.for_index(tmp_path / "manifests", client, "movies")
+            index = client.index("movies")
+            first = await sync_documents(client, index, path, manifest, primary_key="id")
+
+            documents[5]["title"] = "changed"
+            del documents[40:]
+            _write_ndjson(path, documents)
+            second = await sync_documents(
+                client, index, path, manifest, primary_key="id", delete_missing=True
+            )
+
+    assert len(pools) == 2
+    assert first.documents_sent == 50
+    # The change filter ran in the worker process and its state came back from there.
+    assert (second.documents_sent, second.documents_unchanged) == (1, 39)
+    assert second.documents_deleted == 10
+    assert fake.indexes["movies"].documents["5"]["title"] == "changed"
+    assert len(manifest.hashes) == 40
@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from meilisearch_python_sdk.models.task import TaskResult, TaskStatus
+
+from meilisearch_tui.tasks import TaskFeed, wait_for_tasks
+
+START = datetime(2024, 1, 1)
+
+
+def _task(uid, status="succeeded"):
+    return TaskResult(
+        **{
+            "uid": uid,
+            "indexUid": "movies",
+            "status": status,
+            "type": "documentAdditionOrUpdate",
+            "enqueuedAt": START + timedelta(seconds=uid),
+        }
+    )
+
+
+class FakeTaskQueue:
+    def __init__(self, count):
+        self.tasks = {uid: _task(uid) for uid in range(count)}
+        self.calls = []
+
+    def add(self, task):
+        self.tasks[task.uid] = task
+
+    async def get_tasks(self, client, *, uids=None, limit=20, from_=None, after_enqueued_at=None):
+        self.calls.append({"uids": uids, "from": from_, "after_enqueued_at": after_enqueued_at})
+        tasks = sorted(self.tasks.values(), key=lambda x: x.uid, reverse=True)
+        if uids:
+            tasks = [x for x in tasks if x.uid in uids]
+        if after_enqueued_at:
+            tasks = [x for x in tasks if x.enqueued_at > after_enqueued_at]
+        if from_ is not None:
+            tasks = [x for x in tasks if x.uid <= from_]
+        page = tasks[:limit]
+        next_ = tasks[limit].uid if len(tasks) > limit else None
+        return TaskStatus(
+            **{
+                "results": page,
+                "total": len(tasks),
+                "limit": limit,
+                "from": from_ or 0,
+                "next": next_,
+            }
+        )
+
+
+@pytest.fixture
+def queue():
+    queue = FakeTaskQueue(250)
+    with patch("meilisearch_tui.tasks.get_tasks", queue.get_tasks):
+        yield queue
+
+
+async def test_task_feed_pages_through_history(queue):
+    feed = TaskFeed(page_size=100)
+
+    first = await feed.refresh(None)  # type: ignore[arg-type]
+    assert [x.uid for x in first] == list(range(249, 149, -1))
+    assert feed.has_older
+
+    await feed.load_older(None)  # type: ignore[arg-type]
+    last = await feed.load_older(None)  # type: ignore[arg-type]
+
+    assert [x.uid for x in last] == list(range(49, -1, -1))
+    assert len(feed.tasks) == 250
+    assert not feed.has_older
+    assert await feed.load_older(None) == []  # type: ignore[arg-type]
+    assert len(queue.calls) == 3
+
+
+async def test_task_feed_refresh_only_fetches_new_tasks(queue):
+    feed = TaskFeed(page_size=100)
+    await feed.refresh(None)  # type: ignore[arg-type]
+    queue.calls.clear()
+
+    for uid in range(250, 400):
+        queue.add(_task(uid))
+    changed = await feed.refresh(None)  # type: ignore[arg-type]
+
+    assert sorted(x.uid for x in changed) == list(range(250, 400))
+    assert all(x["after_enqueued_at"] is not None for x in queue.calls)
+    assert [x["from"] for x in queue.calls] == [None, 299]
+    assert await feed.refresh(None) == []  # type: ignore[arg-type]
+
+
+async def test_task_feed_refresh_updates_unfinished_tasks(queue):
+    queue.add(_task(250, status="processing"))
+    queue.add(_task(251, status="enqueued"))
+    feed = TaskFeed(page_size=100)
+    await feed.refresh(None)  # type: ignore[arg-type]
+    assert feed.unfinished_uids == [250, 251]
+    queue.calls.clear()
+
+    queue.add(_task(250, status="succeeded"))
+    changed = await feed.refresh(None)  # type: ignore[arg-type]
+
+    assert [(x.uid, x.status) for x in changed] == [(250, "succeeded")]
+    assert feed.unfinished_uids == [251]
+    assert queue.calls[-1]["uids"] == [250, 251]
+
+
+async def test_task_feed_refresh_and_load_older_take_turns(queue):
+    feed = TaskFeed(page_size=100)
+    await feed.refresh(None)  # type: ignore[arg-type]
+    queue.calls.clear()
+    get_tasks = queue.get_tasks
+    running = 0
+    overlapped = False
+
+    async def slow_get_tasks(*args, **kwargs):
+        nonlocal running, overlapped
+        running += 1
+        overlapped = overlapped or running > 1
+        await asyncio.sleep(0.01)
+        try:
+            return await get_tasks(*args, **kwargs)
+        finally:
+            running -= 1
+
+    with patch("meilisearch_tui.tasks.get_tasks", slow_get_tasks):
+        await asyncio.gather(
+            feed.load_older(None),  # type: ignore[arg-type]
+            feed.refresh(None),  # type: ignore[arg-type]
+            feed.load_older(None),  # type: ignore[arg-type]
+        )
+
+    assert not overlapped
+    # Each page of history was asked for once, in order.
+    assert [x["from"] for x in queue.calls if x["after_enqueued_at"] is None] == [149, 49]
+    assert len(feed.tasks) == 250
+    assert not feed.has_older
+
+
+async def test_wait_for_tasks(queue):
+    queue.add(_task(250, status="processing"))
+    queue.add(_task(251, status="failed"))
+
+    async def finish():
+        while len(queue.calls) < 2:
+            await asyncio.sleep(0.001)
+        queue.add(_task(250))
+
+    _, tasks = await asyncio.gather(
+        finish(),
+        wait_for_tasks(None, [251, 250, 3], min_interval=0.001),  # type: ignore[arg-type]
+    )
+
+    assert [(x.uid, x.status) for x in tasks] == [
+        (251, "failed"),
+        (250, "succeeded"),
+        (3, "succeeded"),
+    ]
+    assert queue.calls[-1]["uids"] == [250]
@@ -1,6 +1,11 @@
 import pytest
 
-from meilisearch_tui.utils import get_current_indexes_string, string_to_list
+from meilisearch_tui.utils import (
+    format_bytes,
+    format_seconds,
+    get_current_indexes_string,
+    string_to_list,
+)
 
 
 @pytest.mark.parametrize(
@@ -49,3 +54,16 @@ async def test_get_current_indexes_string_no_indexes():
 )
 def test_string_to_list(val, expected):
     assert string_to_list(val) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(512, "512.0 B"), (1536, "1.5 KB"), (10 * 1024**2, "10.0 MB"), (3 * 1024**4, "3.0 TB")],
+)
+def test_format_bytes(value, expected):
+    assert format_bytes(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [(5.9, "5s"), (65, "1m 5s"), (3725, "1h 2m 5s")])
+def test_format_seconds(value, expected):
+    assert format_seconds(value) == expected